@@ -0,0 +1,410 @@
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+from pathlib import Path
+
+
+def _timed(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, timings
+
+
+def _headless_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+def bench_extract(args):
+    """Per-page extraction time: per-card WebElement helpers vs one batched script."""
+    from selenium.webdriver.common.by import By
+    from utils import JOB_CARD_SELECTOR, extract_job_cards, extract_job_data
+
+    page = Path(args.page).resolve()
+    driver = _headless_driver()
+    try:
+        driver.get(page.as_uri())
+        job_main = driver.find_element(By.CSS_SELECTOR, "main#main")
+
+        def per_card():
+            cards = job_main.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+            return [extract_job_data(card) for card in cards]
+
+        def batched():
+            return extract_job_cards(driver, job_main)
+
+        before, before_timings = _timed(per_card, args.repeat)
+        after, after_timings = _timed(batched, args.repeat)
+    finally:
+        driver.quit()
+
+    before_ms = statistics.mean(before_timings) * 1000
+    after_ms = statistics.mean(after_timings) * 1000
+    print(f"Page: {page} ({len(after)} cards, {args.repeat} runs)")
+    print(f"  per-card helpers : {before_ms:8.1f} ms/page")
+    print(f"  batched script   : {after_ms:8.1f} ms/page")
+    print(f"  speedup          : {before_ms / after_ms if after_ms else float('inf'):8.1f}x")
+    if before != after:
+        mismatched = sum(1 for a, b in zip(before, after) if a != b) + abs(len(before) - len(after))
+        print(f"  WARNING: {mismatched} cards differ between the two extraction paths")
+
+
+def _as_written(job):
+    # the browser resolves hrefs against the file:// URI of the page; keep the path as LinkedIn writes it
+    url = job["job_url"]
+    if url and url.startswith("file:"):
+        url = urllib.parse.urlunsplit(("", "") + urllib.parse.urlsplit(url)[2:])
+    return {**job, "job_url": url}
+
+
+def bench_parity(args):
+    """Selector parity: in-browser batched script vs lxml page_parser on saved pages.
+
+    With ``--write-expected`` the browser's cards are also saved next to each
+    page as ``<page>.json``, the expectations tests/conftest.py loads.
+    """
+    from selenium.webdriver.common.by import By
+    from page_parser import parse_job_cards
+    from utils import JOB_FIELD_SELECTORS, extract_job_cards
+
+    driver = _headless_driver()
+    mismatches = {name: 0 for name in JOB_FIELD_SELECTORS}
+    cards = 0
+    failed_pages = 0
+    try:
+        for page in (Path(p).resolve() for p in args.pages):
+            driver.get(page.as_uri())
+            job_main = driver.find_element(By.CSS_SELECTOR, "main#main")
+            expected = extract_job_cards(driver, job_main)
+            parsed = parse_job_cards(job_main.get_attribute("outerHTML"), base_url=page.as_uri())
+            if args.write_expected:
+                written = [_as_written(job) for job in expected]
+                page.with_suffix(".json").write_text(json.dumps(written, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            cards += len(expected)
+            if len(expected) != len(parsed):
+                failed_pages += 1
+                print(f"  {page.name}: {len(expected)} cards in the browser, {len(parsed)} parsed")
+            for a, b in zip(expected, parsed):
+                for name in JOB_FIELD_SELECTORS:
+                    if a[name] != b[name]:
+                        mismatches[name] += 1
+                        if args.verbose:
+                            print(f"  {page.name} {name}: {a[name]!r} != {b[name]!r}")
+    finally:
+        driver.quit()
+
+    print(f"Parity over {len(args.pages)} pages, {cards} cards ({failed_pages} pages with a different card count)")
+    for name, count in mismatches.items():
+        print(f"  {name:<14} {'ok' if not count else f'{count} mismatches'}")
+    if failed_pages or any(mismatches.values()):
+        raise SystemExit(1)
+
+
+def bench_parse(args):
+    """Cards/sec of the lxml parser, inline and through ParserPool."""
+    from page_parser import ParserPool, parse_job_cards
+
+    pages = [(Path(p).read_text(encoding="utf-8"), Path(p).resolve().as_uri()) for p in args.pages]
+
+    def inline():
+        return sum(len(parse_job_cards(html, base_url=base)) for html, base in pages)
+
+    cards, timings = _timed(inline, args.repeat)
+    inline_rate = cards / statistics.mean(timings)
+
+    pool = ParserPool(args.workers or None)
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        def pooled():
+            # as in the crawler: one thread per page, each blocking on the pool
+            with ThreadPoolExecutor(max_workers=pool.workers) as threads:
+                return sum(threads.map(lambda page: len(pool.parse_job_cards(*page)), pages))
+
+        _, pooled_timings = _timed(pooled, args.repeat)
+    finally:
+        pool.close()
+    pooled_rate = cards / statistics.mean(pooled_timings)
+
+    print(f"Pages: {len(pages)} ({cards} cards, {args.repeat} runs)")
+    print(f"  lxml inline        : {inline_rate:10.0f} cards/s")
+    print(f"  ParserPool ({pool.workers:>2} procs): {pooled_rate:10.0f} cards/s")
+
+
+def _synthetic_jobs(rows, seed):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+
+    def pick(options):
+        return pd.Series(np.asarray(options, dtype=object)[rng.integers(0, len(options), rows)])
+
+    def numbers(low, high):
+        return pd.Series(rng.integers(low, high, rows)).astype(str)
+
+    places = ["Austin, TX", "Dallas, Texas, United States", "San Jose, CA", "New York, NY", "Texas, United States",
+              "United States", "Dallas-Fort Worth Metroplex", "Seattle, WA"]
+    modes = ["", " (On-site)", " (Hybrid)", " (Remote)"]
+    low = numbers(40, 200)
+    salaries = pick(["yearly", "hourly", "none"])
+    salary = ("$" + low + "K/yr - $" + (low.astype(int) + 30).astype(str) + "K/yr").where(salaries == "yearly", "")
+    salary = salary.where(salaries != "hourly", "$" + numbers(15, 90) + "/hr")
+    extras = pick(["", " · Promoted", " · Easy Apply", " · Actively reviewing applicants", " · Be an early applicant"])
+    applicants = pick(["", " · Over 100 applicants", " · "])
+    applicants = applicants.where(applicants != " · ", " · " + numbers(1, 100) + " applicants")
+    return pd.DataFrame({
+        "job_location": pick(places) + pick(modes),
+        "job_metadata": salary + extras + applicants,
+    })
+
+
+def _normalize_row(location, metadata):
+    # what consumers did before normalize.py: one regex pass per row
+    import re
+    from normalize import _APPLICANTS, _LOCATION, _SALARY
+
+    place = re.match(_LOCATION, location)
+    salary = re.search(_SALARY, metadata)
+    applicants = re.search(_APPLICANTS, metadata)
+    return (
+        place.group("city") if place else None, place.group("state") if place else None,
+        place.group("work_mode") if place else None,
+        salary.group("low") if salary else None, applicants.group("count") if applicants else None,
+        "Promoted" in metadata, "Easy Apply" in metadata,
+    )
+
+
+def bench_normalize(args):
+    """Rows/sec of the vectorized normalize_jobs on synthetic job cards, against a row-by-row regex loop."""
+    import pandas as pd
+    from normalize import normalize_jobs
+
+    jobs = _synthetic_jobs(args.rows, args.seed)
+
+    def vectorized():
+        batches = [normalize_jobs(jobs.iloc[i:i + args.batch_size]) for i in range(0, len(jobs), args.batch_size)]
+        return pd.concat(batches, ignore_index=True)
+
+    normalized, timings = _timed(vectorized, args.repeat)
+    rate = len(jobs) / statistics.mean(timings)
+
+    sample = jobs.head(args.baseline_rows)
+    _, row_timings = _timed(
+        lambda: [_normalize_row(loc, meta) for loc, meta in zip(sample["job_location"], sample["job_metadata"])],
+        args.repeat,
+    )
+    row_rate = len(sample) / statistics.mean(row_timings)
+
+    print(f"Rows: {len(jobs):,} synthetic job cards, batches of {args.batch_size:,} ({args.repeat} runs)")
+    print(f"  normalize_jobs   : {rate:12,.0f} rows/s")
+    print(f"  row-by-row regex : {row_rate:12,.0f} rows/s (first {len(sample):,} rows)")
+    print(f"  speedup          : {rate / row_rate:12.1f}x")
+    print(f"  parsed           : {normalized['work_mode'].notna().mean():.0%} work mode, "
+          f"{normalized['salary_min'].notna().mean():.0%} salary, {normalized['state_code'].notna().mean():.0%} state")
+
+
+def bench_split(args):
+    """Page loads of the fixed filter order vs the split planner on synthetic facet counts."""
+    from planner import simulate_split_costs
+
+    results = simulate_split_costs(queries=args.queries, seed=args.seed)
+    columns = ["probes", "pages", "page_loads", "leaves_over_cap"]
+    print(f"{'strategy':<12}" + "".join(f"{c:>16}" for c in columns))
+    for name, stats in results.items():
+        print(f"{name:<12}" + "".join(f"{stats[c]:>16}" for c in columns))
+    fixed = results["fixed_order"]["page_loads"]
+    planned = results["planner"]["page_loads"]
+    print(f"planner saves {fixed - planned} page loads ({(fixed - planned) / fixed:.1%})")
+
+
+class _ResourceSampler:
+    """Peak RSS, and CPU seconds since ``start``, of this process and its children (chromedriver, Chrome)."""
+
+    def __init__(self, interval=0.5):
+        import psutil
+
+        self._psutil = psutil
+        self.interval = interval
+        self.peak_rss_mb = 0.0
+        self._cpu = {}  # pid -> last seen user+system seconds
+        self._cpu_at_start = {}  # pid -> user+system seconds already used when start() was called
+        self._stop = None
+        self._thread = None
+
+    def _sample(self):
+        root = self._psutil.Process()
+        rss = 0
+        for process in [root] + root.children(recursive=True):
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+                    self._cpu[process.pid] = times.user + times.system
+            except self._psutil.Error:
+                pass
+        self.peak_rss_mb = max(self.peak_rss_mb, rss / (1024 * 1024))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        import threading
+
+        # imports and setup before the crawl are not part of the measurement
+        self._sample()
+        self._cpu_at_start = dict(self._cpu)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._sample()
+        self._stop.set()
+        self._thread.join()
+        cpu_seconds = sum(seconds - self._cpu_at_start.get(pid, 0.0) for pid, seconds in self._cpu.items())
+        return cpu_seconds, self.peak_rss_mb
+
+
+def bench_simulate(args):
+    """Run run_crawler against the offline LinkedIn simulator and report throughput."""
+    import json
+    import tempfile
+
+    from crawler import CrawlerJob, linkedin_page_crawler
+    from main import run_crawler
+    from rate_limiter import RateLimiter
+    from simulator import LinkedInSimulator, SimulatorConfig
+    from sink import JsonlSink
+    from url_generator import generate_urls
+
+    config = SimulatorConfig(
+        seed=args.seed,
+        max_total=args.max_total,
+        latency_ms=args.latency_ms,
+        hydrate_ms=args.hydrate_ms,
+        lazy=not args.eager,
+        failure_rate=args.failure_rate,
+        checkpoint_rate=args.checkpoint_rate,
+        slow_rate=args.slow_rate,
+    )
+    with LinkedInSimulator(config) as simulator, tempfile.TemporaryDirectory() as tmp:
+        urls = [simulator.rebase(url) for url in generate_urls(keyword=args.keywords, states=args.states)]
+        sink = JsonlSink(Path(tmp) / "results.jsonl")
+        sampler = _ResourceSampler().start()
+        started = time.perf_counter()
+        try:
+            pages = run_crawler(
+                [CrawlerJob(url, linkedin_page_crawler) for url in urls],
+                sink,
+                args.workers,
+                headless=True,
+                # a fixed budget keeps runs comparable; the simulator never throttles
+                rate_limiter=RateLimiter(args.rpm, min_rpm=args.rpm / 4, max_rpm=args.rpm),
+                max_attempts=args.max_attempts,
+                retry_backoff=1.0,
+                page_load_timeout=args.page_timeout,
+                frontier_db=str(Path(tmp) / "frontier.db"),
+                tabs_per_browser=max(1, args.tabs),
+                home_url=simulator.base_url,
+                login=False,
+            )
+        finally:
+            sink.close()
+            elapsed = time.perf_counter() - started
+            cpu_seconds, peak_rss_mb = sampler.stop()
+        jobs = 0
+        for part in sink.parts:
+            with open(part, "r", encoding="utf-8") as f:
+                jobs += sum(len(json.loads(line)["jobs"]) for line in f)
+
+    minutes = elapsed / 60
+    print(f"Simulator: {simulator.requests} requests, {simulator.pages} search pages, {simulator.failures} injected failures")
+    print(f"  wall time        : {elapsed:8.1f} s")
+    print(f"  pages written    : {pages:8d} ({pages / minutes:.1f}/min)")
+    print(f"  jobs written     : {jobs:8d} ({jobs / minutes:.1f}/min)")
+    print(f"  CPU time         : {cpu_seconds:8.1f} s ({cpu_seconds / elapsed:.0%} of one core)")
+    print(f"  peak RSS         : {peak_rss_mb:8.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn Job Crawler benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    extract = sub.add_parser("extract", help="Compare job card extraction on a saved search page")
+    extract.add_argument("--page", required=True, help="Saved LinkedIn search results HTML file")
+    extract.add_argument("--repeat", type=int, default=5, help="Timed runs per extraction path")
+    extract.set_defaults(func=bench_extract)
+
+    split = sub.add_parser("split", help="Simulate page loads for >1000-result split strategies")
+    split.add_argument("--queries", type=int, default=200, help="Synthetic base searches")
+    split.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic facet counts")
+    split.set_defaults(func=bench_split)
+
+    parity = sub.add_parser("parity", help="Check that page_parser reads the same fields as the in-browser extraction")
+    parity.add_argument("pages", nargs="+", help="Saved LinkedIn search results HTML files")
+    parity.add_argument("--verbose", action="store_true", help="Print every differing field")
+    parity.add_argument("--write-expected", action="store_true", help="Save the browser's cards as <page>.json (test fixtures)")
+    parity.set_defaults(func=bench_parity)
+
+    parse = sub.add_parser("parse", help="Measure cards/sec of the lxml parser inline and in a process pool")
+    parse.add_argument("pages", nargs="+", help="Saved LinkedIn search results HTML files")
+    parse.add_argument("--repeat", type=int, default=5, help="Timed runs")
+    parse.add_argument("--workers", type=int, default=0, help="Parser processes (default: CPU count)")
+    parse.set_defaults(func=bench_parse)
+
+    normalize = sub.add_parser("normalize", help="Measure rows/sec of normalize.py on synthetic job cards")
+    normalize.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows")
+    normalize.add_argument("--batch-size", type=int, default=100_000, help="Rows per normalize_jobs call")
+    normalize.add_argument("--baseline-rows", type=int, default=100_000, help="Rows timed with the row-by-row regex loop")
+    normalize.add_argument("--repeat", type=int, default=3, help="Timed runs")
+    normalize.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic rows")
+    normalize.set_defaults(func=bench_normalize)
+
+    simulate = sub.add_parser("simulate", help="Crawl the offline LinkedIn simulator and report pages/min, jobs/min, CPU and RSS")
+    simulate.add_argument("--keywords", default="Data Center", help="Search keyword")
+    simulate.add_argument("--states", nargs="+", default=["Texas"], help="States to crawl")
+    simulate.add_argument("--workers", type=int, default=3, help="Worker threads")
+    simulate.add_argument("--tabs", type=int, default=1, help="Tabs per Chrome instance")
+    simulate.add_argument("--rpm", type=float, default=600.0, help="Fixed request budget per minute")
+    simulate.add_argument("--max-attempts", type=int, default=3, help="Maximum attempts per job")
+    simulate.add_argument("--page-timeout", type=float, default=30.0, help="Page load timeout in seconds")
+    simulate.add_argument("--seed", type=int, default=7, help="Seed for result counts and cards")
+    simulate.add_argument("--max-total", type=int, default=3000, help="Largest unfiltered result count")
+    simulate.add_argument("--latency-ms", type=float, default=300.0, help="Server latency per search page")
+    simulate.add_argument("--hydrate-ms", type=float, default=200.0, help="Client-side delay before cards render")
+    simulate.add_argument("--eager", action="store_true", help="Render every card at once instead of on scroll")
+    simulate.add_argument("--failure-rate", type=float, default=0.0, help="Share of pages answered with HTTP 503")
+    simulate.add_argument("--checkpoint-rate", type=float, default=0.0, help="Share of pages redirected to a checkpoint")
+    simulate.add_argument("--slow-rate", type=float, default=0.0, help="Share of pages delayed by 30 s")
+    simulate.set_defaults(func=bench_simulate)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
+# Example usage:
+# python benchmark.py extract --page saved/search_page.html --repeat 10
+# python benchmark.py parity saved/*.html
+# python benchmark.py parity tests/fixtures/search_results.html --write-expected
+# python benchmark.py parse saved/*.html --repeat 10
+# python benchmark.py split --queries 500
+# python benchmark.py normalize --rows 1000000 --batch-size 100000
+# python benchmark.py simulate --workers 4 --tabs 2 --latency-ms 500 --failure-rate 0.02
@@ -0,0 +1,215 @@
+import os
+import re
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sink import run_callbacks
+from utils import JOB_FIELD_SELECTORS
+from url_generator import FULL_FILTER_ORDER, labels_from_url
+
+LABEL_COLUMNS = tuple(FULL_FILTER_ORDER)
+UNKNOWN_STATE = "unknown"
+
+# partition columns (crawl_date, state) live in the directory names, not in the files
+SCHEMA = pa.schema(
+    [pa.field(name, pa.string()) for name in JOB_FIELD_SELECTORS]
+    + [pa.field("query_url", pa.string()), pa.field("keywords", pa.string())]
+    + [pa.field(name, pa.string()) for name in LABEL_COLUMNS]
+    + [pa.field("crawled_at", pa.timestamp("ms", tz="UTC"))]
+)
+
+
+def flatten_record(record: dict, crawled_at: float | None = None) -> list[dict]:
+    """One row per job card of a ``{"url", "jobs"}`` sink record, tagged with its query's labels."""
+    url = record["url"]
+    labels = labels_from_url(url)
+    keywords = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query)).get("keywords")
+    crawled = datetime.fromtimestamp(record.get("crawled_at") or crawled_at or time.time(), tz=timezone.utc)
+    common = {
+        "query_url": url,
+        "keywords": keywords,
+        **{name: labels.get(name) for name in LABEL_COLUMNS},
+        "crawled_at": crawled,
+        "state": labels.get("state", UNKNOWN_STATE),
+    }
+    return [{**{name: job.get(name) for name in JOB_FIELD_SELECTORS}, **common} for job in record["jobs"]]
+
+
+class _OpenPart:
+    """A part file being written: row groups go to a hidden temporary file until the part is closed."""
+
+    def __init__(self, path, writer, opened_at):
+        self.path = path
+        self.temp = path.with_name(f".{path.name}.tmp")
+        self.writer = writer
+        self.opened_at = opened_at
+        self.rows = 0
+        self.buffer: list[dict] = []
+        self.callbacks = []
+
+
+class ParquetSink:
+    """Write result records as typed Parquet rows, partitioned Hive-style by crawl date and state.
+
+    Drop-in replacement for :class:`sink.JsonlSink`: ``write`` takes the same
+    ``{"url", "jobs"}`` records and flattens every job card into one row of
+    ``SCHEMA``, so readers (``pandas.read_parquet``, ``pyarrow.dataset``) load
+    only the columns and partitions they ask for.
+
+    Each partition has one open part,
+    ``<root>/crawl_date=YYYY-MM-DD/state=<State>/part-00000.parquet``, written
+    through a ``ParquetWriter`` under a hidden temporary name; rows are
+    buffered and appended as row groups of ``row_group_size``. A part is
+    closed (footer written, fsynced, renamed into place) once it is
+    ``part_interval`` seconds old or holds ``part_rows`` rows, and on
+    ``flush``/``close``; a background thread closes the parts of idle
+    partitions. So a day-long crawl leaves a few large parts per partition,
+    a crash loses at most the rows of the open parts, and no part is ever
+    visible without its footer. A new sink never overwrites parts left by an
+    earlier run. ``write(record, on_durable)`` calls ``on_durable()`` once
+    every part holding the record's rows has been closed, so the frontier
+    keeps the jobs of lost rows to crawl again.
+    """
+
+    def __init__(
+        self,
+        root="results",
+        *,
+        row_group_size=10_000,
+        part_rows=1_000_000,
+        part_interval=600.0,
+        compression="zstd",
+    ):
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+        self.part_rows = part_rows
+        self.part_interval = part_interval
+        self.compression = compression
+        self.records_written = 0
+        self.rows_written = 0
+        self.parts: list[Path] = []
+        self._lock = threading.Lock()
+        self._open: dict[tuple[str, str], _OpenPart] = {}
+        self._next_part: dict[tuple[str, str], int] = {}
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="parquet-sink", daemon=True)
+        self._thread.start()
+
+    def _partition_dir(self, partition):
+        crawl_date, state = partition
+        # pyarrow's Hive partitioning decodes URI-escaped segments ("New%20York")
+        return self.root / f"crawl_date={crawl_date}" / f"state={urllib.parse.quote(state, safe='')}"
+
+    def _part_path(self, partition):
+        directory = self._partition_dir(partition)
+        index = self._next_part.get(partition)
+        if index is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            indexes = [
+                int(match.group(1))
+                for match in (re.match(r"part-(\d+)\.parquet$", p.name) for p in directory.glob("part-*.parquet"))
+                if match
+            ]
+            index = max(indexes) + 1 if indexes else 0
+        self._next_part[partition] = index + 1
+        return directory / f"part-{index:05d}.parquet"
+
+    def _part(self, partition, now):
+        part = self._open.get(partition)
+        if part is None:
+            path = self._part_path(partition)
+            # readers skip names starting with "."; the part is renamed once its footer is written
+            temp = path.with_name(f".{path.name}.tmp")
+            writer = pq.ParquetWriter(temp, SCHEMA, compression=self.compression)
+            part = self._open[partition] = _OpenPart(path, writer, now)
+        return part
+
+    def _write_row_groups(self, part, last=False):
+        # only whole row groups until the part is closed, so every group but the last holds row_group_size rows
+        size = len(part.buffer) if last else len(part.buffer) - len(part.buffer) % self.row_group_size
+        if size:
+            rows, part.buffer = part.buffer[:size], part.buffer[size:]
+            part.writer.write_table(pa.Table.from_pylist(rows, schema=SCHEMA), row_group_size=self.row_group_size)
+            part.rows += size
+
+    def _close_part(self, partition):
+        part = self._open.pop(partition)
+        self._write_row_groups(part, last=True)
+        part.writer.close()
+        with open(part.temp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(part.temp, part.path)
+        self.parts.append(part.path)
+        self.rows_written += part.rows
+        run_callbacks(part.callbacks)
+
+    def _close_due(self, now):
+        for partition, part in list(self._open.items()):
+            if now - part.opened_at >= self.part_interval:
+                self._close_part(partition)
+
+    def _run(self):
+        while not self._stop.wait(min(self.part_interval, 30.0)):
+            try:
+                with self._lock:
+                    self._close_due(time.monotonic())
+            except Exception as exc:  # noqa: BLE001
+                self._error = exc
+                print(f"ParquetSink writer stopped: {exc}")
+                return
+
+    def write(self, record, on_durable=None):
+        if self._error is not None:
+            raise RuntimeError("result writer failed") from self._error
+        rows = flatten_record(record)
+        with self._lock:
+            now = time.monotonic()
+            partitions = {}
+            for row in rows:
+                partition = (row["crawled_at"].date().isoformat(), row.pop("state"))
+                partitions.setdefault(partition, []).append(row)
+            if on_durable is not None and partitions:
+                # every row of a record usually lands in one partition; otherwise wait for all of them
+                waiting = [len(partitions)]
+
+                def partition_durable():
+                    waiting[0] -= 1
+                    if not waiting[0]:
+                        on_durable()
+
+            for partition, partition_rows in partitions.items():
+                part = self._part(partition, now)
+                part.buffer.extend(partition_rows)
+                if on_durable is not None:
+                    part.callbacks.append(partition_durable)
+                self._write_row_groups(part)
+                if part.rows + len(part.buffer) >= self.part_rows:
+                    self._close_part(partition)
+            self._close_due(now)
+            self.records_written += 1
+        if on_durable is not None and not partitions:
+            on_durable()
+
+    def flush(self):
+        """Close every open part now, running the ``on_durable`` callbacks of their records."""
+        if self._error is not None:
+            raise RuntimeError("result writer failed") from self._error
+        with self._lock:
+            for partition in list(self._open):
+                self._close_part(partition)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        with self._lock:
+            for partition in list(self._open):
+                self._close_part(partition)
+        if self._error is not None:
+            raise RuntimeError("result writer failed") from self._error
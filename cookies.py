@@ -8,10 +8,10 @@ def save_cookies(driver, filename="cookies.pkl"):
         pickle.dump(cookies, f)
     print(f"Cookies saved to {filename}")
 
-def load_cookies(driver, filename="cookies.pkl"):
+def _read_linkedin_cookies(filename):
     if not os.path.exists(filename):
         print("Cookie file not found")
-        return False
+        return []
 
     with open(filename, "rb") as f:
         cookies = pickle.load(f)
@@ -35,6 +35,11 @@ def load_cookies(driver, filename="cookies.pkl"):
 
     if not linkedin_cookies:
         print("Cookie file exists but no LinkedIn cookies were found")
+    return linkedin_cookies
+
+def load_cookies(driver, filename="cookies.pkl"):
+    linkedin_cookies = _read_linkedin_cookies(filename)
+    if not linkedin_cookies:
         return False
 
     added = 0
@@ -57,3 +62,19 @@ def load_cookies(driver, filename="cookies.pkl"):
 
     print(f"Cookies loaded ({added} LinkedIn entries)")
     return True
+
+def load_cookies_into_session(session, filename="cookies.pkl"):
+    """Copy the Selenium cookies saved by save_cookies into a requests.Session."""
+    linkedin_cookies = _read_linkedin_cookies(filename)
+    for cookie in linkedin_cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+            secure=bool(cookie.get("secure")),
+            expires=cookie.get("expiry"),
+        )
+    if linkedin_cookies:
+        print(f"Cookies loaded into HTTP session ({len(linkedin_cookies)} LinkedIn entries)")
+    return bool(linkedin_cookies)
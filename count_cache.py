@@ -0,0 +1,78 @@
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from url_generator import canonical_query
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counts (
+    query TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def query_key(url: str) -> str:
+    """Cache key for a search URL: its canonical query (QueryPlan.canonical_key for the same params)."""
+    return canonical_query(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, keep_blank_values=True))
+
+
+class CountCache:
+    """Persistent search result counts with a time-to-live.
+
+    linkedin_page_crawler reads the count here before loading a probe page;
+    a fresh entry lets it decide between splitting and paginating without a
+    browser page load. Entries older than ``ttl`` seconds count as misses.
+    """
+
+    def __init__(self, path="counts.db", *, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _lookup(self, url):
+        row = self._conn.execute(
+            "SELECT count, fetched_at FROM counts WHERE query = ?", (query_key(url),)
+        ).fetchone()
+        if row is not None and time.time() - row[1] <= self.ttl:
+            return row[0]
+        return None
+
+    def get(self, url: str) -> int | None:
+        with self._lock:
+            count = self._lookup(url)
+            if count is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return count
+
+    def peek(self, url: str) -> int | None:
+        """Like ``get`` but not counted as a hit or miss (used for hints, not to skip page loads)."""
+        with self._lock:
+            return self._lookup(url)
+
+    def put(self, url: str, count: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO counts (query, count, fetched_at) VALUES (?, ?, ?)",
+                (query_key(url), count, time.time()),
+            )
+            self._conn.commit()
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"Count cache: {self.hits} hits, {self.misses} misses ({rate:.1%} hit rate)"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,4 +1,5 @@
-import time, re, random
+import time, re
+import urllib.parse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,36 +14,79 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
 
-from url_generator import FULL_FILTER_DEFINITIONS, generate_urls, FULL_FILTER_ORDER, extend_url_with_filter
-from utils import extract_number_results, extract_job_data, simulate_human_like_actions
+from url_generator import FULL_FILTER_DEFINITIONS, generate_urls, FULL_FILTER_ORDER, extend_url_with_filter, canonical_url
+from utils import extract_number_results, extract_job_cards, simulate_human_like_actions, JOB_CARD_SELECTOR
+from http_fetch import ChallengeResponse, RateLimited, get_fetcher
+from page_parser import outer_html
+from readiness import ReadinessPolicy, wait_until_ready, scroll_until_hydrated
+from metrics import metrics, timed
+from planner import PAGE_SIZE
 
 import os
 from dotenv import load_dotenv
 
 
+# 由 main.py 配置的可选项。handler 的签名固定为 func(driver, url, time_sleep, wait_time)，
+# 共享的设置放在这里。
+_options = {
+    "http_fetch": False,  # 列表页是否先走 HTTP 抓取 (linkedin_http_job_crawler)
+    "http_cookies_file": "cookies.pkl",
+    "split_planner": None,  # planner.SplitPlanner；None 时按 FULL_FILTER_ORDER 固定顺序细化
+    "count_cache": None,  # count_cache.CountCache；命中时不需要加载页面就能决定细化还是翻页
+    "page_profiler": None,  # page_profile.PageProfiler；屏蔽重资源并记录每页传输字节数和加载时间
+    "parser_pool": None,  # page_parser.ParserPool；设置后职位卡片从 main#main 的 HTML 在独立进程中解析，而不是在浏览器里执行脚本
+    "rate_limiter": None,  # rate_limiter.RateLimiter；每次向 LinkedIn 发出页面请求 (浏览器或 HTTP) 前取一个令牌
+    "snapshot_store": None,  # snapshots.SnapshotStore；保存每个职位列表页 (结果写入 sink 的页面) main#main 的 HTML，之后可离线重新解析
+}
+
+
+HTTP_RATE_LIMIT_RETRIES = 2
+HTTP_RETRY_AFTER_MAX = 60.0  # 秒；Retry-After 最多等待这么久
+
+
+def _acquire_request_slot():
+    # 只有真正发出请求时才消耗令牌；命中 count cache 的任务不发请求，也不占用限速器
+    rate_limiter = _options["rate_limiter"]
+    if rate_limiter is not None:
+        with timed("rate_limit_wait"):
+            rate_limiter.acquire()
+
+
+def configure_crawler(**options):
+    unknown = set(options) - set(_options)
+    if unknown:
+        raise KeyError(f"Unknown crawler option(s): {', '.join(sorted(unknown))}")
+    _options.update(options)
+
+
 class CrawlerJob:
     # 一个(URL, handler)结构体，代表爬虫任务的一个单元。
     # url: 需要爬取的 URL
     # handler: 处理该 URL 的函数，函数签名为 func(driver, url, time_sleep, wait_time) -> CrawlerResult
+    #          driver 可以是完整的 WebDriver，也可以是 tabs.TabHandle (多 tab 模式下的一个 tab)
     def __init__(self, url, handler):
         self.url = url
         self.handler = handler
         self.attempts = 0
+        self.id = None  # frontier 中的行号，由 Frontier 分配
         # self.result = None  # 爬取结果，handler 的返回值
         # self.error = None  # 爬取错误信息，handler 抛出的异常
         # self.attempts = 0  # 已尝试爬取次数
         # self.success = False  # 是否成功爬取
 
 class CrawlerResult:
-    def __init__(self, url, data=None, crawler_type=None):
+    def __init__(self, url, data=None, crawler_type=None, incomplete=None):
         self.url = url
         self.data = data  # 爬取结果，handler 的返回值
         self.crawler_type = crawler_type  # choice of ['list', 'detail']
+        # 页面没有拿到结果的原因 (未加载、未就绪、卡片没有渲染)；不为 None 时这个查询不算爬取成功，增量模式不推进它的 watermark
+        self.incomplete = incomplete
 
 
-def result_router(result: CrawlerResult, job_queue, results, results_lock) -> None:
+def result_router(result: CrawlerResult, job_queue, sink, dedup=None, on_durable=None) -> bool:
+    # 返回 True 表示结果已交给 sink，落盘后 sink 会调用 on_durable；返回 False 时没有需要等待落盘的结果
     if not result or not result.data:
-        return
+        return False
     # 根据 result 的内容决定下一步操作
     if result.crawler_type == 'list':
         # 解析出新的任务，加入队列
@@ -51,13 +95,32 @@ def result_router(result: CrawlerResult, job_queue, results, results_lock) -> No
             job_queue.put(job)
 
     elif result.crawler_type == 'detail':
-        # 直接保存结果
-        with results_lock:
-            # results 是一个 list，保存所有 detail 结果，把结果追加进去
-            results.append({"url": result.url, "jobs": result.data})
+        # 按 job_id 去掉之前已经抓到的职位 (depulicate.JobDeduplicator)
+        jobs = dedup.filter(result.url, result.data) if dedup is not None else result.data
+        if not jobs:
+            return False
+
+        def durable():
+            # job_id 在结果真正落盘后才写入去重索引，写入失败时撤销预留，重试或 --resume 时不会被当作重复丢掉
+            if dedup is not None:
+                dedup.confirm(jobs)
+            if on_durable is not None:
+                on_durable()
+
+        # 直接交给 sink 写盘 (sink.JsonlSink)，内存中不保留结果
+        try:
+            sink.write({"url": result.url, "jobs": jobs}, on_durable=durable)
+        except Exception:
+            if dedup is not None:
+                dedup.release(jobs)
+            raise
+        # 只统计去重后真正交给 sink 的卡片
+        metrics.inc("crawler_cards_total", len(jobs))
+        return True
 
     else:
         print(f"未知的结果类型: {result.crawler_type}")
+    return False
 
 def wait_get_element(driver, selector, timeout=10):
     try:
@@ -138,29 +201,36 @@ def linkedin_common_crawler(driver, url, time_sleep=1, wait_time=10):
         return None
 
     # Wait for the first job card to load
-    if not wait_for_element(driver, "ul:first-of-type>li.ember-view div.artdeco-entity-lockup__metadata", timeout=wait_time):
+    if not wait_for_element(driver, f"{JOB_CARD_SELECTOR} div.artdeco-entity-lockup__metadata", timeout=wait_time):
         return None
     
-    job_card_list = job_main.find_elements(By.CSS_SELECTOR, "ul:first-of-type>li.ember-view")
-
-    all_job_data = list(map(extract_job_data, job_card_list))
+    all_job_data = extract_job_cards(driver, job_main)
 
     return {
         "url": url,
         "jobs": all_job_data
     }
 
-def get_linkedin_job_main_page(driver, url, time_sleep=1, wait_time=10, scroll=False, _refresh_attempt=0):
+def get_linkedin_job_main_page(driver, url, time_sleep=0, wait_time=10, scroll=False, min_cards=0, _refresh_attempt=0):
     # 获取 LinkedIn 职位搜索页面，返回 main#main 元素
+    # scroll: True 时滚动列表直到 25 张卡片渲染完成；传入整数时等待这么多张卡片
+    # 不再固定 sleep：等待页面真正就绪 (结果数字幕、min_cards 张卡片渲染完成、网络空闲)，见 readiness.py。
+    # 请求节奏由限速器控制 (_acquire_request_slot)；time_sleep 只是就绪后的额外等待，默认 0。
     previous_main = None
     try:
         previous_main = driver.find_element(By.CSS_SELECTOR, "main#main")
     except NoSuchElementException:
         previous_main = None
 
+    profiler = _options["page_profiler"]
+    if profiler is not None:
+        profiler.before_page(driver)
+
     timeout_exc = None
+    _acquire_request_slot()
     try:
-        driver.get(url)
+        with timed("driver.get"):
+            driver.get(url)
     except TimeoutException as exc:
         timeout_exc = exc
         print(f"页面加载超时: {url}")
@@ -173,8 +243,6 @@ def get_linkedin_job_main_page(driver, url, time_sleep=1, wait_time=10, scroll=F
         print(f"driver.get 出现异常: {url} ({exc})")
         raise RuntimeError(f"driver.get 失败: {url}") from exc
 
-    time.sleep(time_sleep + random.randint(0, 2))
-
     wait_timeout = wait_time * 2 if timeout_exc is not None else wait_time
 
     if timeout_exc is not None and previous_main is not None:
@@ -190,40 +258,48 @@ def get_linkedin_job_main_page(driver, url, time_sleep=1, wait_time=10, scroll=F
             except WebDriverException:
                 pass
             driver.refresh()
-            time.sleep(random.uniform(1.0, 2.5))
             return get_linkedin_job_main_page(
                 driver,
                 url,
                 time_sleep=time_sleep,
                 wait_time=wait_time,
                 scroll=scroll,
+                min_cards=min_cards,
                 _refresh_attempt=_refresh_attempt + 1,
             )
 
-    simulate_human_like_actions(driver, 1, 2)
+    with timed("readiness"):
+        readiness = wait_until_ready(driver, ReadinessPolicy(min_cards=min_cards), wait_timeout)
+    if not readiness.ready:
+        print(f"页面未在 {wait_timeout}s 内就绪: {url} {readiness.state}")
+    if time_sleep:
+        time.sleep(time_sleep)
+
+    with timed("human_actions"):
+        simulate_human_like_actions(driver, 1, 2)
 
-    job_main = wait_get_element(driver, "main#main", timeout=wait_timeout)
+    mains = driver.find_elements(By.CSS_SELECTOR, "main#main")
+    job_main = mains[0] if mains else None
     if not job_main:
         if timeout_exc is not None:
             raise RuntimeError(f"页面加载超时: {url}") from timeout_exc
         return None
 
     if scroll:
-        # find scrollable job list container scaffold-layout__list>div
+        # 在页面内用一个异步脚本滚动 scaffold-layout__list>div，直到预期数量的卡片都渲染出 metadata
         scrollable = job_main.find_element(By.CSS_SELECTOR, "div.scaffold-layout__list>div")
-        scroll_height = driver.execute_script("return arguments[0].scrollHeight", scrollable)
-        position = 0
-        step = 300
-
-        while position < scroll_height:
-            position += step
-            driver.execute_script("arguments[0].scrollTo(0, arguments[1]);", scrollable, position)
-            time.sleep(random.uniform(0.1, 0.4))
-            scroll_height = driver.execute_script("return arguments[0].scrollHeight", scrollable)
+        expected = scroll if isinstance(scroll, int) and not isinstance(scroll, bool) else PAGE_SIZE
+        with timed("scroll"):
+            scrolled = scroll_until_hydrated(driver, scrollable, expected, timeout=wait_timeout)
+        if not scrolled.get("complete"):
+            print(f"滚动结束时只有 {scrolled.get('hydrated', 0)}/{expected} 张卡片渲染完成: {url}")
 
     if timeout_exc is not None:
         print(f"页面加载超时但 DOM 已可用: {url}")
 
+    if profiler is not None:
+        profiler.after_page(driver, url)
+
     return job_main
 
 
@@ -239,15 +315,25 @@ def linkedin_page_crawler(driver, url, time_sleep=1, wait_time=10) -> CrawlerRes
             paged_urls.append(paged_url)
         return paged_urls
 
-    print(f"访问页面: {url}")
-    job_main = get_linkedin_job_main_page(driver, url, time_sleep, wait_time)
-    if not job_main:
-        return CrawlerResult(url, [], 'list')
-    total_jobs = extract_number_results(job_main)
-    if total_jobs is None:
-        print("无法解析职位总数，跳过该页面")
-        return CrawlerResult(url, [], 'list')
+    count_cache = _options["count_cache"]
+    total_jobs = count_cache.get(url) if count_cache is not None else None
+    if total_jobs is not None:
+        print(f"使用缓存的职位总数: {url}")
+    else:
+        print(f"访问页面: {url}")
+        job_main = get_linkedin_job_main_page(driver, url, time_sleep, wait_time)
+        if not job_main:
+            return CrawlerResult(url, [], 'list', incomplete="no main#main")
+        total_jobs = extract_number_results(job_main)
+        if total_jobs is None:
+            print("无法解析职位总数，跳过该页面")
+            return CrawlerResult(url, [], 'list', incomplete="no result count")
+        if count_cache is not None:
+            count_cache.put(url, total_jobs)
     print(f"Total jobs found: {total_jobs}")
+    planner = _options["split_planner"]
+    if planner is not None:
+        planner.observe(url, total_jobs)
 
     jobs = []
 
@@ -261,46 +347,115 @@ def linkedin_page_crawler(driver, url, time_sleep=1, wait_time=10) -> CrawlerRes
         available_filters = [(f[0], f[1].param_key) for f in FULL_FILTER_DEFINITIONS.items() if f[1].param_key not in existing_filter_keys]
         if not available_filters:
             print("没有可用的细化筛选项，直接生成职位详情任务...")
-            jobs.extend(CrawlerJob(url, linkedin_job_crawler) for url in generate_paged_urls(url, total_jobs))
+            jobs.extend(CrawlerJob(url, _detail_handler()) for url in generate_paged_urls(url, total_jobs))
             return CrawlerResult(url, jobs, 'list')
 
-        # 如果有可用选项，则按照 FULL_FILTER_ORDER 顺序，选择第一个生成新的任务。只生成一个细化筛选任务，避免任务爆炸。
+        # 选择一个筛选项生成新的任务：有 planner 时按历史统计选择预计页面加载最少的维度，
+        # 否则按照 FULL_FILTER_ORDER 顺序选择第一个。只生成一个细化筛选任务，避免任务爆炸。
         available_filter_names = [f[0] for f in available_filters]
-        next_filter = next((f for f in FULL_FILTER_ORDER if f in available_filter_names), None)
+        if planner is not None:
+            next_filter = planner.choose_filter(url, total_jobs, available_filter_names)
+        else:
+            next_filter = next((f for f in FULL_FILTER_ORDER if f in available_filter_names), None)
 
         if not next_filter:
             print("没有可用的细化筛选项，直接生成职位详情任务...")
-            jobs.extend(CrawlerJob(url, linkedin_job_crawler) for url in generate_paged_urls(url, total_jobs))
+            jobs.extend(CrawlerJob(url, _detail_handler()) for url in generate_paged_urls(url, total_jobs))
             return CrawlerResult(url, jobs, 'list')
 
         # 生成细化筛选任务
         filtered_urls = extend_url_with_filter(url, next_filter)
         # 遍历所有可能的选项值，生成新的任务
+        # 值为 None 的选项 (如 "Any time") 生成的 URL 与当前页面相同，跳过以免重复探测
         for filtered_url in filtered_urls:
+            if canonical_url(filtered_url) == canonical_url(url):
+                continue
             jobs.append(CrawlerJob(filtered_url, linkedin_page_crawler))
 
         return CrawlerResult(url, jobs, 'list')
     else:
         print("少于 1000 条，生成职位详情的任务...")
-        jobs.extend(CrawlerJob(url, linkedin_job_crawler) for url in generate_paged_urls(url, total_jobs))
+        jobs.extend(CrawlerJob(url, _detail_handler()) for url in generate_paged_urls(url, total_jobs))
         return CrawlerResult(url, jobs, 'list')
 
+def expected_cards(url):
+    # 当前页应有的卡片数：知道职位总数 (count cache) 时为 min(25, total - start)，否则按满页 25 张
+    count_cache = _options["count_cache"]
+    total = count_cache.peek(url) if count_cache is not None else None
+    if total is None:
+        return PAGE_SIZE
+    start = int(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("start", ["0"])[0])
+    return max(1, min(PAGE_SIZE, total - start))
+
 def linkedin_job_crawler(driver, url, time_sleep=1, wait_time=10) -> CrawlerResult:
     # 爬取 LinkedIn 职位列表页，返回当前页面所有职位数据
     # 返回值: CrawlerResult {url, list[dict], 'detail'}
-    page_data = get_linkedin_job_main_page(driver, url, time_sleep, wait_time, scroll=True)
+    page_data = get_linkedin_job_main_page(driver, url, time_sleep, wait_time, scroll=expected_cards(url), min_cards=1)
     if not page_data:
-        return CrawlerResult(url, [], 'detail')
+        return CrawlerResult(url, [], 'detail', incomplete="no main#main")
 
     # Wait for the first job card to load
-    if not wait_for_element(driver, "ul:first-of-type>li.ember-view div.artdeco-entity-lockup__metadata", timeout=wait_time):
-        return CrawlerResult(url, [], 'detail')
-
-    job_cards = page_data.find_elements(By.CSS_SELECTOR, "ul:first-of-type>li.ember-view")
-    jobs = [extract_job_data(card) for card in job_cards]
+    if not wait_for_element(driver, f"{JOB_CARD_SELECTOR} div.artdeco-entity-lockup__metadata", timeout=wait_time):
+        # 卡片没有渲染出来时，检查是不是被屏蔽的资源导致的
+        if _options["page_profiler"] is not None:
+            _options["page_profiler"].hydration_failed(driver, url)
+        return CrawlerResult(url, [], 'detail', incomplete="cards not hydrated")
+
+    parser_pool = _options["parser_pool"]
+    snapshot_store = _options["snapshot_store"]
+    # 只取一次 outerHTML，解析和快照共用
+    html = page_data.get_attribute("outerHTML") if parser_pool is not None or snapshot_store is not None else None
+    # 只保存结果会写入 sink 的页面；探测职位总数的列表页不保存，离线重新解析时不会多出结果
+    if snapshot_store is not None:
+        with timed("snapshot"):
+            snapshot_store.put(url, html)
+
+    with timed("extract"):
+        if parser_pool is not None:
+            # 所有字段在本地用 utils 中的同一组 CSS 选择器解析
+            jobs = parser_pool.parse_job_cards(html, base_url=url)
+        else:
+            jobs = extract_job_cards(driver, page_data)
 
     return CrawlerResult(url, jobs, 'detail')
 
+def linkedin_http_job_crawler(driver, url, time_sleep=1, wait_time=10) -> CrawlerResult:
+    # 通过 HTTP 直接抓取职位列表页并本地解析，不经过浏览器渲染
+    # 只有当响应是登录/验证页面时才退回 Selenium (linkedin_job_crawler)
+    # 返回值: CrawlerResult {url, list[dict], 'detail'}
+    # HTTP 429 是限流而不是登录墙：降低速率后重新取令牌再试，超过 HTTP_RATE_LIMIT_RETRIES 次时按普通错误交给 worker 重试
+    for attempt in range(HTTP_RATE_LIMIT_RETRIES + 1):
+        _acquire_request_slot()
+        try:
+            with timed("http_fetch"):
+                main, jobs = get_fetcher(_options["http_cookies_file"]).fetch_page(url)
+        except ChallengeResponse as exc:
+            print(f"HTTP 抓取遇到登录/验证页面，改用浏览器: {url} ({exc})")
+            return linkedin_job_crawler(driver, url, time_sleep, wait_time)
+        except RateLimited as exc:
+            if _options["rate_limiter"] is not None:
+                _options["rate_limiter"].throttled("http 429")
+            if attempt == HTTP_RATE_LIMIT_RETRIES:
+                raise RuntimeError(f"HTTP 抓取被限流: {url}") from exc
+            if exc.retry_after:
+                time.sleep(min(exc.retry_after, HTTP_RETRY_AFTER_MAX))
+            continue
+        # 和浏览器抓取的页面一样保存 main#main 的 HTML
+        snapshot_store = _options["snapshot_store"]
+        if snapshot_store is not None:
+            with timed("snapshot"):
+                snapshot_store.put(url, outer_html(main))
+        return CrawlerResult(url, jobs, 'detail')
+
+def _detail_handler():
+    return linkedin_http_job_crawler if _options["http_fetch"] else linkedin_job_crawler
+
 def linkedin_job_detail_crawler(driver, url, time_sleep=1, wait_time=10):
     pass
 
+
+# handler 名称 -> 函数，Frontier 按名称把任务持久化到磁盘
+HANDLERS = {
+    handler.__name__: handler
+    for handler in (linkedin_page_crawler, linkedin_job_crawler, linkedin_http_job_crawler)
+}
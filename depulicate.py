@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import urllib.parse
+from collections import defaultdict
+
+from url_generator import canonical_url
+
+# /jobs/view/<id>/ or /jobs/view/<slug>-<id>/
+JOB_VIEW_ID = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d+)")
+
+
+def job_key(job: dict) -> str | None:
+    """Identity of a scraped job card.
+
+    Uses ``job_id`` (see utils.get_job_id). When it is empty, falls back to the
+    id in the job URL, then to the URL without query string and fragment.
+    Returns None when the card has neither, so it is never treated as a duplicate.
+    """
+    job_id = (job.get("job_id") or "").strip()
+    if job_id:
+        return job_id
+    job_url = (job.get("job_url") or "").strip()
+    if not job_url:
+        return None
+    match = JOB_VIEW_ID.search(job_url)
+    if match:
+        return match.group(1)
+    parts = urllib.parse.urlsplit(job_url)
+    return "url:" + parts.netloc.lower() + parts.path.rstrip("/")
+
+
+class DedupIndex:
+    """Set of seen job keys stored in SQLite, so memory stays bounded for millions of keys."""
+
+    def __init__(self, path=":memory:", *, reset=False, commit_every=1000):
+        self.path = path
+        self.commit_every = commit_every
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        if reset:
+            self._conn.execute("DELETE FROM seen")
+        self._conn.commit()
+
+    def add(self, key: str) -> bool:
+        """Record ``key``; True if it had not been seen before."""
+        with self._lock:
+            added = self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,)).rowcount == 1
+            self._count_writes(1)
+            return added
+
+    def add_many(self, keys) -> None:
+        keys = [(key,) for key in keys]
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO seen (key) VALUES (?)", keys)
+            self._count_writes(len(keys))
+
+    def _count_writes(self, writes):
+        self._writes += writes
+        if self._writes >= self.commit_every:
+            self._conn.commit()
+            self._writes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+class JobDeduplicator:
+    """Drop job cards whose key was already seen and count duplicates per query branch.
+
+    A branch is the search URL without its ``start`` page parameter (see
+    url_generator.canonical_url), i.e. one leaf of the filter split.
+
+    ``filter`` only reserves the keys of the cards it lets through, so two
+    pages in flight never both keep the same job. The keys enter the index
+    with ``confirm`` once the sink has made those cards durable; ``release``
+    drops the reservation when they could not be written, so a retry or
+    ``--resume`` keeps them instead of treating them as duplicates.
+    """
+
+    def __init__(self, index: DedupIndex | None = None):
+        self.index = index or DedupIndex()
+        self._lock = threading.Lock()
+        self._reserved: set[str] = set()
+        self._branches = defaultdict(lambda: [0, 0])  # branch -> [total, duplicates]
+
+    def filter(self, page_url: str, jobs: list[dict]) -> list[dict]:
+        unique = []
+        duplicates = 0
+        with self._lock:
+            for job in jobs:
+                key = job_key(job)
+                if key is None:
+                    unique.append(job)
+                elif key in self._reserved or key in self.index:
+                    duplicates += 1
+                else:
+                    self._reserved.add(key)
+                    unique.append(job)
+            counts = self._branches[canonical_url(page_url)]
+            counts[0] += len(jobs)
+            counts[1] += duplicates
+        return unique
+
+    def confirm(self, jobs: list[dict]) -> None:
+        """Record the keys of ``jobs`` (returned by ``filter``) once they are on disk."""
+        keys = [key for key in map(job_key, jobs) if key is not None]
+        self.index.add_many(keys)
+        with self._lock:
+            self._reserved.difference_update(keys)
+
+    def release(self, jobs: list[dict]) -> None:
+        """Forget the reservation of ``jobs`` (returned by ``filter``) that were not written."""
+        with self._lock:
+            self._reserved.difference_update(key for key in map(job_key, jobs) if key is not None)
+
+    def report(self) -> list[tuple[str, int, int, float]]:
+        """(branch, total, duplicates, ratio) rows, highest duplicate ratio first."""
+        with self._lock:
+            rows = [
+                (branch, total, dups, dups / total if total else 0.0)
+                for branch, (total, dups) in self._branches.items()
+            ]
+        return sorted(rows, key=lambda row: (row[3], row[1]), reverse=True)
+
+    def print_report(self, top=20):
+        rows = self.report()
+        total = sum(row[1] for row in rows)
+        dups = sum(row[2] for row in rows)
+        ratio = dups / total if total else 0.0
+        print(f"Deduplication: {dups}/{total} duplicate job cards ({ratio:.1%}) across {len(rows)} branches")
+        for branch, branch_total, branch_dups, branch_ratio in rows[:top]:
+            print(f"  {branch_ratio:6.1%}  {branch_dups:>6}/{branch_total:<6} {branch}")
+
+
+def iter_records(path):
+    """Yield {url, jobs} records from a JSONL result file or a legacy JSON array file."""
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            # output of the old save_results(); the file is loaded whole
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def dedupe_files(paths, output, *, index_path=None) -> JobDeduplicator:
+    """Stream every record in ``paths`` into ``output`` (JSONL), keeping the first copy of each job."""
+    temp_dir = None
+    if index_path is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        index_path = os.path.join(temp_dir.name, "dedup.db")
+    dedup = JobDeduplicator(DedupIndex(index_path))
+    try:
+        with open(output, "w", encoding="utf-8") as out:
+            for path in paths:
+                for record in iter_records(path):
+                    jobs = dedup.filter(record.get("url", ""), record.get("jobs") or [])
+                    if jobs:
+                        out.write(json.dumps({"url": record.get("url"), "jobs": jobs}, ensure_ascii=False, separators=(",", ":")) + "\n")
+                        dedup.confirm(jobs)
+    finally:
+        dedup.index.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    return dedup
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate crawler result files by job_id")
+    parser.add_argument("inputs", nargs="+", help="Result files (.jsonl parts or legacy .json)")
+    parser.add_argument("-o", "--output", required=True, help="Deduplicated JSONL output file")
+    parser.add_argument("--index", type=str, default=None, help="Keep the seen-key index in this SQLite file (default: temporary)")
+    parser.add_argument("--top", type=int, default=20, help="Branches to list in the duplicate report")
+    args = parser.parse_args()
+
+    result = dedupe_files(args.inputs, args.output, index_path=args.index)
+    result.print_report(top=args.top)
+# Example usage:
+# python depulicate.py results-00000.jsonl results-00001.jsonl -o results.dedup.jsonl
@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+from selenium.common.exceptions import WebDriverException
+
+from tabs import BrowserTabs
+
+
+def driver_rss_mb(driver) -> float:
+    """Resident memory of the chromedriver process and every browser process under it."""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return 0.0
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def is_driver_alive(driver) -> bool:
+    try:
+        driver.current_url  # noqa: B018 - any round trip will do
+        return True
+    except WebDriverException:
+        return False
+
+
+class _Browser:
+    def __init__(self, driver, tabs):
+        self.driver = driver
+        if tabs > 1:
+            self.slots = BrowserTabs(driver, tabs).handles
+        else:
+            self.slots = [driver]
+        self.pages = 0
+        self.active = 0
+        self.retiring = None  # reason, once the browser should be quit
+
+
+class DriverPool:
+    """Warm pool of logged-in WebDrivers shared by the worker threads.
+
+    ``create_driver(session_cookies=None)`` builds one browser. ``start`` boots
+    the first browser, which loads the saved cookies or logs in, then boots the
+    rest in parallel with that browser's cookies, so the login happens once.
+
+    Workers borrow a slot per job. A slot is the driver itself, or with
+    ``tabs_per_browser > 1`` a tabs.TabHandle on one tab of a shared browser.
+    A browser is retired after serving ``max_pages`` jobs, once its process
+    tree exceeds ``max_rss_mb``, or when it has crashed. It is quit when its
+    last slot comes back, and a replacement is booted on a later ``acquire``.
+    """
+
+    def __init__(self, create_driver, size, *, tabs_per_browser=1, max_pages=200, max_rss_mb=None):
+        self.create_driver = create_driver
+        self.size = size
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._browsers: list[_Browser] = []
+        self._owner = {}  # slot -> _Browser
+        self._booting = 0
+        self._cookies = None
+        self._closed = False
+        self.recycled = 0
+        self.replaced = 0
+        self._started_at = None
+        self.first_driver_seconds = None
+        self.all_drivers_seconds = None
+        self.first_page_seconds = None
+
+    def _add(self, driver):
+        browser = _Browser(driver, self.tabs_per_browser)
+        with self._cond:
+            self._browsers.append(browser)
+            for slot in browser.slots:
+                self._owner[slot] = browser
+                self._idle.append(slot)
+            self._cond.notify_all()
+
+    def start(self):
+        self._started_at = time.monotonic()
+        primary = self.create_driver()
+        self._cookies = primary.get_cookies()
+        self._add(primary)
+        self.first_driver_seconds = time.monotonic() - self._started_at
+        print(f"[DriverPool] first driver ready in {self.first_driver_seconds:.1f}s")
+
+        if self.size > 1:
+            with ThreadPoolExecutor(max_workers=self.size - 1) as executor:
+                futures = [executor.submit(self._create_clone) for _ in range(self.size - 1)]
+            # keep every clone that booted, even if another failed, so close() quits its browser
+            error = None
+            for future in futures:
+                try:
+                    self._add(future.result())
+                except Exception as exc:  # noqa: BLE001
+                    error = error or exc
+            if error is not None:
+                raise error
+        self.all_drivers_seconds = time.monotonic() - self._started_at
+        print(
+            f"[DriverPool] {self.size} browsers x {self.tabs_per_browser} tabs ready "
+            f"in {self.all_drivers_seconds:.1f}s"
+        )
+
+    def _create_clone(self):
+        return self.create_driver(session_cookies=self._cookies)
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if self._idle:
+                    slot = self._idle.popleft()
+                    self._owner[slot].active += 1
+                    return slot
+                if len(self._browsers) + self._booting < self.size:
+                    self._booting += 1
+                    break
+                self._cond.wait()
+        try:
+            driver = self._create_clone()
+        except Exception:
+            with self._cond:
+                self._booting -= 1
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._booting -= 1
+        self._add(driver)
+        return self.acquire()
+
+    def release(self, slot, *, broken=False):
+        """Return ``slot`` after one job; a ``broken`` slot retires its whole browser."""
+        with self._cond:
+            browser = self._owner[slot]
+            browser.active -= 1
+            if broken:
+                browser.retiring = browser.retiring or "crashed"
+            elif browser.retiring is None:
+                if self.first_page_seconds is None and self._started_at is not None:
+                    self.first_page_seconds = time.monotonic() - self._started_at
+                browser.pages += 1
+                if self.max_pages and browser.pages >= self.max_pages:
+                    browser.retiring = f"served {browser.pages} pages"
+            check_rss = browser.retiring is None and bool(self.max_rss_mb)
+
+        if check_rss:
+            rss = driver_rss_mb(browser.driver)
+            if rss > self.max_rss_mb:
+                with self._cond:
+                    browser.retiring = browser.retiring or f"RSS {rss:.0f} MB"
+
+        with self._cond:
+            if browser.retiring is None:
+                self._idle.append(slot)
+                self._cond.notify()
+                return
+            # stop handing out this browser's other tabs
+            self._idle = deque(s for s in self._idle if self._owner[s] is not browser)
+            if browser.active > 0 or browser not in self._browsers:
+                return
+            self._browsers.remove(browser)
+            for s in browser.slots:
+                self._owner.pop(s, None)
+            if browser.retiring == "crashed":
+                self.replaced += 1
+            else:
+                self.recycled += 1
+            self._cond.notify_all()
+
+        print(f"[DriverPool] retiring browser ({browser.retiring})")
+        if browser.retiring != "crashed":
+            try:
+                # keep the clone cookies current; LinkedIn rotates some of them
+                self._cookies = browser.driver.get_cookies()
+            except WebDriverException:
+                pass
+        try:
+            browser.driver.quit()
+        except WebDriverException:
+            pass
+
+    def rss_mb(self) -> float:
+        with self._cond:
+            drivers = [browser.driver for browser in self._browsers]
+        return sum(driver_rss_mb(driver) for driver in drivers)
+
+    def summary(self) -> str:
+        first_page = f"{self.first_page_seconds:.1f}s" if self.first_page_seconds is not None else "n/a"
+        return (
+            f"Driver pool: first page after {first_page}, "
+            f"{self.recycled} recycled, {self.replaced} replaced after crashes, "
+            f"{self.rss_mb():.0f} MB resident across {len(self._browsers)} browsers"
+        )
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            drivers = [browser.driver for browser in self._browsers]
+            self._browsers.clear()
+            self._owner.clear()
+            self._idle.clear()
+            self._cond.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
@@ -0,0 +1,384 @@
+import heapq
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from crawler import CrawlerJob, HANDLERS
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+PARKED = "parked"  # waiting for its retry time (ready_at)
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    handler TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    ready_at REAL,
+    priority INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL,
+    UNIQUE (url, handler)
+);
+CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id);
+"""
+
+# lower runs first: pagination leaves before new count probes, so results start flowing early
+# and every probe's fan-out is drained before the next probe adds more
+HANDLER_PRIORITY = {
+    "linkedin_job_crawler": 0,
+    "linkedin_http_job_crawler": 0,
+    "linkedin_page_crawler": 1,
+}
+
+_ORDER_BY = {
+    "dfs": "priority, id DESC",  # newest first: finish one split subtree before starting the next
+    "bfs": "priority, id",
+}
+
+MAX_DEPTH_SAMPLES = 1024
+
+
+class Frontier:
+    """Disk-backed crawl frontier stored in SQLite (WAL mode).
+
+    Every CrawlerJob is a row with its URL, handler name, attempt count and
+    status, so a run that crashes or is interrupted can be resumed where it
+    stopped. Status changes are committed in batches (every ``commit_every``
+    writes or ``commit_interval`` seconds). A job whose results went to the
+    sink is only marked done once the sink reports them durable (see
+    ``await_sink``), so a job is never done on disk while its results are
+    not; after a crash the jobs of the last uncommitted batch, and those whose
+    results were still buffered, are crawled again.
+
+    The worker-facing calls mirror queue.Queue (``put``, ``get``, ``qsize``,
+    ``join``); instead of ``task_done`` a worker reports the outcome with
+    ``complete``, ``retry`` or ``fail``. A job counts as in flight from ``get``
+    until its outcome is reported, and its children are ``put`` before that,
+    so ``get`` can tell exactly when the crawl has finished. Seeds may be fed
+    while the crawl runs: between ``open_producer`` and ``close_producer`` an
+    empty queue means "wait", not "done".
+
+    ``retry(job, delay=...)`` parks a job until its ``ready_at`` time. Parked
+    jobs sit in a heap ordered by that time, and ``get`` moves the due ones
+    back to pending. A worker never sleeps through a backoff; it takes the
+    next ready job instead.
+
+    Pending jobs are handed out by ``HANDLER_PRIORITY`` first, then in
+    ``order``: "dfs" (newest first) or "bfs" (oldest first). Only counters and
+    the parked heap live in Python; the rows stay in SQLite, whose page cache
+    is capped at ``cache_mb``, so a large fan-out spills to the database file
+    instead of growing the process. Queue depth is sampled every
+    ``sample_interval`` seconds for ``depth_report``.
+    """
+
+    def __init__(
+        self,
+        path="frontier.db",
+        *,
+        resume=False,
+        handlers=HANDLERS,
+        commit_every=50,
+        commit_interval=2.0,
+        order="dfs",
+        cache_mb=16,
+        sample_interval=5.0,
+    ):
+        if order not in _ORDER_BY:
+            raise ValueError(f"Unknown frontier order {order!r}; expected one of {', '.join(_ORDER_BY)}")
+        self.path = path
+        self.handlers = handlers
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.order = order
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._writes = 0
+        self._last_commit = time.monotonic()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size = {-int(cache_mb * 1024)}")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "ready_at" not in columns:  # frontier written before delayed retries existed
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN ready_at REAL")
+        if "priority" not in columns:  # frontier written before priorities existed
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 1")
+            for handler, priority in HANDLER_PRIORITY.items():
+                self._conn.execute("UPDATE jobs SET priority = ? WHERE handler = ?", (priority, handler))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_priority ON jobs (status, priority, id)")
+
+        if resume:
+            # jobs that were running when the previous run stopped start over
+            reset = self._conn.execute(
+                "UPDATE jobs SET status = ? WHERE status = ?", (PENDING, IN_PROGRESS)
+            ).rowcount
+            if reset:
+                print(f"Frontier: {reset} interrupted jobs returned to pending")
+        else:
+            self._conn.execute("DELETE FROM jobs")
+        self._conn.commit()
+
+        self._pending = self._count(PENDING)
+        self._in_progress = 0
+        self._awaiting_sink = set()  # ids of in-progress jobs that only wait for their results to be durable
+        self._producers = 0
+        self._closed = False
+        # (ready_at, id) of parked jobs; ready_at is wall-clock time so it survives --resume
+        self._parked = [
+            (ready_at or 0.0, job_id)
+            for job_id, ready_at in self._conn.execute("SELECT id, ready_at FROM jobs WHERE status = ?", (PARKED,))
+        ]
+        heapq.heapify(self._parked)
+        self._started = time.monotonic()
+        self._last_sample = float("-inf")
+        self._depth_samples = []  # (seconds since start, pending, in progress, parked)
+        self._peak_pending = self._pending
+
+    def _count(self, status):
+        return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def _sample_depth(self, now):
+        self._peak_pending = max(self._peak_pending, self._pending)
+        if now - self._last_sample < self.sample_interval:
+            return
+        self._last_sample = now
+        self._depth_samples.append((now - self._started, self._pending, self._in_progress, len(self._parked)))
+        if len(self._depth_samples) > MAX_DEPTH_SAMPLES:
+            # keep the timeline bounded on long runs by halving its resolution
+            self._depth_samples = self._depth_samples[::2]
+            self.sample_interval *= 2
+
+    def _maybe_commit(self):
+        self._writes += 1
+        now = time.monotonic()
+        self._sample_depth(now)
+        if self._writes >= self.commit_every or now - self._last_commit >= self.commit_interval:
+            self._conn.commit()
+            self._writes = 0
+            self._last_commit = now
+
+    def _set_status(self, job, status, error=None, ready_at=None):
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, attempts = ?, last_error = ?, ready_at = ?, updated_at = ? WHERE id = ?",
+            (status, job.attempts, None if error is None else str(error)[:500], ready_at, time.time(), job.id),
+        )
+
+    def _release_due(self):
+        now = time.time()
+        released = 0
+        while self._parked and self._parked[0][0] <= now:
+            _, job_id = heapq.heappop(self._parked)
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, ready_at = NULL WHERE id = ? AND status = ?", (PENDING, job_id, PARKED)
+            )
+            released += 1
+        if released:
+            self._pending += released
+            self._maybe_commit()
+        return released
+
+    def put(self, job):
+        """Add a job unless the same (url, handler) pair is already known."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (url, handler, attempts, status, priority, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job.url,
+                    job.handler.__name__,
+                    job.attempts,
+                    PENDING,
+                    HANDLER_PRIORITY.get(job.handler.__name__, 1),
+                    time.time(),
+                ),
+            )
+            if cursor.rowcount:
+                job.id = cursor.lastrowid
+                self._pending += 1
+                self._maybe_commit()
+                self._changed.notify()
+
+    def get(self, timeout=None):
+        """Claim the next pending job (see ``order``), waiting while other jobs are still in flight or parked.
+
+        Raises queue.Empty once the crawl is finished, i.e. nothing is pending,
+        in progress or parked and no producer is open, so nothing can add more
+        work. The same happens after ``shutdown`` and, with ``timeout``, when
+        no job became available in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._release_due()
+            while self._pending == 0:
+                if self._closed or not (self._in_flight() or self._parked or self._producers):
+                    self._changed.notify_all()  # let the other idle workers see it too
+                    raise queue.Empty
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                if self._parked:
+                    # wake up when the next parked job is due
+                    until_due = max(0.0, self._parked[0][0] - time.time())
+                    remaining = until_due if remaining is None else min(remaining, until_due)
+                self._changed.wait(remaining)
+                self._release_due()
+            if self._closed:
+                raise queue.Empty
+            row = self._conn.execute(
+                f"SELECT id, url, handler, attempts FROM jobs WHERE status = ? ORDER BY {_ORDER_BY[self.order]} LIMIT 1",
+                (PENDING,),
+            ).fetchone()
+            job = CrawlerJob(row[1], self.handlers[row[2]])
+            job.id = row[0]
+            job.attempts = row[3]
+            self._set_status(job, IN_PROGRESS)
+            self._pending -= 1
+            self._in_progress += 1
+            self._maybe_commit()
+            return job
+
+    def _in_flight(self):
+        return self._in_progress - len(self._awaiting_sink)
+
+    def _finish(self, job, status, error=None, ready_at=None):
+        with self._lock:
+            self._set_status(job, status, error, ready_at)
+            self._in_progress -= 1
+            self._awaiting_sink.discard(job.id)
+            if status == PENDING:
+                self._pending += 1
+            elif status == PARKED:
+                heapq.heappush(self._parked, (ready_at, job.id))
+            self._maybe_commit()
+            self._changed.notify_all()
+
+    def complete(self, job, incomplete=None):
+        """Mark a job as done; ``incomplete`` records why its page yielded no result, see ``load_failed_urls``."""
+        self._finish(job, DONE, incomplete)
+
+    def await_sink(self, job):
+        """The worker is done with ``job``; it stays in progress until ``complete`` is called, once its results are durable.
+
+        Such a job no longer keeps ``get`` and ``join`` waiting, so the crawl
+        can finish while the sink still buffers its results; flush the sink
+        before closing the frontier. ``retry`` and ``fail`` still apply if
+        handing the results over fails.
+        """
+        with self._lock:
+            self._awaiting_sink.add(job.id)
+            self._changed.notify_all()
+
+    def retry(self, job, error=None, delay=0.0):
+        """Put a failed job back, keeping its attempt count; with ``delay`` it is parked that many seconds."""
+        if delay > 0:
+            self._finish(job, PARKED, error, ready_at=time.time() + delay)
+        else:
+            self._finish(job, PENDING, error)
+
+    def fail(self, job, error=None):
+        """Mark a job as permanently failed."""
+        self._finish(job, FAILED, error)
+
+    def qsize(self):
+        with self._lock:
+            return self._pending
+
+    def shutdown(self):
+        """Stop handing out jobs; idle and future ``get`` calls raise queue.Empty."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+
+    def open_producer(self):
+        """Register a seed producer; until ``close_producer`` the crawl is not finished even if the queue runs dry."""
+        with self._lock:
+            self._producers += 1
+
+    def close_producer(self):
+        with self._lock:
+            self._producers -= 1
+            self._changed.notify_all()
+
+    def parked(self):
+        with self._lock:
+            return len(self._parked)
+
+    def join(self):
+        """Block until no job is pending, in progress or parked and no producer is open (or ``shutdown`` was called)."""
+        with self._lock:
+            while (self._pending or self._in_flight() or self._parked or self._producers) and not self._closed:
+                self._changed.wait()
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def depth_report(self, rows=12) -> str:
+        """Queue depth over the run, as evenly spaced samples."""
+        with self._lock:
+            samples = list(self._depth_samples)
+            peak = self._peak_pending
+        if not samples:
+            return "Frontier depth: no samples"
+        step = max(1, len(samples) // rows)
+        lines = [f"Frontier depth ({self.order}): peak {peak} pending"]
+        for elapsed, pending, in_progress, parked in samples[::step]:
+            lines.append(f"  t={elapsed:>7.0f}s pending={pending:>6} in_progress={in_progress:>3} parked={parked:>4}")
+        return "\n".join(lines)
+
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+            self._writes = 0
+            self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def has_unfinished_jobs(path):
+    """True when ``path`` holds a frontier with pending, parked or interrupted jobs to resume."""
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?, ?)", (PENDING, IN_PROGRESS, PARKED)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+    return bool(row[0])
+
+
+def load_failed_urls(path, incomplete=False):
+    """URLs of the permanently failed jobs recorded in the frontier at ``path``.
+
+    With ``incomplete`` also the jobs completed with an ``incomplete`` reason
+    (a page that never loaded, never became ready or showed no cards).
+    """
+    if not os.path.exists(path):
+        return []
+    query = "SELECT url FROM jobs WHERE status = ?"
+    if incomplete:
+        query += " OR (status = ? AND last_error IS NOT NULL)"
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute(query, (FAILED, DONE) if incomplete else (FAILED,))]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
@@ -0,0 +1,150 @@
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cookies import load_cookies_into_session
+from http_fetch import DEFAULT_USER_AGENT
+
+LINKEDIN_URL = "https://www.linkedin.com"
+
+
+class GeoResolver:
+    """Resolve LinkedIn geoIds for location labels such as "Texas, United States".
+
+    LinkedIn answers a location-only search by redirecting to the same search
+    with the location's ``geoId``; that id is read from the final URL. Labels
+    missing from the JSON cache at ``cache_path`` (label -> geoId, the format
+    of ``state_geo_cache.json``) are resolved concurrently by ``workers``
+    threads over one pooled requests.Session, and the cache is rewritten once
+    per ``resolve_many`` call. ``base_url`` points the resolver at a local
+    stand-in such as :class:`simulator.LinkedInSimulator`.
+    """
+
+    def __init__(
+        self,
+        cache_path="state_geo_cache.json",
+        *,
+        cookies_file="cookies.pkl",
+        base_url=LINKEDIN_URL,
+        workers=8,
+        timeout=30.0,
+        user_agent=DEFAULT_USER_AGENT,
+    ):
+        self.cache_path = Path(cache_path)
+        self.cookies_file = cookies_file
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._session = None
+        self.cache: dict[str, str] = {}
+        if self.cache_path.exists():
+            self.cache = json.loads(self.cache_path.read_text())
+        self.resolved = 0
+        self.failed = 0
+
+    def _get_session(self):
+        # only built when something is missing from the cache
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"User-Agent": self.user_agent, "Accept-Language": "en-US,en;q=0.9"})
+                load_cookies_into_session(session, self.cookies_file)
+                self._session = session
+            return self._session
+
+    def _fetch(self, label: str) -> str:
+        url = f"{self.base_url}/jobs/search/?location={urllib.parse.quote_plus(label)}"
+        resp = self._get_session().get(url, timeout=self.timeout, allow_redirects=True)
+        resp.raise_for_status()
+        geo_id = urllib.parse.parse_qs(urllib.parse.urlsplit(resp.url).query).get("geoId", [None])[0]
+        if not geo_id:
+            raise ValueError(f"no geoId in {resp.url}")
+        return geo_id
+
+    def _resolve(self, label):
+        try:
+            return label, self._fetch(label)
+        except (requests.RequestException, ValueError) as exc:
+            print(f"[GeoResolver] {label}: {exc}")
+            return label, None
+
+    def resolve_many(self, labels) -> dict[str, str]:
+        """geoIds for ``labels``; labels that could not be resolved are left out."""
+        labels = list(dict.fromkeys(labels))
+        missing = [label for label in labels if label not in self.cache]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                for label, geo_id in executor.map(self._resolve, missing):
+                    if geo_id is None:
+                        self.failed += 1
+                        continue
+                    self.cache[label] = geo_id
+                    self.resolved += 1
+            self.save()
+        return {label: self.cache[label] for label in labels if label in self.cache}
+
+    def save(self) -> None:
+        self.cache_path.write_text(json.dumps(self.cache, indent=2, ensure_ascii=False))
+
+    def summary(self) -> str:
+        return (
+            f"GeoIds: {len(self.cache)} cached in {self.cache_path}, "
+            f"{self.resolved} resolved this run, {self.failed} failed"
+        )
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from url_generator import state_filter
+
+    parser = argparse.ArgumentParser(description="Resolve and cache LinkedIn geoIds of US states")
+    parser.add_argument("--states", type=str, nargs="+", help="States to resolve; default is all")
+    parser.add_argument("--cache", type=str, default="state_geo_cache.json", help="JSON cache of label -> geoId")
+    parser.add_argument("--cookies-file", type=str, default="cookies.pkl", help="LinkedIn cookies saved by main.py")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    parser.add_argument("--base-url", type=str, default=LINKEDIN_URL, help="Site to ask, e.g. a local stand-in")
+    parser.add_argument("--simulate", action="store_true", help="Resolve against a local LinkedInSimulator with a throwaway cache")
+    args = parser.parse_args()
+
+    labels = state_filter()
+    labels = [labels[state] for state in (args.states or labels)]
+    simulator = None
+    if args.simulate:
+        from simulator import LinkedInSimulator, SimulatorConfig
+
+        simulator = LinkedInSimulator(SimulatorConfig(latency_ms=200.0)).start()
+        args.base_url = simulator.base_url
+        args.cache = str(Path(tempfile.mkdtemp()) / "geo_cache.json")
+
+    resolver = GeoResolver(args.cache, cookies_file=args.cookies_file, base_url=args.base_url, workers=args.workers)
+    started = time.perf_counter()
+    try:
+        geo_ids = resolver.resolve_many(labels)
+    finally:
+        resolver.close()
+        if simulator is not None:
+            simulator.stop()
+    for label in labels:
+        print(f"  {label:<40} {geo_ids.get(label, '-')}")
+    print(resolver.summary())
+    print(f"Resolved in {time.perf_counter() - started:.1f}s")
+# Example usage:
+# python geo_resolver.py --states Texas California --workers 4
+# python geo_resolver.py --simulate
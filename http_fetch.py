@@ -0,0 +1,126 @@
+import threading
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cookies import load_cookies_into_session
+from page_parser import find_main, parse_html, parse_job_cards
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/103.0.5060.114 Safari/537.36 Edg/103.0.1264.49"
+)
+
+# Path segments and DOM markers that mean LinkedIn wants a browser (login wall, captcha, checkpoint).
+# Only the path is checked, so a query such as keywords=login+engineer is not a challenge.
+CHALLENGE_PATH_SEGMENTS = frozenset({"login", "uas", "checkpoint", "authwall"})
+CHALLENGE_PAGE_SELECTOR = ", ".join((
+    "form.login__form",
+    "input[name='session_key']",
+    "form#challenge-form",
+    "#captcha-internal",
+    "iframe[src*='captcha']",
+    "form.authwall-join-form",
+))
+CHALLENGE_STATUS_CODES = (401, 403, 999)
+RATE_LIMITED_STATUS = 429
+
+
+class ChallengeResponse(Exception):
+    """The HTTP response is a login/challenge page; the caller should use the browser instead."""
+
+
+class RateLimited(Exception):
+    """LinkedIn answered HTTP 429; the caller should slow down and try again."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_challenge_url(url) -> bool:
+    path = urllib.parse.urlsplit(url or "").path.lower()
+    return any(segment in CHALLENGE_PATH_SEGMENTS for segment in path.split("/"))
+
+
+def is_challenge_page(document) -> bool:
+    return bool(document.cssselect(CHALLENGE_PAGE_SELECTOR))
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None  # missing, or an HTTP date
+
+
+class HttpListFetcher:
+    """Fetch LinkedIn job list pages over a pooled requests.Session.
+
+    The session reuses the cookies written by :func:`cookies.save_cookies` and is
+    shared by every worker thread; the connection pool is sized to match.
+    """
+
+    def __init__(self, cookies_file="cookies.pkl", *, pool_size=10, timeout=30.0, user_agent=DEFAULT_USER_AGENT):
+        self.cookies_file = cookies_file
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        load_cookies_into_session(self.session, cookies_file)
+
+    def fetch(self, url) -> str:
+        resp = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+        if resp.status_code == RATE_LIMITED_STATUS:
+            raise RateLimited(f"HTTP 429 for {url}", retry_after=_retry_after(resp))
+        if resp.status_code in CHALLENGE_STATUS_CODES:
+            raise ChallengeResponse(f"HTTP {resp.status_code} for {url}")
+        if is_challenge_url(resp.url):
+            raise ChallengeResponse(f"redirected to {resp.url}")
+        resp.raise_for_status()
+        return resp.text
+
+    def fetch_page(self, url):
+        """Return ``(main, jobs)``: the parsed ``main#main`` element of ``url`` and its job cards.
+
+        Raises ChallengeResponse if the page is not usable and RateLimited on HTTP 429.
+        """
+        document = parse_html(self.fetch(url))
+        if is_challenge_page(document):
+            raise ChallengeResponse(f"challenge page served for {url}")
+        main = find_main(document)
+        if main is None:
+            raise ChallengeResponse(f"no main#main in response for {url}")
+        jobs = parse_job_cards(main, base_url=url)
+        if not jobs:
+            # LinkedIn sometimes serves the shell without server-rendered cards
+            raise ChallengeResponse(f"no job cards in response for {url}")
+        if not any(job["job_name"] for job in jobs):
+            # card placeholders whose content is filled in by script
+            raise ChallengeResponse(f"job cards not rendered in response for {url}")
+        return main, jobs
+
+    def fetch_jobs(self, url) -> list[dict]:
+        """Return the job cards on ``url``; see :meth:`fetch_page`."""
+        return self.fetch_page(url)[1]
+
+
+_fetchers: dict[str, HttpListFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_fetcher(cookies_file="cookies.pkl") -> HttpListFetcher:
+    """Process-wide fetcher per cookies file, so all workers share one connection pool."""
+    with _fetchers_lock:
+        fetcher = _fetchers.get(cookies_file)
+        if fetcher is None:
+            fetcher = HttpListFetcher(cookies_file)
+            _fetchers[cookies_file] = fetcher
+        return fetcher
@@ -3,20 +3,40 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 import threading
 import queue
 import time
 import argparse
-import random
+import math
+from functools import partial
 
-from crawler import login_linkedin_driver, CrawlerJob, result_router, linkedin_page_crawler
-from url_generator import generate_urls
+from crawler import login_linkedin_driver, CrawlerJob, result_router, linkedin_page_crawler, configure_crawler
+from url_generator import iter_urls, state_filter
+from geo_resolver import GeoResolver
 from cookies import save_cookies, load_cookies
+from driver_pool import DriverPool, is_driver_alive
+from tabs import BrowserTabs, TAB_CHROME_ARGUMENTS
+from frontier import Frontier, has_unfinished_jobs, load_failed_urls
+from sink import JsonlSink
+from columnar import ParquetSink
+from depulicate import DedupIndex, JobDeduplicator
+from planner import SplitPlanner
+from count_cache import CountCache
+from watermarks import WatermarkStore
+from page_profile import PageProfiler, ResourceProfile
+from snapshots import SnapshotStore
+from page_parser import ParserPool
+from metrics import metrics, set_labels, timed
+from rate_limiter import RateLimiter, default_rpm, is_throttle_url
+from retry import RetryScheduler, classify_error, default_policies
 
 CHROME_DRIVER_PATH = ChromeDriverManager().install()
 
+HOME_URL = "https://www.linkedin.com"
 LOGIN_CHECK_URL = "https://www.linkedin.com/feed/"
 LOGIN_STATUS_KEYWORDS = ("login", "checkpoint")
+WORKER_STOP_TIMEOUT = 90.0  # Ctrl+C 后等待每个 worker 完成当前任务的最长秒数 (大于页面的 wait_time)
 
 def _is_session_active(driver) -> bool:
     auth_cookie = driver.get_cookie("li_at")
@@ -52,12 +72,34 @@ def ensure_driver_logged_in(driver, cookies_file: str, *, check_url: str = LOGIN
 
 
 
+def _add_session_cookies(driver, session_cookies) -> bool:
+    added = 0
+    for cookie in session_cookies:
+        if "linkedin.com" not in (cookie.get("domain") or "").lower():
+            continue
+        try:
+            driver.add_cookie(cookie)
+            added += 1
+        except WebDriverException as exc:
+            print(f"Failed to add cookie {cookie.get('name')}: {exc}")
+    return added > 0
+
+
 def init_driver(
     cookies_file: str = "cookies.pkl",
     *,
     headless: bool = False,
     page_load_timeout: float | None = 60.0,
+    session_cookies: list[dict] | None = None,
+    tab_mode: bool = False,
+    profile: ResourceProfile | None = None,
+    home_url: str = HOME_URL,
+    login: bool = True,
 ):
+    # session_cookies: 另一个已登录 driver 的 get_cookies()，DriverPool 用它克隆会话而不是重新登录
+    # tab_mode: 一个浏览器开多个 tab 并发使用 (tabs.BrowserTabs)，需要 pageLoadStrategy=none
+    # home_url / login: 指向 simulator.LinkedInSimulator 时传入它的地址并设 login=False，不加载 cookie 也不登录
+    # profile: 轻量配置 (page_profile.ResourceProfile)，不加载图片并开启网络日志；屏蔽规则由 PageProfiler 按 tab 下发
     options = Options()
 
     # 初始化 WebDriver
@@ -79,15 +121,29 @@ def init_driver(
         options.add_argument("--window-size=1920,1080")
         options.add_argument("--disable-gpu")
 
+    if tab_mode:
+        options.page_load_strategy = "none"
+        for argument in TAB_CHROME_ARGUMENTS:
+            options.add_argument(argument)
+
+    if profile is not None:
+        profile.configure_options(options)
+
     # 初始化 WebDriver
-    driver = webdriver.Chrome(service=Service(CHROME_DRIVER_PATH), options=options)
+    browser = webdriver.Chrome(service=Service(CHROME_DRIVER_PATH), options=options)
     if page_load_timeout and page_load_timeout > 0:
-        driver.set_page_load_timeout(page_load_timeout)
-    driver.get("https://www.linkedin.com")  # 必须先打开域名才能加 cookie
-
+        browser.set_page_load_timeout(page_load_timeout)
+    # pageLoadStrategy=none 时 driver.get 不等待页面加载；启动阶段用 TabHandle 的 get/refresh 等待文档加载完成
+    driver = BrowserTabs(browser, 1, page_load_timeout=page_load_timeout).handles[0] if tab_mode else browser
+    driver.get(home_url)  # 必须先打开域名才能加 cookie
+    if not login:
+        return browser
 
     # 载入 cookie
-    cookies_loaded = load_cookies(driver, cookies_file)
+    if session_cookies:
+        cookies_loaded = _add_session_cookies(driver, session_cookies)
+    else:
+        cookies_loaded = load_cookies(driver, cookies_file)
     if cookies_loaded:
         driver.refresh()
         time.sleep(3)  # 等待页面刷新完成
@@ -102,123 +158,247 @@ def init_driver(
 
     ensure_driver_logged_in(driver, cookies_file)
 
-    return driver
+    return browser
+
+
+def _current_url(driver):
+    try:
+        return driver.current_url
+    except WebDriverException:
+        return None
 
 
 def worker(
     worker_id,
     job_queue,
-    results,
-    results_lock,
+    sink,
+    pool,
+    rate_limiter,
+    retries,
     *,
+    dedup=None,
     cookies_file="cookies.pkl",
-    headless=False,
-    sleep_min=2.0,
-    sleep_max=7.0,
-    max_attempts=3,
-    retry_backoff=10.0,
-    page_load_timeout=60.0,
+    login_check_url=LOGIN_CHECK_URL,
 ):
-    driver = init_driver(
-        cookies_file,
-        headless=headless,
-        page_load_timeout=page_load_timeout,
-    )
     try:
         while True:
-            job = job_queue.get(timeout=20) 
+            # 没有待处理任务时会一直等待，直到所有在途任务结束 (它们可能还会生成新任务)；爬取完成时抛出 queue.Empty
+            job = job_queue.get()
+            # 本线程之后记录的耗时都带上 handler 和 worker 标签
+            set_labels(handler=job.handler.__name__, worker=worker_id)
+            job_started = time.perf_counter()
+
             try:
-                ensure_driver_logged_in(driver, cookies_file)
-                if sleep_max > 0:
-                    delay = random.uniform(sleep_min, max(sleep_min, sleep_max))
-                    if delay > 0:
-                        time.sleep(delay)
+                driver = pool.acquire()
+            except Exception as exc:  # noqa: BLE001
+                # 拿不到浏览器 (例如新浏览器启动失败) 时按普通错误重试或放弃，worker 继续运行
+                # 任务不能一直停留在 in_progress，否则 frontier 永远不会判定爬取结束
+                job.attempts += 1
+                error_class = classify_error(exc, broken=True)
+                delay = retries.schedule(job, error_class)
+                if delay is not None:
+                    print(f"[Worker {worker_id}] No browser for {job.url} ({exc}), retry {job.attempts} scheduled in {delay:.1f}s")
+                    job_queue.retry(job, exc, delay=delay)
+                    metrics.inc("crawler_jobs_total", outcome="retry", error=error_class)
+                else:
+                    print(f"[Worker {worker_id}] Job permanently failed {job.url} (no browser: {exc}) after maximum retries")
+                    job_queue.fail(job, exc)
+                    metrics.inc("crawler_jobs_total", outcome="failed", error=error_class)
+                continue
+            broken = False
+            try:
+                ensure_driver_logged_in(driver, cookies_file, check_url=login_check_url)
 
-                data = job.handler(driver, job.url, time_sleep=4, wait_time=60) # set a longer wait_time to ensure not affected by anti-bot
+                # 页面按就绪信号等待，不额外 sleep；请求间隔由 rate_limiter 控制
+                data = job.handler(driver, job.url, time_sleep=0, wait_time=60) # set a longer wait_time to ensure not affected by anti-bot
                 if data is None:
                     raise RuntimeError("handler returned empty result")
 
+                if data.crawler_type == 'detail' and not data.data:
+                    # 空白的职位列表页通常意味着被限流或被重定向到验证页面
+                    reason = "checkpoint redirect" if is_throttle_url(_current_url(driver)) else "empty page"
+                    rate_limiter.throttled(reason)
+                    data.incomplete = data.incomplete or reason
+                else:
+                    rate_limiter.success()
+
                 # use result_router to handle the result
-                result_router(data, job_queue, results, results_lock)
-                job.attempts = 0
-                print(f"len(results)={len(results)}")
+                # 结果交给 sink 后，任务要等结果落盘 (on_durable) 才在 frontier 中标记为完成
+                # 崩溃时结果还没落盘的任务仍是 in_progress，--resume 会重新爬取
+                job_queue.await_sink(job)
+                with timed("result_router"):
+                    handed_over = result_router(
+                        data, job_queue, sink, dedup, on_durable=partial(job_queue.complete, job, data.incomplete)
+                    )
+                if not handed_over:
+                    job_queue.complete(job, data.incomplete)
+                metrics.inc("crawler_jobs_total", outcome="done")
+                print(f"pages written={sink.records_written}")
                 print(
                     f"[Worker {worker_id}] Finished job: {job.url} Remaining jobs: {job_queue.qsize()}"
                 )
             except Exception as exc:  # noqa: BLE001
+                # 浏览器崩溃时交给 pool 替换，其余 WebDriverException (超时、元素找不到) 照常重试
+                if isinstance(exc, WebDriverException) or isinstance(exc.__cause__, WebDriverException):
+                    broken = not is_driver_alive(driver)
+                error_class = classify_error(exc, broken=broken)
+                if error_class == "timeout":
+                    rate_limiter.throttled("timeout")
+                elif not broken and is_throttle_url(_current_url(driver)):
+                    rate_limiter.throttled("checkpoint redirect")
                 job.attempts += 1
-                if job.attempts < max_attempts:
-                    backoff = min(retry_backoff * job.attempts, retry_backoff * 4)
-                    print(
-                    print(f"[Worker {worker_id}] Job failed {job.url} ({exc}), retry {job.attempts} scheduled in {backoff:.1f}s")
-                    )
-                    time.sleep(backoff)
-                    job_queue.put(job)
+                # 不在 worker 中 sleep：任务带着 ready_at 停放在 frontier，到期后再被取出，worker 直接处理下一个任务
+                delay = retries.schedule(job, error_class)
+                if delay is not None:
+                    print(f"[Worker {worker_id}] Job failed {job.url} ({error_class}: {exc}), retry {job.attempts} scheduled in {delay:.1f}s")
+                    job_queue.retry(job, exc, delay=delay)
+                    metrics.inc("crawler_jobs_total", outcome="retry", error=error_class)
                 else:
-                    print(
-                    print(f"[Worker {worker_id}] Job permanently failed {job.url} ({exc}) after maximum retries")
-                    )
+                    print(f"[Worker {worker_id}] Job permanently failed {job.url} ({error_class}: {exc}) after maximum retries")
+                    job_queue.fail(job, exc)
+                    metrics.inc("crawler_jobs_total", outcome="failed", error=error_class)
             finally:
-                job_queue.task_done()
+                pool.release(driver, broken=broken)
+                metrics.observe(metrics.STAGE_HISTOGRAM, time.perf_counter() - job_started, stage="job")
     except queue.Empty:
         pass
     finally:
-        driver.quit()
         print(f"[Worker {worker_id}] finished")
 
 
 def run_crawler(
     jobs,
+    sink,
     num_workers=3,
     *,
+    dedup=None,
     cookies_file="cookies.pkl",
     headless=False,
-    sleep_min=2.0,
-    sleep_max=5.0,
+    rate_limiter=None,
     max_attempts=3,
     retry_backoff=10.0,
     page_load_timeout=60.0,
+    frontier_db="frontier.db",
+    resume=False,
+    driver_max_pages=200,
+    driver_max_rss_mb=None,
+    tabs_per_browser=1,
+    profile=None,
+    frontier_order="dfs",
+    frontier_cache_mb=16,
+    metrics_port=None,
+    home_url=HOME_URL,
+    login=True,
 ):
-    """Run crawler dispatcher"""
-    job_queue = queue.Queue()
-    results: list[dict] = []
-    results_lock = threading.Lock()
-
-    for job in jobs:
-        job_queue.put(job)
+    """Run crawler dispatcher; 'detail' results are streamed to ``sink`` as they arrive."""
+    job_queue = Frontier(frontier_db, resume=resume, order=frontier_order, cache_mb=frontier_cache_mb)
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(default_rpm(num_workers, 2.0, 5.0))
+    retries = RetryScheduler(default_policies(retry_backoff), max_attempts=max_attempts)
+    # 所有 worker 共用一个限速器，总请求速率不随 worker 数增加；crawler 在每次页面请求前取令牌
+    configure_crawler(rate_limiter=rate_limiter)
+
+    # 种子任务由单独的线程边生成边放入 frontier，worker 不必等全部 URL 生成完再开始
+    job_queue.open_producer()
+    stop_producing = threading.Event()
+    producer_errors = []
+
+    def produce():
+        try:
+            for job in jobs:
+                if stop_producing.is_set():
+                    break
+                job_queue.put(job)
+        except Exception as exc:  # noqa: BLE001
+            # 种子没生成完不能当作正常跑完：停止分发任务，等 worker 收尾后由 run_crawler 抛出
+            print(f"Seed producer stopped: {exc}")
+            producer_errors.append(exc)
+            job_queue.shutdown()
+        finally:
+            job_queue.close_producer()
+
+    producer = threading.Thread(target=produce, name="seed-producer", daemon=True)
+    producer.start()
+
+    # 所有浏览器并行启动，只登录一次，其余 driver 复用同一会话
+    # tabs_per_browser > 1 时每个浏览器开多个 tab，每个 worker 使用其中一个 tab
+    tab_mode = tabs_per_browser > 1
+    pool = DriverPool(
+        partial(init_driver, cookies_file, headless=headless, page_load_timeout=page_load_timeout, tab_mode=tab_mode, profile=profile, home_url=home_url, login=login),
+        math.ceil(num_workers / tabs_per_browser),
+        tabs_per_browser=tabs_per_browser,
+        max_pages=driver_max_pages,
+        max_rss_mb=driver_max_rss_mb,
+    )
+    try:
+        pool.start()
+    except BaseException:
+        # 浏览器没能启动：停掉种子线程并关闭 frontier，已生成的种子留给 --resume
+        stop_producing.set()
+        producer.join()
+        pool.close()
+        job_queue.close()
+        raise
+    # 可选：运行期间在本机端口上提供 Prometheus 格式的 /metrics
+    metrics_server = metrics.serve(metrics_port) if metrics_port else None
 
     threads = []
     for i in range(num_workers):
         t = threading.Thread(
             target=worker,
-            args=(i, job_queue, results, results_lock),
+            args=(i, job_queue, sink, pool, rate_limiter, retries),
             kwargs={
+                "dedup": dedup,
                 "cookies_file": cookies_file,
-                "headless": headless,
-                "sleep_min": sleep_min,
-                "sleep_max": sleep_max,
-                "max_attempts": max_attempts,
-                "retry_backoff": retry_backoff,
-                "page_load_timeout": page_load_timeout,
+                "login_check_url": home_url.rstrip("/") + "/feed/",
             },
         )
         t.start()
         threads.append(t)
 
-    # 等待所有任务完成
-    job_queue.join()
-
-    # 等待所有线程退出
-    for t in threads:
-        t.join()
-
-    return results
-
-def save_results(results, output_file="results.json"):
-    import json
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-    print(f"Results saved to {output_file}")
+    try:
+        # 等待所有任务完成
+        try:
+            job_queue.join()
+        except KeyboardInterrupt:
+            # 把已完成的状态落盘，下次用 --resume 继续；worker 做完手上的任务后退出
+            job_queue.shutdown()
+            stop_producing.set()
+            # 等 worker 写完手上任务的结果，再让 main 关闭 sink、去重索引等资源
+            for t in threads:
+                t.join(timeout=WORKER_STOP_TIMEOUT)
+            try:
+                sink.flush()
+            except RuntimeError as exc:
+                print(f"Could not flush results: {exc}")
+            job_queue.flush()
+            print(f"Interrupted; progress saved to {frontier_db}, rerun with --resume to continue")
+            raise
+
+        # 等待所有线程退出
+        producer.join()
+        for t in threads:
+            t.join()
+        # 缓冲中的结果落盘后，对应的任务才会标记为完成
+        sink.flush()
+
+        print(rate_limiter.summary())
+        print(retries.report())
+        print(pool.summary())
+        print(f"Frontier status: {job_queue.stats()}")
+        print(job_queue.depth_report())
+    finally:
+        # Ctrl+C 或出错时也要关闭浏览器，否则 Chrome 和 chromedriver 进程会残留
+        pool.close()
+        job_queue.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+
+    if producer_errors:
+        raise RuntimeError(
+            f"seed generation failed; progress saved to {frontier_db}, rerun with --resume to continue"
+        ) from producer_errors[0]
+    return sink.records_written
 
 def main(args):
     # 载入args
@@ -233,31 +413,145 @@ def main(args):
     cookies_file = args.cookies_file
     page_load_timeout = args.page_timeout
     output_file = args.output_file
+    frontier_db = args.frontier_db
+    resume = args.resume
+
+    split_planner = None if args.fixed_split_order else SplitPlanner(args.facet_stats)
+    count_cache = None if args.no_count_cache else CountCache(args.count_cache, ttl=args.count_ttl * 3600)
+    page_profiler = None
+    if args.light_profile or args.profile_config:
+        profile = ResourceProfile.from_file(args.profile_config) if args.profile_config else ResourceProfile()
+        page_profiler = PageProfiler(profile)
+    snapshot_store = SnapshotStore(args.snapshot_dir) if args.snapshot_dir else None
+    # 解析进程在启动任何线程之前 fork
+    parser_pool = ParserPool(args.parse_workers or None) if args.extract_backend == "html" else None
+    configure_crawler(
+        http_fetch=args.http_fetch,
+        http_cookies_file=cookies_file,
+        split_planner=split_planner,
+        count_cache=count_cache,
+        page_profiler=page_profiler,
+        snapshot_store=snapshot_store,
+        parser_pool=parser_pool,
+    )
 
     if sleep_max < sleep_min:
         sleep_max = sleep_min
+    # 默认速率估算旧循环的实际节奏：workers 个线程、每个任务平均等待 (min+max)/2 秒，再加上约 11 秒的加载、页面内 sleep 和滚动
+    rpm = args.rpm or default_rpm(num_workers, sleep_min, sleep_max)
+    rate_limiter = RateLimiter(rpm, min_rpm=args.min_rpm, max_rpm=args.max_rpm)
+
+
+    watermarks = WatermarkStore(args.watermarks) if args.incremental else None
+
+    # 生成爬虫队列；--resume 时沿用 frontier 中未完成的任务
+    if resume and has_unfinished_jobs(frontier_db):
+        print(f"Resuming unfinished jobs from {frontier_db}")
+    elif resume:
+        print(f"Nothing to resume in {frontier_db}; starting a new run")
+        resume = False
+    # 可选：州按 geoId 精确定位，避免 LinkedIn 对文本 location 的模糊匹配混入邻近地区的职位
+    geo_ids = None
+    # 未指定 --states 时搜索不带 location，也就没有可以换成 geoId 的地方 (命令行会拒绝这种组合)
+    if args.geo_ids and states:
+        labels = state_filter()
+        targets = {state: labels[state] for state in states if state in labels}
+        resolver = GeoResolver(args.geo_cache, cookies_file=cookies_file, workers=args.geo_workers)
+        try:
+            geo_ids = resolver.resolve_many(targets.values())
+        finally:
+            resolver.close()
+        print(resolver.summary())
+        unresolved = [state for state, label in targets.items() if label not in geo_ids]
+        if unresolved:
+            print(f"No geoId for {', '.join(unresolved)}; these states still use the text location")
+
+    # URL 逐个生成 (已规范化并去重)；--resume 时重新生成一遍，上次中断时可能还没生成完，frontier 会忽略已有的 URL
+    urls = iter_urls(keyword=keywords, states=states, geo_ids=geo_ids)
+    if watermarks is not None:
+        # 增量模式：每个查询只抓取上次成功爬取之后发布的职位
+        # 种子在生成时逐个记下 (track)，不需要先生成完整列表；--resume 时沿用上次的开始时间，重新生成同样的 URL
+        # 种子没有全部生成时 run_crawler 会抛出异常，不会走到 finish
+        run_started = watermarks.pending_started if resume else None
+        if run_started is None:
+            run_started = time.time()
+            watermarks.begin(run_started)
+        urls = (watermarks.window(url, run_started) for url in watermarks.track(urls))
+    jobs = (CrawlerJob(url, linkedin_page_crawler) for url in urls)
+
+    if args.output_format == "parquet":
+        # 按 crawl_date/state 分区的 Parquet，每个职位一行
+        sink = ParquetSink(
+            args.parquet_dir,
+            row_group_size=args.row_group_size,
+            part_interval=args.parquet_part_minutes * 60,
+        )
+    else:
+        sink = JsonlSink(
+            output_file,
+            fsync_every=args.fsync_every,
+            fsync_interval=args.fsync_interval,
+            max_bytes=int(args.rotate_mb * 1024 * 1024),
+        )
 
+    # 在线去重：同一个 job_id 只写入一次；--resume 和增量模式沿用之前的索引，新结果按 job_id 合并进已有数据
+    dedup = None
+    if not args.no_dedup:
+        dedup = JobDeduplicator(DedupIndex(args.dedup_db, reset=not (resume or args.incremental)))
 
-    # 生成爬虫队列
-    urls = generate_urls(keyword=keywords, states=states)
-    jobs = [CrawlerJob(url, linkedin_page_crawler) for url in urls]
-
-    # 运行爬虫
-    results = run_crawler(
-        jobs,
-        num_workers,
-        cookies_file=cookies_file,
-        headless=headless,
-        sleep_min=sleep_min,
-        sleep_max=sleep_max,
-        max_attempts=max_attempts,
-        retry_backoff=retry_backoff,
-        page_load_timeout=page_load_timeout,
-    )
-    print(f"爬取完成，共获得 {len(results)} 条结果")
-
-    # 保存结果
-    save_results(results, output_file=output_file)
+    # 运行爬虫，结果边爬边写入 sink
+    try:
+        pages_written = run_crawler(
+            jobs,
+            sink,
+            num_workers,
+            dedup=dedup,
+            cookies_file=cookies_file,
+            headless=headless,
+            rate_limiter=rate_limiter,
+            max_attempts=max_attempts,
+            retry_backoff=retry_backoff,
+            page_load_timeout=page_load_timeout,
+            frontier_db=frontier_db,
+            resume=resume,
+            driver_max_pages=args.driver_max_pages,
+            driver_max_rss_mb=args.driver_max_rss_mb or None,
+            tabs_per_browser=max(1, args.tabs),
+            profile=page_profiler.profile if page_profiler is not None else None,
+            frontier_order=args.frontier_order,
+            frontier_cache_mb=args.frontier_cache_mb,
+            metrics_port=args.metrics_port,
+        )
+    finally:
+        sink.close()
+        if dedup is not None:
+            dedup.index.close()
+        if split_planner is not None:
+            split_planner.save()
+        if count_cache is not None:
+            count_cache.close()
+        if snapshot_store is not None:
+            snapshot_store.close()
+        if parser_pool is not None:
+            parser_pool.close()
+    print(f"爬取完成，共获得 {pages_written} 页结果")
+    if args.output_format == "parquet":
+        # Parquet 的 part 文件数量随运行时长增加，只打印汇总
+        print(f"Results written to {args.parquet_dir}: {sink.rows_written} rows in {len(sink.parts)} part files")
+    else:
+        print(f"Results written to {', '.join(str(p) for p in sink.parts) or '(nothing)'}")
+    if dedup is not None:
+        dedup.print_report()
+    if count_cache is not None:
+        print(count_cache.summary())
+    print(metrics.summary())
+    if page_profiler is not None:
+        print(page_profiler.summary())
+    if snapshot_store is not None:
+        print(snapshot_store.summary())
+    if watermarks is not None:
+        advanced = watermarks.finish(load_failed_urls(frontier_db, incomplete=True))
+        print(f"Watermarks advanced for {advanced} queries")
 
     # 退出
     print("所有任务完成，退出")
@@ -267,16 +561,55 @@ if __name__ == "__main__":
     args = argparse.ArgumentParser(description="LinkedIn Job Crawler")
     args.add_argument("--keywords", type=str, required=True, help="Search keyword")
     args.add_argument("--states", type=str, nargs="+", help="States to crawl; default is all")
+    args.add_argument("--geo-ids", action="store_true", help="Target the --states by LinkedIn geoId instead of the free-text location (requires --states)")
+    args.add_argument("--geo-cache", type=str, default="state_geo_cache.json", help="JSON cache of resolved geoIds")
+    args.add_argument("--geo-workers", type=int, default=8, help="Concurrent requests when resolving geoIds")
     args.add_argument("--workers", type=int, default=3, help="Number of worker threads (default 3)")
-    args.add_argument("--sleep-min", type=float, default=2.0, help="Minimum delay before each job in seconds")
-    args.add_argument("--sleep-max", type=float, default=5.0, help="Maximum delay before each job in seconds")
+    args.add_argument("--sleep-min", type=float, default=2.0, help="Minimum per-worker delay between jobs; only used to derive the default --rpm")
+    args.add_argument("--sleep-max", type=float, default=5.0, help="Maximum per-worker delay between jobs; only used to derive the default --rpm")
+    args.add_argument("--rpm", type=float, help="Starting page requests per minute across all workers (default: workers * 60 / (mean of --sleep-min/--sleep-max + an estimated 11 s of load, in-page sleeps and scrolling per job), about 12 rpm for 3 workers)")
+    args.add_argument("--min-rpm", type=float, help="Lowest rate the limiter backs off to (default: --rpm / 4)")
+    args.add_argument("--max-rpm", type=float, help="Highest rate the limiter probes up to (default: --rpm * 3)")
     args.add_argument("--max-attempts", type=int, default=3, help="Maximum retries per job")
-    args.add_argument("--retry-backoff", type=float, default=10.0, help="Base retry backoff in seconds")
+    args.add_argument("--retry-backoff", type=float, default=10.0, help="Base retry backoff in seconds; timeouts back off longer, browser crashes retry at once")
     args.add_argument("--headless", action="store_true", help="Run Chrome in headless mode")
     args.add_argument("--cookies-file", type=str, default="cookies.pkl", help="Path to cookies file")
     args.add_argument("--page-timeout", type=float, default=60.0, help="Page load timeout in seconds")
-    args.add_argument("--output-file", type=str, default="results.json", help="Output file for results")
-    args = args.parse_args()
+    args.add_argument("--output-file", type=str, default="results.jsonl", help="Base name for the JSONL result files (parts are numbered)")
+    args.add_argument("--fsync-every", type=int, default=100, help="Fsync the result file after this many records")
+    args.add_argument("--fsync-interval", type=float, default=5.0, help="Fsync the JSONL result file at least this often, in seconds")
+    args.add_argument("--rotate-mb", type=float, default=256.0, help="Start a new result file part once the current one reaches this size")
+    args.add_argument("--output-format", choices=("jsonl", "parquet"), default="jsonl", help="JSONL page records, or one typed Parquet row per job partitioned by crawl date and state")
+    args.add_argument("--parquet-dir", type=str, default="results", help="Root directory of the Parquet dataset for --output-format parquet")
+    args.add_argument("--row-group-size", type=int, default=10000, help="Rows per Parquet row group")
+    args.add_argument("--parquet-part-minutes", type=float, default=10.0, help="Close each partition's open Parquet part after this many minutes; a crash loses (and --resume re-crawls) at most this much")
+    args.add_argument("--frontier-db", type=str, default="frontier.db", help="SQLite file holding the crawl frontier")
+    args.add_argument("--frontier-order", choices=("dfs", "bfs"), default="dfs", help="Order of pending jobs after pagination-before-probes priority (default dfs: newest first)")
+    args.add_argument("--frontier-cache-mb", type=float, default=16.0, help="SQLite page cache for the frontier; the rest of the queue stays on disk")
+    args.add_argument("--resume", action="store_true", help="Continue the unfinished jobs in --frontier-db instead of starting over")
+    args.add_argument("--dedup-db", type=str, default="dedup.db", help="SQLite file holding the job_id deduplication index")
+    args.add_argument("--no-dedup", action="store_true", help="Write every job card, even if its job_id was already seen")
+    args.add_argument("--facet-stats", type=str, default="facet_stats.json", help="Per-facet count statistics used to plan >1000-result splits")
+    args.add_argument("--fixed-split-order", action="store_true", help="Split >1000-result searches in the fixed FULL_FILTER_ORDER instead of planning")
+    args.add_argument("--count-cache", type=str, default="counts.db", help="SQLite file caching result counts of probed search URLs")
+    args.add_argument("--count-ttl", type=float, default=24.0, help="Hours a cached result count stays valid")
+    args.add_argument("--no-count-cache", action="store_true", help="Always load the page to read result counts")
+    args.add_argument("--incremental", action="store_true", help="Only crawl jobs posted since each query's last successful run (f_TPR windows)")
+    args.add_argument("--watermarks", type=str, default="watermarks.json", help="Per-query last-crawl timestamps used by --incremental")
+    args.add_argument("--tabs", type=int, default=1, help="Tabs per Chrome instance; workers share browsers (--workers / --tabs browsers)")
+    args.add_argument("--driver-max-pages", type=int, default=200, help="Recycle a browser after this many jobs")
+    args.add_argument("--driver-max-rss-mb", type=float, default=0, help="Recycle a browser once its processes use more memory than this (0 = off)")
+    args.add_argument("--light-profile", action="store_true", help="Block images, fonts, media and third-party hosts, and report per-page transfer size and load time")
+    args.add_argument("--profile-config", type=str, help="JSON file overriding the --light-profile allow/deny lists (implies --light-profile)")
+    args.add_argument("--metrics-port", type=int, default=0, help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run (0 = off)")
+    args.add_argument("--extract-backend", choices=("script", "html"), default="script", help="Read job cards with one in-page script, or parse main#main's HTML with lxml in worker processes")
+    args.add_argument("--parse-workers", type=int, default=0, help="Parser processes for --extract-backend html (default: CPU count)")
+    args.add_argument("--snapshot-dir", type=str, default="", help="Store the main#main HTML of each job list page whose cards are written here, for offline re-parsing with snapshots.py (default: off)")
+    args.add_argument("--http-fetch", action="store_true", help="Fetch job list pages over HTTP, falling back to Chrome on login/challenge pages")
+    parsed = args.parse_args()
+    if parsed.geo_ids and not parsed.states:
+        args.error("--geo-ids needs --states: searches without --states carry no location to target by geoId")
+    args = parsed
 
     print("Args:", args)
     main(args)
@@ -0,0 +1,183 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# seconds; wide enough for a 60 s page wait and fine enough for a 5 ms script call
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+_local = threading.local()
+
+
+def set_labels(**labels) -> None:
+    """Labels (e.g. handler, worker) attached to everything this thread records from now on."""
+    _local.labels = labels
+
+
+def current_labels() -> dict:
+    return getattr(_local, "labels", {})
+
+
+class Histogram:
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (inf for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        seen = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return float("inf")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Metrics:
+    """Thread-safe counters and histograms keyed by name and labels.
+
+    ``timer(stage)`` measures a block into the ``crawler_stage_seconds``
+    histogram, labelled with the stage and the thread's current labels
+    (``set_labels``). ``prometheus_text`` renders everything in the
+    Prometheus text format; ``summary`` is the end-of-run table.
+    """
+
+    STAGE_HISTOGRAM = "crawler_stage_seconds"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(Histogram)  # (name, labels) -> Histogram
+        self._counters = defaultdict(float)  # (name, labels) -> value
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted({**current_labels(), **labels}.items()))
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._histograms[key].observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(self.STAGE_HISTOGRAM, time.perf_counter() - started, stage=stage, **labels)
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(h.counts), h.count, h.total) for key, h in self._histograms.items())
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_label_text(labels)} {value:g}")
+        for (name, labels), counts, count, total in histograms:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_label_text(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def stage_totals(self, by=("stage", "handler")) -> dict:
+        """Stage histograms merged over every label not in ``by`` (e.g. across workers)."""
+        merged = defaultdict(Histogram)
+        with self._lock:
+            for (name, labels), histogram in self._histograms.items():
+                if name != self.STAGE_HISTOGRAM:
+                    continue
+                values = dict(labels)
+                merged[tuple(values.get(label, "-") for label in by)].merge(histogram)
+        return merged
+
+    def summary(self) -> str:
+        totals = self.stage_totals()
+        if not totals:
+            return "Stage timings: no samples"
+        lines = [
+            "Stage timings:",
+            f"  {'stage':<16} {'handler':<26} {'count':>7} {'total s':>9} {'mean ms':>9} {'p50 ms':>8} {'p90 ms':>8}",
+        ]
+        for (stage, handler), histogram in sorted(totals.items(), key=lambda item: -item[1].total):
+            lines.append(
+                f"  {stage:<16} {handler:<26} {histogram.count:>7} {histogram.total:>9.1f} "
+                f"{histogram.total / histogram.count * 1000:>9.0f} "
+                f"{histogram.percentile(0.5) * 1000:>8g} {histogram.percentile(0.9) * 1000:>8g}"
+            )
+        with self._lock:
+            counters = sorted(self._counters.items())
+        for (name, labels), value in counters:
+            lines.append(f"  {name}{_label_text(labels)} = {value:g}")
+        return "\n".join(lines)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` in Prometheus text format from a daemon thread; call ``shutdown`` to stop."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"Metrics at http://{host}:{server.server_port}/metrics")
+        return server
+
+
+# process-wide registry used by the crawler
+metrics = Metrics()
+timed = metrics.timer
@@ -0,0 +1,163 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+WORK_MODES = ("On-site", "Hybrid", "Remote")
+
+STATE_CODES = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
+    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "District of Columbia": "DC",
+    "Florida": "FL", "Georgia": "GA", "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL",
+    "Indiana": "IN", "Iowa": "IA", "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA",
+    "Maine": "ME", "Maryland": "MD", "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN",
+    "Mississippi": "MS", "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
+    "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY",
+    "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK", "Oregon": "OR",
+    "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC", "South Dakota": "SD",
+    "Tennessee": "TN", "Texas": "TX", "Utah": "UT", "Vermont": "VT", "Virginia": "VA",
+    "Washington": "WA", "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY",
+}
+_CODES = set(STATE_CODES.values())
+_STATE_LOOKUP = {**STATE_CODES, **{code: code for code in _CODES}}
+
+# pyarrow-backed strings: extract/contains/replace run as Arrow compute kernels instead of a Python loop per row
+_STRING = pd.ArrowDtype(pa.string())
+
+# "Austin, TX (On-site)", "Austin, Texas, United States (Hybrid)", "United States (Remote)"
+_LOCATION = (
+    r"^\s*(?:(?P<city>[^,(]+?),\s*)?(?P<state>[^,(]+?)(?:,\s*United States)?\s*"
+    r"(?:\((?P<work_mode>On-site|Hybrid|Remote)\))?\s*$"
+)
+# "$120K/yr - $150K/yr", "$45/hr", "$90,000/yr"
+_SALARY = (
+    r"\$(?P<low>\d[\d,]*(?:\.\d+)?)(?P<low_k>K)?(?:/(?P<low_period>yr|hr|mo|wk))?"
+    r"(?:\s*-\s*\$(?P<high>\d[\d,]*(?:\.\d+)?)(?P<high_k>K)?(?:/(?P<high_period>yr|hr|mo|wk))?)?"
+)
+# "Dallas-Fort Worth Metroplex (On-site)", "London, England, United Kingdom (Remote)": read on their own,
+# so places _LOCATION cannot split still get a work mode and keep their text
+_WORK_MODE_SUFFIX = r"\s*\((?P<work_mode>On-site|Hybrid|Remote)\)\s*$"
+_PERIODS = {"yr": "year", "mo": "month", "wk": "week", "hr": "hour"}
+_APPLICANTS = r"(?P<over>Over )?(?P<count>\d[\d,]*) applicants?"
+
+FLAGS = {
+    "promoted": "Promoted",
+    "easy_apply": "Easy Apply",
+    "actively_reviewing": "Actively reviewing applicants",
+    "early_applicant": "Be an early applicant",
+}
+
+
+def _extract(text: pd.Series, pattern: str) -> pd.DataFrame:
+    # Arrow reports optional groups that did not take part in the match as "", not null
+    parts = text.str.extract(pattern)
+    return parts.mask(parts == "")
+
+
+def _number(text: pd.Series) -> pd.Series:
+    return text.str.replace(",", "", regex=False).astype(pd.ArrowDtype(pa.float64())).astype("Float64")
+
+
+def _amount(number: pd.Series, thousands: pd.Series) -> pd.Series:
+    value = _number(number)
+    return value.where(thousands.isna(), value * 1000)
+
+
+def _category(values: pd.Series, categories) -> pd.Categorical:
+    return pd.Categorical(values.astype(object).where(values.notna(), None), categories=list(categories))
+
+
+def _distinct(column: pd.Series) -> tuple:
+    # job boards repeat the same few thousand locations and badges: parse each distinct string once
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    return codes, pd.Series(uniques, dtype=object).astype(_STRING)
+
+
+def _location_fields(location: pd.Series) -> pd.DataFrame:
+    parts = _extract(location, _LOCATION)
+    # "Texas, United States" reads as city=Texas, state=United States
+    country = (parts["state"] == "United States").fillna(False)
+    state = parts["state"].where(~country, parts["city"])
+    state_code = state.astype(object).map(_STATE_LOOKUP).astype("string")
+    # metro areas ("San Francisco Bay Area") and places abroad name no state: keep their text instead of dropping it
+    place = location.str.replace(_WORK_MODE_SUFFIX, "", regex=True).str.strip()
+    place = place.where(state_code.isna().to_numpy() & (place != "United States") & (place != ""))
+    return pd.DataFrame({
+        "city": parts["city"].where(~country).astype("string"),
+        "state_code": state_code,
+        "place": place.astype("string"),
+        "work_mode": _category(_extract(location, _WORK_MODE_SUFFIX)["work_mode"], WORK_MODES),
+    })
+
+
+def _metadata_fields(metadata: pd.Series) -> pd.DataFrame:
+    metadata = metadata.fillna("")
+    salary = _extract(metadata, _SALARY)
+    salary_min = _amount(salary["low"], salary["low_k"])
+    applicants = _extract(metadata, _APPLICANTS)
+    fields = pd.DataFrame({
+        "salary_min": salary_min,
+        "salary_max": _amount(salary["high"], salary["high_k"]).fillna(salary_min),
+        "salary_period": _category(salary["high_period"].fillna(salary["low_period"]), _PERIODS).rename_categories(_PERIODS),
+        "applicants": _number(applicants["count"]).astype("Int64"),
+        "applicants_over": (applicants["over"].notna() & applicants["count"].notna()).astype(bool),
+    })
+    for column, text in FLAGS.items():
+        fields[column] = metadata.str.contains(text, regex=False).astype(bool)
+    return fields
+
+
+def normalize_jobs(frame: pd.DataFrame) -> pd.DataFrame:
+    """Split ``job_location`` and ``job_metadata`` into typed columns, a whole batch at a time.
+
+    Adds ``city``, ``state_code``, ``place``, ``work_mode``, ``salary_min``,
+    ``salary_max``, ``salary_period``, ``applicants``, ``applicants_over`` and
+    the boolean ``FLAGS`` columns. ``place`` holds the location text when no
+    US state is recognised in it (metro areas, places abroad). Each column is
+    factorized first and its distinct values are parsed with vectorized string
+    operations on pyarrow-backed strings; missing or unrecognised text leaves
+    the new columns null. Returns a new frame.
+    """
+    parsed = [frame.reset_index(drop=True)]
+    for column, parse in (("job_location", _location_fields), ("job_metadata", _metadata_fields)):
+        codes, uniques = _distinct(frame[column])
+        parsed.append(parse(uniques).take(codes).reset_index(drop=True))
+    return pd.concat(parsed, axis=1).set_axis(frame.index)
+
+
+def read_results(paths) -> pd.DataFrame:
+    """Load job rows from JSONL sink parts and/or Parquet files or datasets."""
+    frames = []
+    for path in map(Path, paths):
+        if path.is_dir() or path.suffix == ".parquet":
+            frames.append(pd.read_parquet(path))
+            continue
+        with open(path, encoding="utf-8") as f:
+            rows = [
+                {**job, "query_url": record["url"]}
+                for record in map(json.loads, f)
+                for job in record["jobs"]
+            ]
+        frames.append(pd.DataFrame(rows))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize job_location and job_metadata into structured columns")
+    parser.add_argument("inputs", nargs="+", help="JSONL result parts, Parquet files or a Parquet dataset directory")
+    parser.add_argument("-o", "--output", type=str, default="jobs_normalized.parquet", help="Parquet file to write")
+    args = parser.parse_args()
+
+    jobs = read_results(args.inputs)
+    started = time.perf_counter()
+    normalized = normalize_jobs(jobs)
+    elapsed = time.perf_counter() - started
+    normalized.to_parquet(args.output, index=False)
+    print(f"Normalized {len(normalized)} rows in {elapsed:.2f}s ({len(normalized) / elapsed if elapsed else 0:,.0f} rows/s)")
+    print(f"Written to {args.output}")
+# Example usage:
+# python normalize.py results-00000.jsonl results-00001.jsonl -o jobs_normalized.parquet
+# python normalize.py results/ -o jobs_normalized.parquet
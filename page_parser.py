@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urljoin
+
+import lxml.html
+
+from utils import JOB_CARD_SELECTOR, JOB_FIELD_SELECTORS
+
+MAIN_SELECTOR = "main#main"
+SUBTITLE_SELECTOR = "header div.jobs-search-results-list__subtitle"
+
+
+# Nodes innerText leaves out, and elements that start a new line of it
+_SKIPPED_TAGS = {"script", "style", "template", "noscript", "head"}
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul",
+}
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _is_rendered(element) -> bool:
+    # only markup-level hiding is visible to lxml; stylesheet rules (class-based hiding) are not
+    return (
+        element.tag not in _SKIPPED_TAGS
+        and element.get("hidden") is None
+        and not _HIDDEN_STYLE.search(element.get("style") or "")
+    )
+
+
+def _collect_text(element, out):
+    if not isinstance(element.tag, str):  # comments and processing instructions
+        return
+    if not _is_rendered(element):
+        return
+    block = element.tag in _BLOCK_TAGS
+    if block:
+        out.append("\n")
+    if element.text:
+        out.append(_WHITESPACE.sub(" ", element.text))
+    for child in element:
+        _collect_text(child, out)
+        if child.tail:
+            out.append(_WHITESPACE.sub(" ", child.tail))
+    if element.tag == "br" or block:
+        out.append("\n")
+
+
+def _text(node) -> str:
+    # Approximate innerText (what WebElement.text returns): hidden and script content is skipped,
+    # whitespace collapses, <br> and block elements break lines; blank lines are dropped.
+    out = []
+    _collect_text(node, out)
+    lines = (line.strip() for line in "".join(out).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _read_field(card, spec, base_url):
+    selector, kind, attribute = spec
+    found = card.cssselect(selector)
+    if not found:
+        return ""
+    node = found[0]
+    if kind == "text":
+        return _text(node)
+    value = node.get(attribute)
+    if value is not None and attribute == "href" and base_url:
+        # get_attribute("href") returns the resolved URL
+        value = urljoin(base_url, value)
+    return value
+
+
+def parse_html(html: str):
+    return lxml.html.fromstring(html)
+
+
+def outer_html(element) -> str:
+    """Serialize ``element`` like the browser's ``outerHTML``."""
+    return lxml.html.tostring(element, encoding="unicode")
+
+
+def find_main(document):
+    if document.tag == "main" and document.get("id") == "main":
+        return document
+    found = document.cssselect(MAIN_SELECTOR)
+    return found[0] if found else None
+
+
+def parse_job_cards(html_or_element, base_url: str | None = None) -> list[dict]:
+    """Parse job cards from raw HTML with the selectors defined in :mod:`utils`.
+
+    Produces the same dicts as :func:`utils.extract_job_cards`.
+    """
+    root = parse_html(html_or_element) if isinstance(html_or_element, str) else html_or_element
+    main = find_main(root)
+    if main is None:
+        return []
+    return [
+        {name: _read_field(card, spec, base_url) for name, spec in JOB_FIELD_SELECTORS.items()}
+        for card in main.cssselect(JOB_CARD_SELECTOR)
+    ]
+
+
+def parse_number_results(html_or_element) -> int | None:
+    """HTML counterpart of :func:`utils.extract_number_results`."""
+    root = parse_html(html_or_element) if isinstance(html_or_element, str) else html_or_element
+    found = root.cssselect(SUBTITLE_SELECTOR)
+    if not found:
+        return None
+    num = re.search(r'(\d[\d,]*)\s+results?', _text(found[0]))
+    if num:
+        return int(num.group(1).replace(",", ""))
+    return None
+
+
+def _warm_up(_index):
+    return os.getpid()
+
+
+class ParserPool:
+    """Parse job cards in worker processes, off the crawler's GIL.
+
+    Worker threads hand over ``main#main``'s outerHTML and block on the result
+    (without holding the GIL), so lxml parsing never competes with threads
+    that drive browsers. The processes are forked in the constructor, so
+    create the pool before starting any threads.
+
+    A child that dies breaks the whole executor. The pool is then recreated
+    once with ``forkserver`` (forking is unsafe by then, threads are running);
+    if that pool breaks too, pages are parsed in the calling thread.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context("fork") if os.name == "posix" else None
+        self._lock = threading.Lock()
+        self._executor = self._start(context)
+        self._restarted = False
+        self.inline_parses = 0
+
+    def _start(self, context):
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        # start every process now rather than on the first page
+        list(executor.map(_warm_up, range(self.workers)))
+        return executor
+
+    def _recover(self, broken):
+        with self._lock:
+            if self._executor is not broken:
+                return  # another thread already replaced it
+            broken.shutdown(wait=False)
+            self._executor = None
+            if self._restarted:
+                print("[ParserPool] parser processes crashed again; parsing in the crawler process from now on")
+                return
+            self._restarted = True
+            print("[ParserPool] a parser process crashed; restarting the pool")
+            context = multiprocessing.get_context("forkserver") if os.name == "posix" else None
+            try:
+                self._executor = self._start(context)
+            except (OSError, BrokenProcessPool) as exc:
+                print(f"[ParserPool] restart failed ({exc}); parsing in the crawler process from now on")
+
+    def parse_job_cards(self, html: str, base_url: str | None = None) -> list[dict]:
+        while True:
+            executor = self._executor
+            if executor is None:
+                self.inline_parses += 1
+                return parse_job_cards(html, base_url)
+            try:
+                return executor.submit(parse_job_cards, html, base_url).result()
+            except BrokenProcessPool:
+                self._recover(executor)
+            except RuntimeError:
+                if executor is self._executor:
+                    raise
+                # shut down by another thread's _recover between the read and submit; use its replacement
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
@@ -0,0 +1,216 @@
+import json
+import threading
+import urllib.parse
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field, fields
+
+from selenium.common.exceptions import WebDriverException
+
+DEFAULT_BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico",
+    "woff", "woff2", "ttf", "otf",
+    "mp4", "webm", "m4s", "mp3",
+)
+DEFAULT_ALLOWED_HOSTS = ("linkedin.com", "licdn.com")
+DEFAULT_DENIED_HOSTS = (
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "bat.bing.com",
+    "connect.facebook.net",
+)
+
+# transfer sizes come from the network log: Resource Timing reports 0 for cross-origin responses
+_PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+return {
+    resources: resources.length,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : performance.now(),
+};
+"""
+
+
+def _host_matches(host, domains):
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+@dataclass
+class ResourceProfile:
+    """What the lightweight browser profile refuses to download.
+
+    Requests are blocked with CDP ``Network.setBlockedURLs`` when they match a
+    blocked file extension or a denied host. With ``block_third_party``, any
+    host outside ``allowed_hosts`` that shows up in the network log is added to
+    the denied list for the following pages.
+    """
+
+    blocked_extensions: tuple = DEFAULT_BLOCKED_EXTENSIONS
+    allowed_hosts: tuple = DEFAULT_ALLOWED_HOSTS
+    denied_hosts: tuple = DEFAULT_DENIED_HOSTS
+    block_third_party: bool = True
+    block_images: bool = True
+
+    @classmethod
+    def from_file(cls, path):
+        """Load overrides from JSON, e.g. {"allowed_hosts": [...], "blocked_extensions": [...]}."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise KeyError(f"Unknown resource profile key(s): {', '.join(sorted(unknown))}")
+        return cls(**{key: tuple(value) if isinstance(value, list) else value for key, value in data.items()})
+
+    def configure_options(self, options):
+        """Chrome options needed before the browser starts (image setting, network log)."""
+        if self.block_images:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+@dataclass
+class PageWeight:
+    url: str
+    transfer_bytes: int
+    resources: int
+    load_ms: float
+    blocked: list = field(default_factory=list)
+
+
+class PageProfiler:
+    """Apply a ResourceProfile to every tab and account for page weight.
+
+    ``before_page`` pushes the current block list to the tab (again whenever
+    new third-party hosts were learned). ``after_page`` records the bytes
+    received on the wire (``encodedDataLength`` of the network log's
+    ``Network.loadingFinished`` events), the load time from the Navigation
+    Timing API, and the requests that were blocked. ``hydration_failed`` is
+    called when a page's cards never show up; the blocked requests of that
+    page are reported as suspects.
+    """
+
+    def __init__(self, profile: ResourceProfile | None = None):
+        self.profile = profile or ResourceProfile()
+        self._lock = threading.Lock()
+        self._denied_hosts = list(self.profile.denied_hosts)
+        self._version = 0
+        self._applied = weakref.WeakKeyDictionary()  # driver/tab -> block list version
+        self._last_blocked = weakref.WeakKeyDictionary()  # driver/tab -> blocked urls of its last page
+        self.pages = 0
+        self.transfer_bytes = 0
+        self.load_ms = 0.0
+        self.blocked_requests = 0
+        self.hydration_failures = 0
+        self.suspects = Counter()
+
+    def url_patterns(self):
+        patterns = [f"*.{ext}" for ext in self.profile.blocked_extensions]
+        patterns += [f"*.{ext}?*" for ext in self.profile.blocked_extensions]
+        patterns += [f"*://{host}/*" for host in self._denied_hosts]
+        patterns += [f"*://*.{host}/*" for host in self._denied_hosts]
+        return patterns
+
+    def before_page(self, driver):
+        with self._lock:
+            version = self._version
+            if self._applied.get(driver) == version:
+                return
+            patterns = self.url_patterns()
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as exc:
+            print(f"PageProfiler: could not apply block list ({exc})")
+            return
+        with self._lock:
+            self._applied[driver] = version
+
+    def _drain_network_log(self, driver):
+        # the performance log is per session; in tab mode it may include neighbouring tabs' requests
+        blocked = []
+        hosts = set()
+        transfer_bytes = 0
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return blocked, hosts, transfer_bytes
+        requested = {}
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                request_url = params.get("request", {}).get("url", "")
+                requested[params.get("requestId")] = request_url
+                host = urllib.parse.urlsplit(request_url).hostname
+                if host:
+                    hosts.add(host.lower())
+            elif method == "Network.loadingFinished":
+                transfer_bytes += int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked.append(requested.get(params.get("requestId"), params.get("requestId")))
+        return blocked, hosts, transfer_bytes
+
+    def after_page(self, driver, url) -> PageWeight | None:
+        try:
+            weight = driver.execute_script(_PAGE_WEIGHT_SCRIPT) or {}
+        except WebDriverException:
+            weight = {}
+        blocked, hosts, transfer_bytes = self._drain_network_log(driver)
+        page = PageWeight(
+            url=url,
+            transfer_bytes=transfer_bytes,
+            resources=int(weight.get("resources") or 0),
+            load_ms=float(weight.get("load_ms") or 0.0),
+            blocked=blocked,
+        )
+        with self._lock:
+            self.pages += 1
+            self.transfer_bytes += page.transfer_bytes
+            self.load_ms += page.load_ms
+            self.blocked_requests += len(blocked)
+            self._last_blocked[driver] = blocked
+            if self.profile.block_third_party:
+                learned = [
+                    host for host in hosts
+                    if not _host_matches(host, self.profile.allowed_hosts)
+                    and not _host_matches(host, self._denied_hosts)
+                ]
+                if learned:
+                    self._denied_hosts.extend(learned)
+                    self._version += 1
+                    print(f"PageProfiler: blocking third-party hosts {', '.join(sorted(learned))}")
+        return page
+
+    def hydration_failed(self, driver, url):
+        with self._lock:
+            blocked = list(self._last_blocked.get(driver, []))
+            self.hydration_failures += 1
+            for blocked_url in blocked:
+                parts = urllib.parse.urlsplit(blocked_url)
+                self.suspects[f"{parts.hostname}{parts.path}"] += 1
+        if blocked:
+            print(f"PageProfiler: cards did not hydrate on {url}; {len(blocked)} blocked requests may be needed:")
+            for blocked_url in blocked[:10]:
+                print(f"  blocked: {blocked_url}")
+        else:
+            print(f"PageProfiler: cards did not hydrate on {url}; no requests were blocked on that page")
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.pages:
+                return "Page weight: no pages recorded"
+            lines = [
+                f"Page weight: {self.pages} pages, "
+                f"{self.transfer_bytes / self.pages / 1024:.0f} KB transferred and "
+                f"{self.load_ms / self.pages:.0f} ms load per page, "
+                f"{self.blocked_requests} requests blocked, "
+                f"{self.hydration_failures} pages failed to hydrate"
+            ]
+            for resource, count in self.suspects.most_common(10):
+                lines.append(f"  hydration suspect ({count}x): {resource}")
+        return "\n".join(lines)
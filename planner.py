@@ -0,0 +1,191 @@
+import json
+import math
+import random
+import threading
+import urllib.parse
+from pathlib import Path
+
+from url_generator import FULL_FILTER_DEFINITIONS, FULL_FILTER_ORDER, canonical_url, extend_url_with_filter
+
+RESULT_CAP = 1000  # LinkedIn stops paginating after 1000 results
+PAGE_SIZE = 25
+MAX_START = RESULT_CAP - PAGE_SIZE  # matches generate_paged_urls in crawler.py
+EXPECTED_CACHE_SIZE = 4096
+
+
+def pagination_loads(total_jobs: float) -> int:
+    """Page loads generate_paged_urls schedules for a search with ``total_jobs`` results."""
+    return math.ceil(min(MAX_START, max(0.0, total_jobs)) / PAGE_SIZE)
+
+
+def _split_choices(name):
+    # choices whose value is None leave the URL unchanged, so they are not a split
+    return [label for label, value in FULL_FILTER_DEFINITIONS[name].choices.items() if value is not None]
+
+
+class SplitPlanner:
+    """Choose which facet to split a >1000-result search on.
+
+    Every probed search count is observed; when a search has a known parent
+    (the same search without one facet parameter) the child/parent ratio is
+    recorded as a share for that facet value. Shares persist in ``stats_path``
+    across runs. To choose a split, each candidate dimension is scored by the
+    expected number of leaves still over the cap, then by expected page loads
+    (probes plus pagination) for the whole subtree; ties keep FULL_FILTER_ORDER.
+    """
+
+    def __init__(self, stats_path=None):
+        self.stats_path = Path(stats_path) if stats_path else None
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        # (total, remaining facets) -> _expected result; only touched under _lock, emptied whenever a share changes
+        self._expected_cache: dict[tuple[float, frozenset], tuple[float, float]] = {}
+        # facet name -> choice label -> [sum of shares, observations]
+        self._shares: dict[str, dict[str, list[float]]] = {}
+        if self.stats_path and self.stats_path.exists():
+            self._shares = json.loads(self.stats_path.read_text()).get("shares", {})
+        self._value_labels = {
+            name: {value: label for label, value in definition.choices.items() if value is not None}
+            for name, definition in FULL_FILTER_DEFINITIONS.items()
+        }
+
+    def observe(self, url: str, total_jobs: int) -> None:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        with self._lock:
+            self._counts[canonical_url(url)] = total_jobs
+            for name, definition in FULL_FILTER_DEFINITIONS.items():
+                value = params.get(definition.param_key)
+                label = self._value_labels[name].get(value)
+                if label is None:
+                    continue
+                parent_total = self._counts.get(canonical_url(url, drop=("start", definition.param_key)))
+                if not parent_total:
+                    continue
+                entry = self._shares.setdefault(name, {}).setdefault(label, [0.0, 0])
+                entry[0] += min(1.0, total_jobs / parent_total)
+                entry[1] += 1
+            self._expected_cache.clear()
+
+    def share(self, name: str, label: str) -> float:
+        entry = self._shares.get(name, {}).get(label)
+        if entry and entry[1]:
+            return entry[0] / entry[1]
+        return 1.0 / len(_split_choices(name))
+
+    def _expected(self, total: float, remaining: frozenset) -> tuple[float, float]:
+        """(leaves over the cap, page loads) for a search with ``total`` results; call with ``_lock`` held."""
+        if total <= RESULT_CAP or not remaining:
+            return float(total > RESULT_CAP), float(pagination_loads(total))
+        key = (total, remaining)
+        cost = self._expected_cache.get(key)
+        if cost is None:
+            cost = min(self._split_cost(total, name, remaining) for name in remaining)
+            if len(self._expected_cache) >= EXPECTED_CACHE_SIZE:
+                self._expected_cache.clear()
+            self._expected_cache[key] = cost
+        return cost
+
+    def _split_cost(self, total: float, name: str, remaining: frozenset) -> tuple[float, float]:
+        rest = remaining - {name}
+        over_cap = 0.0
+        loads = 0.0
+        for label in _split_choices(name):
+            child_over_cap, child_loads = self._expected(round(total * self.share(name, label)), rest)
+            over_cap += child_over_cap
+            loads += 1 + child_loads  # the child probe plus its subtree
+        return over_cap, loads
+
+    def choose_filter(self, url: str, total_jobs: int, available: list[str]) -> str | None:
+        candidates = [name for name in FULL_FILTER_ORDER if name in available and _split_choices(name)]
+        candidates += [name for name in available if name not in candidates and _split_choices(name)]
+        if not candidates:
+            return None
+        remaining = frozenset(candidates)
+        with self._lock:
+            scored = [(self._split_cost(total_jobs, name, remaining), index, name) for index, name in enumerate(candidates)]
+        return min(scored)[2]
+
+    def save(self) -> None:
+        if not self.stats_path:
+            return
+        with self._lock:
+            payload = json.dumps({"shares": self._shares}, indent=2, ensure_ascii=False)
+        self.stats_path.write_text(payload)
+
+
+def fixed_order_choice(url: str, total_jobs: int, available: list[str]) -> str | None:
+    """The original strategy: first available filter in FULL_FILTER_ORDER."""
+    return next((name for name in FULL_FILTER_ORDER if name in available), None)
+
+
+def synthetic_world(seed):
+    """Share of results under every facet label, for a made-up job market (also served by simulator.py)."""
+    rng = random.Random(seed)
+    shares = {}
+    for name in FULL_FILTER_DEFINITIONS:
+        labels = _split_choices(name)
+        if name == "date_posted":
+            week = rng.uniform(0.1, 0.3)
+            shares[name] = {"Past week": week, "Past month": min(0.9, week * rng.uniform(2.5, 4.0))}
+        elif name == "salary_ranges":
+            # cumulative "$X+" buckets
+            level = rng.uniform(0.6, 0.8)
+            shares[name] = {}
+            for label in labels:
+                shares[name][label] = level
+                level *= rng.uniform(0.5, 0.8)
+        else:
+            weights = [rng.gammavariate(0.7, 1.0) for _ in labels]
+            shares[name] = {label: w / sum(weights) for label, w in zip(labels, weights)}
+    return shares
+
+
+def simulated_count(url, base_total, world):
+    """Result count of ``url`` when its unfiltered search has ``base_total`` results."""
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+    count = float(base_total)
+    for name, definition in FULL_FILTER_DEFINITIONS.items():
+        value = params.get(definition.param_key)
+        if value is None:
+            continue
+        label = next((label for label, v in definition.choices.items() if v == value), None)
+        if label is None:
+            continue  # a value outside the choices, e.g. an incremental f_TPR window
+        count *= world[name][label]
+    return int(count)
+
+
+def simulate_crawl(choose, base_totals, world, observe=None) -> dict:
+    """Replay linkedin_page_crawler's split/paginate decisions against synthetic counts."""
+    stats = {"probes": 0, "pages": 0, "leaves_over_cap": 0, "results_over_cap": 0}
+    pending = [(f"https://www.linkedin.com/jobs/search/?keywords=q{i}", total) for i, total in enumerate(base_totals)]
+    while pending:
+        url, base_total = pending.pop()
+        total = simulated_count(url, base_total, world)
+        stats["probes"] += 1
+        if observe:
+            observe(url, total)
+        if total > RESULT_CAP:
+            present = {key for key, _ in urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query)}
+            available = [name for name, d in FULL_FILTER_DEFINITIONS.items() if d.param_key not in present]
+            name = choose(url, total, available)
+            if name is not None:
+                children = [u for u in extend_url_with_filter(url, name) if canonical_url(u) != canonical_url(url)]
+                pending.extend((child, base_total) for child in children)
+                continue
+            stats["leaves_over_cap"] += 1
+            stats["results_over_cap"] += total - RESULT_CAP
+        stats["pages"] += pagination_loads(total)
+    stats["page_loads"] = stats["probes"] + stats["pages"]
+    return stats
+
+
+def simulate_split_costs(queries=200, seed=7) -> dict[str, dict]:
+    """Compare the fixed filter order with a planner trained on one previous run."""
+    rng = random.Random(seed)
+    world = synthetic_world(seed)
+    base_totals = [int(rng.lognormvariate(7.5, 1.2)) for _ in range(queries)]
+    planner = SplitPlanner()
+    fixed = simulate_crawl(fixed_order_choice, base_totals, world, observe=planner.observe)
+    planned = simulate_crawl(planner.choose_filter, base_totals, world)
+    return {"fixed_order": fixed, "planner": planned}
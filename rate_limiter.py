@@ -0,0 +1,121 @@
+import random
+import threading
+import time
+from collections import Counter
+
+THROTTLE_URL_KEYWORDS = ("checkpoint", "authwall", "challenge", "/login")
+
+
+# estimated seconds each job of the old per-worker loop spent between its sleeps:
+# time_sleep=4 plus 0-2 s after the load (5.0 mean), simulate_human_like_actions (0.5),
+# driver.get until the load event (about 2.5) and the 300 px scroll steps with
+# 0.1-0.4 s pauses over a 25-card list (about 3.0)
+LEGACY_JOB_SECONDS = 11.0
+
+
+def default_rpm(workers: int, sleep_min: float, sleep_max: float, job_seconds: float = LEGACY_JOB_SECONDS) -> float:
+    """Rate of ``workers`` threads that each slept sleep_min..sleep_max between jobs of ``job_seconds``.
+
+    An estimate of the pace the old loop actually ran at (load and scroll
+    times vary with the network), not a bound: the limiter's additive
+    increase finds the headroom and its backoff handles an overshoot. Only
+    page requests draw tokens; jobs answered from the count cache do not.
+    """
+    mean_sleep = max((sleep_min + sleep_max) / 2, 0.5)
+    return workers * 60.0 / (mean_sleep + job_seconds)
+
+
+def is_throttle_url(url: str | None) -> bool:
+    url = (url or "").lower()
+    return any(keyword in url for keyword in THROTTLE_URL_KEYWORDS)
+
+
+class RateLimiter:
+    """Process-wide token bucket shared by all workers, paced with AIMD.
+
+    ``acquire`` blocks until the next request may start. Tokens refill at
+    ``rpm`` per minute, up to ``burst``, and callers beyond the bucket reserve
+    a future slot so they are served in order. ``jitter`` stretches each wait
+    by up to that fraction so requests do not arrive on a fixed beat.
+
+    ``success`` raises the rate additively (``increase`` requests per minute
+    for every minute's worth of successful pages), up to ``max_rpm``.
+    ``throttled(reason)`` multiplies it by ``decrease``, down to ``min_rpm``,
+    and empties the bucket. Signals that arrive within ``cooldown`` seconds of
+    a cut count as the same event, so a burst of timeouts halves the rate once.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        *,
+        min_rpm: float | None = None,
+        max_rpm: float | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        burst: float = 1.0,
+        cooldown: float = 30.0,
+        jitter: float = 0.2,
+    ):
+        self.min_rpm = min_rpm if min_rpm is not None else rpm / 4
+        self.max_rpm = max_rpm if max_rpm is not None else rpm * 3
+        self.rpm = min(max(rpm, self.min_rpm), self.max_rpm)
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.cooldown = cooldown
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._last_cut = float("-inf")
+        self.requests = 0
+        self.waited = 0.0
+        self.cuts = 0
+        self.peak_rpm = self.rpm
+        self.signals = Counter()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rpm / 60.0)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Wait for a request slot; returns the seconds waited."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens * 60.0 / self.rpm)
+            self.requests += 1
+        if wait > 0:
+            wait *= 1 + random.uniform(0, self.jitter)
+            time.sleep(wait)
+            with self._lock:
+                self.waited += wait
+        return wait
+
+    def success(self) -> None:
+        with self._lock:
+            self.rpm = min(self.max_rpm, self.rpm + self.increase / max(self.rpm, 1.0))
+            self.peak_rpm = max(self.peak_rpm, self.rpm)
+
+    def throttled(self, reason: str) -> None:
+        with self._lock:
+            self.signals[reason] += 1
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+            self._refill(now)
+            self.rpm = max(self.min_rpm, self.rpm * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            self.cuts += 1
+            rpm = self.rpm
+        print(f"[RateLimiter] {reason}; slowing down to {rpm:.1f} requests/min")
+
+    def summary(self) -> str:
+        with self._lock:
+            signals = ", ".join(f"{reason}={count}" for reason, count in self.signals.most_common()) or "none"
+            return (
+                f"Rate limiter: {self.requests} requests, now {self.rpm:.1f}/min (peak {self.peak_rpm:.1f}), "
+                f"{self.cuts} slowdowns, {self.waited:.0f}s spent waiting; throttle signals: {signals}"
+            )
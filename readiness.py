@@ -0,0 +1,268 @@
+import time
+from dataclasses import dataclass, field
+
+from selenium.common.exceptions import WebDriverException
+
+from tabs import TabHandle
+from utils import JOB_CARD_SELECTOR
+
+MAIN_SELECTOR = "main#main"
+SUBTITLE_SELECTOR = "header div.jobs-search-results-list__subtitle"
+NO_RESULTS_SELECTOR = "div.jobs-search-no-results-banner"
+CARD_METADATA_SELECTOR = "div.artdeco-entity-lockup__metadata"
+
+# One round trip per poll: every readiness signal of the current document.
+# Network activity is tracked with a PerformanceObserver installed on the first poll: the
+# Resource Timing buffer holds only 250 entries, and once it is full getEntriesByType stops
+# growing, so a busy page would read as idle. The buffer is also enlarged so page_profile.py
+# still sees every entry, and cleared should it fill up anyway.
+_READY_STATE_SCRIPT = """
+const [mainSelector, subtitleSelector, noResultsSelector, cardSelector, metadataSelector] = arguments;
+if (!window.__crawlerNetwork) {
+    const network = window.__crawlerNetwork = {count: 0, lastResponseEnd: 0};
+    const record = entry => {
+        network.count += 1;
+        network.lastResponseEnd = Math.max(network.lastResponseEnd, entry.responseEnd);
+    };
+    performance.getEntriesByType("resource").forEach(record);
+    performance.setResourceTimingBufferSize(10000);
+    performance.addEventListener("resourcetimingbufferfull", () => performance.clearResourceTimings());
+    new PerformanceObserver(list => list.getEntries().forEach(record)).observe({type: "resource"});
+}
+const network = window.__crawlerNetwork;
+const main = document.querySelector(mainSelector);
+const subtitle = main && main.querySelector(subtitleSelector);
+const cards = main ? Array.from(main.querySelectorAll(cardSelector)) : [];
+return {
+    main: !!main,
+    subtitle: !!(subtitle && subtitle.textContent.trim()),
+    no_results: !!(main && main.querySelector(noResultsSelector)),
+    cards: cards.length,
+    hydrated: cards.filter(card => card.querySelector(metadataSelector)).length,
+    resources: network.count,
+    idle_ms: performance.now() - network.lastResponseEnd,
+};
+"""
+
+# Scrolls the job list inside the page until ``expected`` cards have their metadata node.
+# Cards only render their content near the viewport, so it jumps to the first card still
+# missing metadata; a card that makes no progress for ``stallTicks`` ticks is skipped. It
+# stops early once the list is at the bottom and has stopped growing.
+_SCROLL_UNTIL_HYDRATED_SCRIPT = """
+const [container, cardSelector, metadataSelector, expected, step, pauseMs, settleTicks, stallTicks, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const deadline = performance.now() + timeoutMs;
+let skip = 0, stalled = 0, stable = 0, lastHydrated = -1, lastHeight = -1;
+function tick() {
+    const cards = Array.from(container.querySelectorAll(cardSelector));
+    const missing = cards.filter(card => !card.querySelector(metadataSelector));
+    const hydrated = cards.length - missing.length;
+    const finish = complete => done({hydrated: hydrated, cards: cards.length, skipped: skip, complete: complete});
+    if (hydrated >= expected) {
+        finish(true);
+        return;
+    }
+    const waiting = missing.length > skip;
+    if (waiting) {
+        stalled = hydrated === lastHydrated ? stalled + 1 : 0;
+        if (stalled >= stallTicks) {
+            skip += 1;
+            stalled = 0;
+        }
+    }
+    const atBottom = container.scrollTop + container.clientHeight >= container.scrollHeight - 2;
+    stable = atBottom && !waiting && container.scrollHeight === lastHeight ? stable + 1 : 0;
+    lastHydrated = hydrated;
+    lastHeight = container.scrollHeight;
+    if (stable >= settleTicks) {
+        finish(missing.length === 0);
+        return;
+    }
+    if (performance.now() >= deadline) {
+        finish(false);
+        return;
+    }
+    if (missing.length > skip) {
+        missing[skip].scrollIntoView({block: "center"});
+    } else {
+        container.scrollTop = Math.min(container.scrollTop + step, container.scrollHeight);
+    }
+    setTimeout(tick, pauseMs);
+}
+tick();
+"""
+
+# Tab mode: one scroll step of the job list: report hydration, then move towards the next card still
+# missing its metadata node (cards only render near the viewport). The first ``skip`` such
+# cards are ignored, so a card that never renders cannot hold the scroll in place.
+_SCROLL_TICK_SCRIPT = """
+const [container, cardSelector, metadataSelector, step, skip] = arguments;
+const cards = Array.from(container.querySelectorAll(cardSelector));
+const missing = cards.filter(card => !card.querySelector(metadataSelector));
+const state = {
+    cards: cards.length,
+    hydrated: cards.length - missing.length,
+    pending: missing.length,
+    at_bottom: container.scrollTop + container.clientHeight >= container.scrollHeight - 2,
+    height: container.scrollHeight,
+};
+if (missing.length > skip) {
+    missing[skip].scrollIntoView({block: "center"});
+} else {
+    container.scrollTop = Math.min(container.scrollTop + step, container.scrollHeight);
+}
+return state;
+"""
+
+# below Selenium's default 30 s script timeout, so the async script always reports back
+SCROLL_TIMEOUT = 25.0
+SCROLL_STEP_PX = 600  # per tick once every card in view is hydrated (or skipped)
+SCROLL_PAUSE = 0.15  # seconds between ticks
+SCROLL_SETTLE_TICKS = 4  # unchanged ticks at the bottom before giving up on more cards
+SCROLL_STALL_TICKS = 8  # ticks without progress before a card that will not render is skipped
+
+
+@dataclass
+class ReadinessPolicy:
+    """Signals a search page must show before it is considered loaded.
+
+    The page is ready once ``main#main`` exists, the results subtitle has text
+    (or the no-results banner is shown) and at least ``min_cards`` cards carry
+    their metadata node. With ``min_cards`` those cards are the signal, so
+    the network is not waited for: LinkedIn's beacons and polling may never
+    let it settle. Otherwise the network should also be idle, i.e. no new
+    resource for ``network_quiet_ms``, but for at most ``idle_grace``
+    seconds after the page content is there.
+    """
+
+    min_cards: int = 0
+    require_subtitle: bool = True
+    network_quiet_ms: float = 500.0
+    idle_grace: float = 1.0
+    poll_interval: float = 0.1
+
+
+@dataclass
+class ReadinessResult:
+    ready: bool
+    waited: float
+    state: dict = field(default_factory=dict)
+
+
+def read_state(driver) -> dict:
+    return driver.execute_script(
+        _READY_STATE_SCRIPT,
+        MAIN_SELECTOR,
+        SUBTITLE_SELECTOR,
+        NO_RESULTS_SELECTOR,
+        JOB_CARD_SELECTOR,
+        CARD_METADATA_SELECTOR,
+    ) or {}
+
+
+def content_ready(state: dict, policy: ReadinessPolicy) -> bool:
+    if not state.get("main"):
+        return False
+    if state.get("no_results"):
+        return True
+    if policy.require_subtitle and not state.get("subtitle"):
+        return False
+    return state.get("hydrated", 0) >= policy.min_cards
+
+
+def is_ready(state: dict, policy: ReadinessPolicy, stable_polls: int, content_ready_for: float = 0.0) -> bool:
+    """``content_ready_for``: seconds since the page first met ``content_ready``."""
+    if not content_ready(state, policy):
+        return False
+    if state.get("no_results") or policy.min_cards or content_ready_for >= policy.idle_grace:
+        return True
+    # a resource still in flight has no timing entry yet, so also require an unchanged entry count
+    return stable_polls > 0 and state.get("idle_ms", 0) >= policy.network_quiet_ms
+
+
+def wait_until_ready(driver, policy: ReadinessPolicy, timeout: float) -> ReadinessResult:
+    """Poll the page until ``policy`` is met or ``timeout`` seconds pass."""
+    started = time.monotonic()
+    deadline = started + timeout
+    state = {}
+    previous_resources = None
+    stable_polls = 0
+    content_since = None
+    while True:
+        try:
+            state = read_state(driver)
+        except WebDriverException:
+            state = {}  # the document is being replaced; try again
+        resources = state.get("resources")
+        stable_polls = stable_polls + 1 if resources is not None and resources == previous_resources else 0
+        previous_resources = resources
+        now = time.monotonic()
+        if not content_ready(state, policy):
+            content_since = None
+        elif content_since is None:
+            content_since = now
+        if is_ready(state, policy, stable_polls, 0.0 if content_since is None else now - content_since):
+            return ReadinessResult(True, time.monotonic() - started, state)
+        if time.monotonic() >= deadline:
+            return ReadinessResult(False, time.monotonic() - started, state)
+        time.sleep(policy.poll_interval)
+
+
+def scroll_until_hydrated(driver, container, expected: int, timeout: float = SCROLL_TIMEOUT) -> dict:
+    """Scroll ``container`` until ``expected`` cards are hydrated.
+
+    With a plain WebDriver this is one ``execute_async_script`` that scrolls
+    and waits inside the page. In tab mode (``driver`` is a
+    :class:`tabs.TabHandle`) such a script would hold the browser lock for
+    the whole scroll, so each tick is a quick ``execute_script`` and the pause
+    between ticks happens in Python, leaving the lock to the other tabs. A
+    card that makes no progress for ``SCROLL_STALL_TICKS`` ticks is skipped.
+
+    Returns ``{"hydrated", "cards", "skipped", "complete"}``. ``complete`` is
+    also true when the list ended with fewer cards than expected, because
+    result counts are approximate, but false when any card stayed unhydrated.
+    """
+    timeout = min(timeout, SCROLL_TIMEOUT)
+    if isinstance(driver, TabHandle):
+        return _scroll_in_ticks(driver, container, expected, timeout)
+    return driver.execute_async_script(
+        _SCROLL_UNTIL_HYDRATED_SCRIPT,
+        container,
+        JOB_CARD_SELECTOR,
+        CARD_METADATA_SELECTOR,
+        expected,
+        SCROLL_STEP_PX,
+        int(SCROLL_PAUSE * 1000),
+        SCROLL_SETTLE_TICKS,
+        SCROLL_STALL_TICKS,
+        int(timeout * 1000),
+    ) or {}
+
+
+def _scroll_in_ticks(driver, container, expected, timeout):
+    deadline = time.monotonic() + timeout
+    skip = stalled = stable = 0
+    last_hydrated = last_height = None
+    while True:
+        state = driver.execute_script(
+            _SCROLL_TICK_SCRIPT, container, JOB_CARD_SELECTOR, CARD_METADATA_SELECTOR, SCROLL_STEP_PX, skip
+        ) or {}
+        hydrated = state.get("hydrated", 0)
+        result = {"hydrated": hydrated, "cards": state.get("cards", 0), "skipped": skip, "complete": False}
+        if hydrated >= expected:
+            result["complete"] = True
+            return result
+        waiting = state.get("pending", 0) > skip
+        if waiting:
+            stalled = stalled + 1 if hydrated == last_hydrated else 0
+            if stalled >= SCROLL_STALL_TICKS:
+                skip += 1
+                stalled = 0
+        stable = stable + 1 if state.get("at_bottom") and not waiting and state.get("height") == last_height else 0
+        last_hydrated, last_height = hydrated, state.get("height")
+        if stable >= SCROLL_SETTLE_TICKS:
+            result["complete"] = not state.get("pending")
+            return result
+        if time.monotonic() >= deadline:
+            return result
+        time.sleep(SCROLL_PAUSE)
@@ -0,0 +1,85 @@
+import random
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff for one error class: base * factor ** (attempt - 1), capped at max_delay."""
+
+    base: float
+    factor: float = 2.0
+    max_delay: float = 300.0
+    jitter: float = 0.2
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base * self.factor ** max(0, attempt - 1))
+        return delay * (1 + random.uniform(0, self.jitter))
+
+
+def default_policies(base: float = 10.0) -> dict[str, RetryPolicy]:
+    return {
+        # slow pages usually mean throttling: give LinkedIn time to cool down
+        "timeout": RetryPolicy(base * 3, 2.0, base * 30),
+        # the pool boots a fresh browser for the next attempt anyway
+        "driver crash": RetryPolicy(1.0, 1.0, 1.0),
+        "webdriver": RetryPolicy(base, 2.0, base * 8),
+        "other": RetryPolicy(base, 2.0, base * 4),
+    }
+
+
+def classify_error(exc: BaseException, *, broken: bool = False) -> str:
+    if broken:
+        return "driver crash"
+    for error in (exc, exc.__cause__):
+        if isinstance(error, TimeoutException):
+            return "timeout"
+    for error in (exc, exc.__cause__):
+        if isinstance(error, WebDriverException):
+            return "webdriver"
+    return "other"
+
+
+class RetryScheduler:
+    """Decide whether and when a failed CrawlerJob runs again.
+
+    ``schedule`` returns the delay before the next attempt, or None once
+    ``max_attempts`` is reached. The caller parks the job in the Frontier,
+    which keeps parked jobs in a time-ordered heap and hands them out again
+    when due, so no worker sleeps through the backoff. Per error class it
+    counts failures, retries, give-ups and the total backoff for the report.
+    """
+
+    def __init__(self, policies: dict[str, RetryPolicy] | None = None, *, max_attempts: int = 3):
+        self.policies = policies or default_policies()
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"failures": 0, "retried": 0, "gave_up": 0, "delay": 0.0})
+
+    def schedule(self, job, error_class: str) -> float | None:
+        policy = self.policies.get(error_class, self.policies["other"])
+        with self._lock:
+            stats = self._stats[error_class]
+            stats["failures"] += 1
+            if job.attempts >= self.max_attempts:
+                stats["gave_up"] += 1
+                return None
+            delay = policy.delay(job.attempts)
+            stats["retried"] += 1
+            stats["delay"] += delay
+            return delay
+
+    def report(self) -> str:
+        with self._lock:
+            if not self._stats:
+                return "Retries: none"
+            lines = ["Retries:"]
+            for error_class, stats in sorted(self._stats.items(), key=lambda item: -item[1]["failures"]):
+                lines.append(
+                    f"  {error_class:<12} {stats['failures']:>5} failures, {stats['retried']:>5} retried, "
+                    f"{stats['gave_up']:>5} gave up, {stats['delay']:>7.0f}s total backoff"
+                )
+        return "\n".join(lines)
@@ -0,0 +1,219 @@
+import html
+import json
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from planner import PAGE_SIZE, simulated_count, synthetic_world
+from url_generator import canonical_query
+
+_TITLES = ("Software Engineer", "Data Engineer", "Data Center Technician", "Site Reliability Engineer", "Analyst")
+_COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+_CITIES = ("Austin, TX", "Dallas, TX", "San Jose, CA", "New York, NY", "Remote")
+
+_PAGE = """<!DOCTYPE html>
+<html><head><title>Jobs | Simulated LinkedIn</title>
+<style>div.scaffold-layout__list>div {{ height: 600px; overflow-y: auto; }} li.ember-view {{ height: 120px; }}</style>
+</head><body>
+<main id="main"><div class="scaffold-layout__list">
+<header><div class="jobs-search-results-list__subtitle"></div></header>
+<div><ul>{cards}</ul></div>
+</div></main>
+<script>
+const total = {total};
+const cards = {card_data};
+const lazy = {lazy};
+function render(li) {{
+    const job = cards[li.dataset.index];
+    li.querySelector("[data-job-id]").innerHTML =
+        '<div class="artdeco-entity-lockup__title"><a href="/jobs/view/' + job.id + '/"><span>' + job.title + '</span></a></div>' +
+        '<div class="artdeco-entity-lockup__subtitle">' + job.company + '</div>' +
+        '<div class="artdeco-entity-lockup__caption">' + job.location + '</div>' +
+        '<div class="artdeco-entity-lockup__metadata">' + job.metadata + '</div>';
+}}
+setTimeout(() => {{
+    document.querySelector(".jobs-search-results-list__subtitle").textContent =
+        total.toLocaleString("en-US") + " results";
+    const items = document.querySelectorAll("li.ember-view");
+    if (!lazy) {{ items.forEach(render); return; }}
+    // like LinkedIn, a card only renders its content once it scrolls into view
+    const observer = new IntersectionObserver(entries => entries.forEach(entry => {{
+        if (entry.isIntersecting) {{ render(entry.target); observer.unobserve(entry.target); }}
+    }}), {{root: document.querySelector("div.scaffold-layout__list>div")}});
+    items.forEach(li => observer.observe(li));
+}}, {hydrate_ms});
+</script>
+</body></html>
+"""
+
+
+@dataclass
+class SimulatorConfig:
+    seed: int = 7
+    min_total: int = 50  # result counts of unfiltered searches are drawn from this range
+    max_total: int = 20000
+    latency_ms: float = 300.0  # server time before a search page is sent
+    latency_jitter: float = 0.5  # +- fraction of latency_ms
+    hydrate_ms: float = 200.0  # client-side delay before the subtitle and cards render
+    lazy: bool = True  # cards render only when scrolled into view
+    failure_rate: float = 0.0  # share of search pages answered with HTTP 503
+    checkpoint_rate: float = 0.0  # share redirected to /checkpoint/challenge
+    slow_rate: float = 0.0  # share delayed by slow_seconds on top of the latency
+    slow_seconds: float = 30.0
+
+
+class LinkedInSimulator:
+    """Local stand-in for linkedin.com used by throughput benchmarks.
+
+    Serves ``/jobs/search/`` pages with the same structure the crawler reads:
+    ``main#main``, the results subtitle, ``li.ember-view`` cards under the
+    ``div.scaffold-layout__list>div`` scroller, and ``start=`` pagination
+    capped at 1000 results. Result counts follow planner.synthetic_world, so
+    ``f_*`` filters split a search the way they would on the real site.
+    Latency, lazy card rendering, HTTP failures, checkpoint redirects and
+    slow pages are configurable. ``/`` and ``/feed/`` set an ``li_at`` cookie,
+    so the crawler's login check passes. A location-only search redirects to
+    the same search with a stable ``geoId``, as LinkedIn does, so
+    geo_resolver.GeoResolver can run against the simulator.
+    """
+
+    def __init__(self, config: SimulatorConfig | None = None, *, host="127.0.0.1", port=0):
+        self.config = config or SimulatorConfig()
+        self.world = synthetic_world(self.config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.pages = 0
+        self.failures = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rebase(self, url: str) -> str:
+        """Point a linkedin.com URL at the simulator."""
+        parts = urllib.parse.urlsplit(url)
+        base = urllib.parse.urlsplit(self.base_url)
+        return urllib.parse.urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+    def start(self) -> "LinkedInSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="linkedin-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rng(self, key: str) -> random.Random:
+        # deterministic per query, independent of request order
+        return random.Random(zlib.crc32(f"{self.config.seed}:{key}".encode("utf-8")))
+
+    def geo_id(self, location: str) -> str:
+        return str(100_000_000 + zlib.crc32(location.encode("utf-8")) % 900_000_000)
+
+    def total(self, url: str) -> int:
+        params = urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query)
+        seed_params = [(k, v) for k, v in params if not k.startswith("f_") and k != "start"]
+        base_total = self._rng(canonical_query(seed_params)).randint(self.config.min_total, self.config.max_total)
+        return simulated_count(url, base_total, self.world)
+
+    def render_search(self, url: str) -> str:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        total = self.total(url)
+        start = int(params.get("start", 0))
+        shown = max(0, min(PAGE_SIZE, min(total, 1000) - start))
+        rng = self._rng(canonical_query(params.items(), drop=()))
+        cards = []
+        for index in range(shown):
+            cards.append({
+                "id": str(rng.randrange(3_000_000_000, 4_000_000_000)),
+                "title": html.escape(rng.choice(_TITLES)),
+                "company": html.escape(rng.choice(_COMPANIES)),
+                "location": html.escape(rng.choice(_CITIES)),
+                "metadata": f"{rng.randint(1, 30)} days ago",
+            })
+        items = "".join(
+            f'<li class="ember-view" data-index="{index}"><div><div data-job-id="{card["id"]}"></div></div></li>'
+            for index, card in enumerate(cards)
+        )
+        return _PAGE.format(
+            cards=items,
+            total=total,
+            card_data=json.dumps(cards),
+            lazy="true" if self.config.lazy else "false",
+            hydrate_ms=int(self.config.hydrate_ms),
+        )
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=()):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                config = simulator.config
+                path = urllib.parse.urlsplit(self.path).path
+                with simulator._lock:
+                    simulator.requests += 1
+                if path in ("/", "/feed/"):
+                    self._send(200, b"<html><body><main>feed</main></body></html>",
+                               headers=[("Set-Cookie", "li_at=simulated; Path=/")])
+                    return
+                if path.startswith("/checkpoint/"):
+                    self._send(200, b"<html><body>Security verification</body></html>")
+                    return
+                if not path.startswith("/jobs/search"):
+                    self._send(404, b"not found")
+                    return
+
+                rng = random.Random()
+                delay = config.latency_ms / 1000 * (1 + rng.uniform(-config.latency_jitter, config.latency_jitter))
+                if rng.random() < config.slow_rate:
+                    delay += config.slow_seconds
+                time.sleep(max(0.0, delay))
+                roll = rng.random()
+                if roll < config.failure_rate:
+                    with simulator._lock:
+                        simulator.failures += 1
+                    self._send(503, b"Service unavailable")
+                    return
+                if roll < config.failure_rate + config.checkpoint_rate:
+                    with simulator._lock:
+                        simulator.failures += 1
+                    self._send(302, headers=[("Location", "/checkpoint/challenge")])
+                    return
+                params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+                if set(params) == {"location"}:
+                    params["geoId"] = simulator.geo_id(params["location"])
+                    self._send(302, headers=[("Location", f"{path}?{urllib.parse.urlencode(params)}")])
+                    return
+                body = simulator.render_search(self.path).encode("utf-8")
+                with simulator._lock:
+                    simulator.pages += 1
+                self._send(200, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,161 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+
+_STOP = object()
+# how often a producer blocked on a full queue checks that the writer is still running
+_PUT_POLL = 0.5
+
+
+def run_callbacks(callbacks):
+    """Call the ``on_durable`` callbacks of records that are now on disk, from the writer thread."""
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as exc:  # noqa: BLE001
+            print(f"on_durable callback failed: {exc}")
+
+
+class JsonlSink:
+    """Append result records as compact JSON lines from a background writer thread.
+
+    ``write`` only enqueues the record (the queue is bounded, so memory stays
+    constant however long the run is). The writer thread fsyncs every
+    ``fsync_every`` records or ``fsync_interval`` seconds, whichever comes
+    first, and starts a new part file once the current one reaches
+    ``max_bytes``. Parts are named ``<stem>-00000<suffix>``; a new sink never
+    overwrites existing parts, so a resumed run keeps the earlier output.
+
+    ``write(record, on_durable)`` calls ``on_durable()`` from the writer
+    thread after the fsync that covers the record; it is never called for
+    records lost to a writer failure.
+    """
+
+    def __init__(
+        self,
+        path="results.jsonl",
+        *,
+        fsync_every=100,
+        fsync_interval=5.0,
+        max_bytes=256 * 1024 * 1024,
+        max_pending=1000,
+    ):
+        self.base_path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.records_written = 0
+        self.parts: list[Path] = []
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._part_index = self._next_part_index()
+        self._file = None
+        self._unsynced_callbacks = []
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="jsonl-sink", daemon=True)
+        self._thread.start()
+
+    def _next_part_index(self):
+        pattern = re.compile(re.escape(self.base_path.stem) + r"-(\d+)" + re.escape(self.base_path.suffix) + "$")
+        directory = self.base_path.parent
+        indexes = [
+            int(match.group(1))
+            for match in (pattern.match(p.name) for p in directory.glob(f"{self.base_path.stem}-*"))
+            if match
+        ]
+        return max(indexes) + 1 if indexes else 0
+
+    def _part_path(self):
+        return self.base_path.with_name(f"{self.base_path.stem}-{self._part_index:05d}{self.base_path.suffix}")
+
+    def _open_next_part(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._part_index += 1
+        path = self._part_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self.parts.append(path)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        callbacks, self._unsynced_callbacks = self._unsynced_callbacks, []
+        run_callbacks(callbacks)
+
+    def _run(self):
+        unsynced = 0
+        last_sync = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.fsync_interval)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if isinstance(item, threading.Event):
+                    # flush(): everything queued before the marker is written; sync it now
+                    if self._file is not None and unsynced:
+                        self._sync()
+                        unsynced = 0
+                        last_sync = time.monotonic()
+                    item.set()
+                    continue
+                record, on_durable = item or (None, None)
+                if record is not None:
+                    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                    data_size = len(line.encode("utf-8"))
+                    if self._file is None or (self._file.tell() and self._file.tell() + data_size > self.max_bytes):
+                        self._open_next_part()
+                    self._file.write(line)
+                    if on_durable is not None:
+                        self._unsynced_callbacks.append(on_durable)
+                    self.records_written += 1
+                    unsynced += 1
+                now = time.monotonic()
+                if unsynced and (unsynced >= self.fsync_every or now - last_sync >= self.fsync_interval):
+                    self._sync()
+                    unsynced = 0
+                    last_sync = now
+        except Exception as exc:  # noqa: BLE001
+            self._error = exc
+            print(f"JsonlSink writer stopped: {exc}")
+        finally:
+            if self._file is not None:
+                if self._error is None:
+                    self._sync()
+                self._file.close()
+
+    def _put(self, item):
+        # nothing drains the queue once the writer thread has died
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=_PUT_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def write(self, record, on_durable=None):
+        if self._error is not None or not self._put((record, on_durable)):
+            raise RuntimeError("result writer failed") from self._error
+
+    def flush(self):
+        """Block until every record written so far is fsynced and its ``on_durable`` has run."""
+        done = threading.Event()
+        if self._error is None and self._put(done):
+            while not done.wait(_PUT_POLL) and self._thread.is_alive():
+                pass
+        if self._error is not None:
+            raise RuntimeError("result writer failed") from self._error
+
+    def close(self):
+        self._put(_STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("result writer failed") from self._error
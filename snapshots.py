@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots (url, crawled_at);
+CREATE INDEX IF NOT EXISTS snapshots_crawled_at ON snapshots (crawled_at);
+"""
+
+
+class SnapshotStore:
+    """Content-addressed store of raw ``main#main`` HTML.
+
+    Each distinct page body is gzipped once under ``objects/<aa>/<sha256>.html.gz``.
+    A SQLite index (``index.db``) records every capture as (url, crawled_at,
+    digest), so re-crawling an unchanged page adds an index row and no blob.
+    Index rows are committed every ``commit_every`` captures or
+    ``commit_interval`` seconds; a crash loses at most those rows, never a
+    blob they point to.
+    """
+
+    def __init__(self, root="snapshots", *, compresslevel=6, commit_every=100, commit_interval=5.0):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / "index.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._writes = 0
+        self._last_commit = time.monotonic()
+        self.captured = 0
+        self.bytes_stored = 0
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.html.gz"
+
+    def put(self, url: str, html: str, crawled_at: float | None = None) -> str:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # write then rename, so a crash never leaves a truncated blob under a valid digest
+            temp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp.write_bytes(gzip.compress(data, compresslevel=self.compresslevel))
+            os.replace(temp, path)
+            stored = path.stat().st_size
+        else:
+            stored = 0
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO snapshots (url, crawled_at, digest, size) VALUES (?, ?, ?, ?)",
+                (url, time.time() if crawled_at is None else crawled_at, digest, len(data)),
+            )
+            self._maybe_commit()
+            self.captured += 1
+            self.bytes_stored += stored
+        return digest
+
+    def _maybe_commit(self):
+        self._writes += 1
+        now = time.monotonic()
+        if self._writes >= self.commit_every or now - self._last_commit >= self.commit_interval:
+            self._conn.commit()
+            self._writes = 0
+            self._last_commit = now
+
+    def get(self, digest: str) -> str:
+        return gzip.decompress(self.blob_path(digest).read_bytes()).decode("utf-8")
+
+    def iter_index(self, *, since: float | None = None, latest_only: bool = False):
+        """Yield (url, crawled_at, digest) rows, oldest first; ``latest_only`` keeps each URL's newest capture."""
+        query = "SELECT url, crawled_at, digest FROM snapshots WHERE crawled_at >= ?"
+        if latest_only:
+            query = (
+                "SELECT url, MAX(crawled_at), digest FROM snapshots WHERE crawled_at >= ? GROUP BY url"
+            )
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY 2", (since or 0.0,)).fetchall()
+        yield from rows
+
+    def summary(self) -> str:
+        return f"Snapshots: {self.captured} pages captured, {self.bytes_stored / (1024 * 1024):.1f} MB of new blobs in {self.root}"
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def _reparse(task):
+    # runs in a worker process: decompress and parse one snapshot with lxml
+    from page_parser import parse_html, parse_job_cards
+
+    blob, url, crawled_at = task
+    document = parse_html(gzip.decompress(Path(blob).read_bytes()).decode("utf-8"))
+    return {"url": url, "crawled_at": crawled_at, "jobs": parse_job_cards(document, base_url=url)}
+
+
+def reparse(store: SnapshotStore, sink, *, workers=None, since=None, latest_only=True, chunksize=16) -> int:
+    """Run job card extraction over stored snapshots on every CPU core; returns pages written to ``sink``."""
+    tasks = (
+        (str(store.blob_path(digest)), url, crawled_at)
+        for url, crawled_at, digest in store.iter_index(since=since, latest_only=latest_only)
+    )
+    pages = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for record in executor.map(_reparse, tasks, chunksize=chunksize):
+            if record["jobs"]:
+                sink.write(record)
+                pages += 1
+    return pages
+
+
+if __name__ == "__main__":
+    from sink import JsonlSink
+
+    parser = argparse.ArgumentParser(description="Re-extract job cards from stored page snapshots")
+    parser.add_argument("--store", type=str, default="snapshots", help="Snapshot directory written by main.py --snapshot-dir")
+    parser.add_argument("-o", "--output", type=str, default="reparsed.jsonl", help="Base name for the JSONL output parts")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--since", type=float, default=None, help="Only snapshots captured at or after this Unix time")
+    parser.add_argument("--all-captures", action="store_true", help="Parse every capture instead of each URL's latest")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = SnapshotStore(args.store)
+    sink = JsonlSink(args.output)
+    try:
+        pages = reparse(store, sink, workers=args.workers, since=args.since, latest_only=not args.all_captures)
+    finally:
+        sink.close()
+        store.close()
+    elapsed = time.perf_counter() - started
+    print(f"Re-parsed {pages} pages in {elapsed:.1f}s ({pages / elapsed if elapsed else 0:.0f} pages/s)")
+    print(f"Results written to {', '.join(str(p) for p in sink.parts) or '(nothing)'}")
+# Example usage:
+# python snapshots.py --store snapshots -o reparsed.jsonl --workers 8
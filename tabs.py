@@ -0,0 +1,109 @@
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+# Background tabs must keep running timers and rendering, or LinkedIn's cards never hydrate
+TAB_CHROME_ARGUMENTS = (
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+)
+
+NAVIGATION_POLL = 0.1
+
+
+class BrowserTabs:
+    """One Chrome instance whose window handles are driven from several threads.
+
+    WebDriver talks to one window at a time, so every command takes ``lock``
+    and switches to its tab first. The browser must use
+    ``pageLoadStrategy="none"``. Then ``driver.get`` only starts the
+    navigation, and the lock is free while the page loads. Other tabs' loads
+    and readiness polls overlap with it.
+    """
+
+    def __init__(self, driver, tabs, *, page_load_timeout=None):
+        self.driver = driver
+        self.lock = threading.RLock()
+        if page_load_timeout is None:
+            try:
+                page_load_timeout = driver.timeouts.page_load
+            except (AttributeError, WebDriverException):
+                page_load_timeout = 60.0
+        self.page_load_timeout = page_load_timeout or 60.0
+        handles = [driver.current_window_handle]
+        for _ in range(tabs - 1):
+            driver.switch_to.new_window("tab")
+            handles.append(driver.current_window_handle)
+        self.current = handles[-1]
+        self.handles = [TabHandle(self, handle) for handle in handles]
+
+
+class TabHandle:
+    """Driver-like view of one tab, usable wherever the crawler expects a driver.
+
+    Attribute access and method calls are forwarded to the underlying driver
+    while holding the browser lock with this tab selected. Returned
+    WebElements are re-parented onto the TabHandle, so element commands
+    (``find_element``, ``text``, ``get_attribute``, ActionChains, WebDriverWait
+    conditions) are routed to the right tab too.
+    """
+
+    def __init__(self, browser: BrowserTabs, handle: str):
+        self.browser = browser
+        self.handle = handle
+
+    def _select(self):
+        if self.browser.current != self.handle:
+            self.browser.driver.switch_to.window(self.handle)
+            self.browser.current = self.handle
+
+    def _wrap(self, value):
+        if isinstance(value, WebElement):
+            return value if value.parent is self else WebElement(self, value.id)
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def __getattr__(self, name):
+        with self.browser.lock:
+            self._select()
+            attribute = getattr(self.browser.driver, name)
+        if not callable(attribute):
+            return self._wrap(attribute)
+
+        def call(*args, **kwargs):
+            with self.browser.lock:
+                self._select()
+                return self._wrap(attribute(*args, **kwargs))
+
+        return call
+
+    def _navigate(self, start, description):
+        with self.browser.lock:
+            self._select()
+            origin = self.browser.driver.execute_script("return performance.timeOrigin;")
+            start()
+        deadline = time.monotonic() + self.browser.page_load_timeout
+        while True:
+            with self.browser.lock:
+                self._select()
+                time_origin, ready_state = self.browser.driver.execute_script(
+                    "return [performance.timeOrigin, document.readyState];"
+                )
+            # a new document has a new timeOrigin; wait for it to finish loading
+            if time_origin != origin and ready_state == "complete":
+                return
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"Tab page load timed out: {description}")
+            time.sleep(NAVIGATION_POLL)
+
+    def get(self, url):
+        self._navigate(lambda: self.browser.driver.get(url), url)
+
+    def refresh(self):
+        self._navigate(self.browser.driver.refresh, "refresh")
@@ -0,0 +1,42 @@
+import functools
+import json
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urljoin
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# the crawler modules live at the repository root
+sys.path.insert(0, str(ROOT))
+
+
+def expected_jobs(name: str, base_url: str) -> list[dict]:
+    """Field values the browser reads from ``fixtures/<name>.html`` (``fixtures/<name>.json``) loaded from ``base_url``.
+
+    ``job_url`` is stored as written in the page and resolved here, as ``get_attribute("href")`` does.
+    The JSON is written by the in-browser extraction script, not by hand:
+    ``python benchmark.py parity tests/fixtures/<name>.html --write-expected``.
+    """
+    jobs = json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+    return [{**job, "job_url": urljoin(base_url, job["job_url"])} for job in jobs]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def fixture_server():
+    """Base URL of a local HTTP server serving the saved pages in tests/fixtures."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(FIXTURES)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,54 @@
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from columnar import ParquetSink
+
+TEXAS = "https://www.linkedin.com/jobs/search/?keywords=data+center&location=Texas%2C+United+States"
+OHIO = "https://www.linkedin.com/jobs/search/?keywords=data+center&location=Ohio%2C+United+States"
+
+
+def _record(url, *ids):
+    return {"url": url, "jobs": [{"job_id": job_id} for job_id in ids]}
+
+
+def _row_groups(path):
+    metadata = pq.ParquetFile(path).metadata
+    return [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+
+
+def test_rows_are_written_in_full_row_groups_of_few_parts(tmp_path):
+    sink = ParquetSink(tmp_path, row_group_size=3, part_rows=7, part_interval=3600)
+    for i in range(5):
+        sink.write(_record(TEXAS, f"{i}a", f"{i}b"))
+    sink.close()
+
+    assert [_row_groups(path) for path in sink.parts] == [[3, 3, 2], [2]]
+    table = ds.dataset(tmp_path, partitioning="hive").to_table()
+    assert table.num_rows == 10
+    assert set(table.column("state").to_pylist()) == {"Texas"}
+
+
+def test_on_durable_runs_when_the_part_is_closed(tmp_path):
+    durable = []
+    sink = ParquetSink(tmp_path, part_interval=3600)
+    sink.write(_record(TEXAS, "1"), on_durable=lambda: durable.append("texas"))
+    sink.write(_record(OHIO, "2"), on_durable=lambda: durable.append("ohio"))
+    sink.write(_record(OHIO), on_durable=lambda: durable.append("empty"))
+
+    # open parts are hidden temporary files: nothing is durable or visible yet
+    assert durable == ["empty"]
+    assert not list(tmp_path.rglob("part-*.parquet"))
+
+    sink.flush()
+    assert sorted(durable) == ["empty", "ohio", "texas"]
+    assert len(list(tmp_path.rglob("part-*.parquet"))) == 2
+    sink.close()
+
+
+def test_new_sink_appends_parts(tmp_path):
+    for job_id in ("1", "2"):
+        sink = ParquetSink(tmp_path)
+        sink.write(_record(TEXAS, job_id))
+        sink.close()
+
+    assert sorted(path.name for path in tmp_path.rglob("part-*.parquet")) == ["part-00000.parquet", "part-00001.parquet"]
@@ -0,0 +1,80 @@
+import pytest
+
+from crawler import CrawlerResult, result_router
+from depulicate import DedupIndex, JobDeduplicator
+from metrics import metrics
+
+PAGE = "https://www.linkedin.com/jobs/search/?keywords=data+center&start=0"
+
+
+class _Sink:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.records = []
+        self.callbacks = []
+
+    def write(self, record, on_durable=None):
+        if self.fail:
+            raise RuntimeError("result writer failed")
+        self.records.append(record)
+        self.callbacks.append(on_durable)
+
+
+def _jobs(*ids):
+    return [{"job_id": job_id} for job_id in ids]
+
+
+def test_filter_reserves_keys_until_confirmed():
+    dedup = JobDeduplicator()
+
+    assert dedup.filter(PAGE, _jobs("1", "2")) == _jobs("1", "2")
+    # a page in flight at the same time does not get them again
+    assert dedup.filter(PAGE, _jobs("2", "3")) == _jobs("3")
+    assert len(dedup.index) == 0
+
+    dedup.confirm(_jobs("1", "2"))
+    assert len(dedup.index) == 2
+    assert dedup.filter(PAGE, _jobs("1")) == []
+
+
+def test_released_keys_are_kept_on_retry():
+    dedup = JobDeduplicator()
+    dedup.filter(PAGE, _jobs("1", "2"))
+    dedup.release(_jobs("1", "2"))
+
+    assert dedup.filter(PAGE, _jobs("1", "2")) == _jobs("1", "2")
+
+
+def test_router_records_keys_only_when_the_sink_made_them_durable():
+    dedup = JobDeduplicator(DedupIndex())
+    sink = _Sink()
+
+    result_router(CrawlerResult(PAGE, _jobs("1", "2"), "detail"), None, sink, dedup)
+    assert sink.records == [{"url": PAGE, "jobs": _jobs("1", "2")}]
+    assert len(dedup.index) == 0
+
+    sink.callbacks[0]()
+    assert len(dedup.index) == 2
+
+
+def test_router_releases_keys_when_the_write_fails():
+    dedup = JobDeduplicator()
+
+    with pytest.raises(RuntimeError):
+        result_router(CrawlerResult(PAGE, _jobs("1"), "detail"), None, _Sink(fail=True), dedup)
+
+    sink = _Sink()
+    result_router(CrawlerResult(PAGE, _jobs("1"), "detail"), None, sink, dedup)
+    assert sink.records == [{"url": PAGE, "jobs": _jobs("1")}]
+
+
+def test_router_counts_only_the_cards_handed_to_the_sink():
+    def cards_total():
+        return sum(value for (name, _), value in metrics._counters.items() if name == "crawler_cards_total")
+
+    dedup = JobDeduplicator()
+    dedup.filter(PAGE, _jobs("1"))
+    before = cards_total()
+
+    result_router(CrawlerResult(PAGE, _jobs("1", "2", "3"), "detail"), None, _Sink(), dedup)
+    assert cards_total() - before == 2
@@ -0,0 +1,49 @@
+import queue
+import sqlite3
+
+import pytest
+
+from crawler import CrawlerJob, linkedin_job_crawler
+from frontier import Frontier
+
+URL = "https://www.linkedin.com/jobs/search/?keywords=data+center&start=0"
+
+
+def _status(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT status FROM jobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_job_awaiting_the_sink_is_done_only_once_complete(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    frontier = Frontier(path, commit_every=1)
+    frontier.put(CrawlerJob(URL, linkedin_job_crawler))
+    job = frontier.get()
+
+    frontier.await_sink(job)
+    # the crawl is finished for the workers while the sink still buffers the results
+    frontier.join()
+    with pytest.raises(queue.Empty):
+        frontier.get(timeout=0.1)
+    assert _status(path) == "in_progress"
+
+    frontier.complete(job)
+    frontier.close()
+    assert _status(path) == "done"
+
+
+def test_job_whose_results_never_became_durable_is_crawled_again(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    frontier = Frontier(path, commit_every=1)
+    frontier.put(CrawlerJob(URL, linkedin_job_crawler))
+    frontier.await_sink(frontier.get())
+    frontier.close()  # the process died before the sink's fsync
+
+    resumed = Frontier(path, resume=True)
+    try:
+        assert resumed.get(timeout=0.1).url == URL
+    finally:
+        resumed.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from geo_resolver import GeoResolver
+from simulator import LinkedInSimulator, SimulatorConfig
+
+TEXAS = "Texas, United States"
+LABELS = [TEXAS, "Ohio, United States", "Utah, United States", "Iowa, United States", "Maine, United States"]
+
+
+@pytest.fixture
+def simulator():
+    with LinkedInSimulator(SimulatorConfig(latency_ms=50)) as simulator:
+        yield simulator
+
+
+def _resolver(tmp_path, base_url, **kwargs):
+    return GeoResolver(tmp_path / "geo_cache.json", cookies_file=str(tmp_path / "cookies.pkl"), base_url=base_url, **kwargs)
+
+
+def test_misses_are_resolved_concurrently_and_cached(tmp_path, simulator):
+    resolver = _resolver(tmp_path, simulator.base_url, workers=4)
+    try:
+        geo_ids = resolver.resolve_many(LABELS + [TEXAS])
+    finally:
+        resolver.close()
+
+    assert geo_ids == {label: simulator.geo_id(label) for label in LABELS}
+    assert (resolver.resolved, resolver.failed) == (len(LABELS), 0)
+    assert json.loads((tmp_path / "geo_cache.json").read_text()) == geo_ids
+
+
+def test_cached_labels_are_not_requested(tmp_path, simulator):
+    (tmp_path / "geo_cache.json").write_text(json.dumps({TEXAS: "102748797"}))
+    resolver = _resolver(tmp_path, simulator.base_url)
+    try:
+        geo_ids = resolver.resolve_many([TEXAS, "Ohio, United States"])
+    finally:
+        resolver.close()
+
+    assert geo_ids == {TEXAS: "102748797", "Ohio, United States": simulator.geo_id("Ohio, United States")}
+    # one redirect and its target for the miss, nothing for the hit
+    assert simulator.requests == 2
+    assert resolver.resolved == 1
+
+
+def test_failed_label_is_left_out_and_not_cached(tmp_path):
+    (tmp_path / "geo_cache.json").write_text(json.dumps({TEXAS: "102748797"}))
+    with LinkedInSimulator(SimulatorConfig(latency_ms=0, checkpoint_rate=1.0)) as simulator:
+        resolver = _resolver(tmp_path, simulator.base_url)
+        try:
+            geo_ids = resolver.resolve_many([TEXAS, "Ohio, United States"])
+        finally:
+            resolver.close()
+
+    assert geo_ids == {TEXAS: "102748797"}
+    assert (resolver.resolved, resolver.failed) == (0, 1)
+    assert json.loads((tmp_path / "geo_cache.json").read_text()) == {TEXAS: "102748797"}
@@ -0,0 +1,128 @@
+import pytest
+
+import crawler
+from conftest import expected_jobs
+from crawler import CrawlerResult
+from http_fetch import RateLimited, is_challenge_url
+from page_parser import parse_job_cards
+from simulator import LinkedInSimulator, SimulatorConfig
+from snapshots import SnapshotStore
+
+
+@pytest.fixture
+def browser_fallback(monkeypatch, tmp_path):
+    """Replace the Selenium crawler with a recorder; HTTP fetches use a fresh, cookie-less fetcher."""
+    calls = []
+
+    def fake_job_crawler(driver, url, time_sleep=1, wait_time=10):
+        calls.append(url)
+        return CrawlerResult(url, [{"job_id": "from-browser"}], "detail")
+
+    monkeypatch.setattr(crawler, "linkedin_job_crawler", fake_job_crawler)
+    monkeypatch.setitem(crawler._options, "http_cookies_file", str(tmp_path / "cookies.pkl"))
+    return calls
+
+
+def test_http_page_gives_detail_result(fixture_server, browser_fallback):
+    url = f"{fixture_server}/search_results.html?keywords=data+center&start=0"
+
+    result = crawler.linkedin_http_job_crawler(None, url)
+
+    assert isinstance(result, CrawlerResult)
+    assert (result.url, result.crawler_type) == (url, "detail")
+    assert result.data == expected_jobs("search_results", url)
+    assert browser_fallback == []
+
+
+def test_login_page_falls_back_to_browser(fixture_server, browser_fallback):
+    url = f"{fixture_server}/login_wall.html?keywords=data+center"
+
+    result = crawler.linkedin_http_job_crawler("driver", url)
+
+    assert browser_fallback == [url]
+    assert result.data == [{"job_id": "from-browser"}]
+
+
+def test_checkpoint_redirect_falls_back_to_browser(browser_fallback):
+    config = SimulatorConfig(latency_ms=0, checkpoint_rate=1.0)
+    with LinkedInSimulator(config) as simulator:
+        url = f"{simulator.base_url}/jobs/search/?keywords=data+center"
+        result = crawler.linkedin_http_job_crawler("driver", url)
+
+    assert browser_fallback == [url]
+    assert result.crawler_type == "detail"
+
+
+def test_page_without_cards_falls_back_to_browser(browser_fallback):
+    # the simulator renders cards client-side, like LinkedIn's shell page without server-rendered cards
+    with LinkedInSimulator(SimulatorConfig(latency_ms=0)) as simulator:
+        url = f"{simulator.base_url}/jobs/search/?keywords=data+center"
+        crawler.linkedin_http_job_crawler("driver", url)
+
+    assert browser_fallback == [url]
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.linkedin.com/jobs/search/?keywords=login+challenge+engineer", False),
+        ("https://www.linkedin.com/jobs/search/?keywords=captcha&redirect=/login", False),
+        ("https://www.linkedin.com/login?session_redirect=%2Fjobs%2F", True),
+        ("https://www.linkedin.com/uas/login", True),
+        ("https://www.linkedin.com/checkpoint/challenge/AgE", True),
+        ("https://www.linkedin.com/authwall?trk=jobs", True),
+    ],
+)
+def test_challenge_url_matches_the_path_only(url, expected):
+    assert is_challenge_url(url) is expected
+
+
+def test_rate_limited_fetch_slows_down_and_retries(monkeypatch, browser_fallback):
+    class Limiter:
+        def __init__(self):
+            self.acquired, self.reasons = 0, []
+
+        def acquire(self):
+            self.acquired += 1
+
+        def throttled(self, reason):
+            self.reasons.append(reason)
+
+    class Fetcher:
+        def __init__(self, responses):
+            self.responses = responses
+
+        def fetch_page(self, url):
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return None, response
+
+    limiter = Limiter()
+    monkeypatch.setitem(crawler._options, "rate_limiter", limiter)
+    fetcher = Fetcher([RateLimited("HTTP 429"), [{"job_id": "1"}]])
+    monkeypatch.setattr(crawler, "get_fetcher", lambda cookies_file: fetcher)
+
+    result = crawler.linkedin_http_job_crawler("driver", "https://www.linkedin.com/jobs/search/?keywords=x")
+
+    assert result.data == [{"job_id": "1"}]
+    assert (limiter.acquired, limiter.reasons) == (2, ["http 429"])
+    assert browser_fallback == []
+
+    fetcher.responses = [RateLimited("HTTP 429")] * (crawler.HTTP_RATE_LIMIT_RETRIES + 1)
+    with pytest.raises(RuntimeError):
+        crawler.linkedin_http_job_crawler("driver", "https://www.linkedin.com/jobs/search/?keywords=x")
+    assert browser_fallback == []
+
+
+def test_http_page_is_snapshotted(fixture_server, browser_fallback, monkeypatch, tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots")
+    monkeypatch.setitem(crawler._options, "snapshot_store", store)
+    url = f"{fixture_server}/search_results.html?keywords=data+center&start=0"
+
+    result = crawler.linkedin_http_job_crawler(None, url)
+
+    [(snapshot_url, _, digest)] = store.iter_index()
+    store.close()
+    assert snapshot_url == url
+    assert parse_job_cards(store.get(digest), base_url=url) == result.data
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from normalize import FLAGS, normalize_jobs
+
+
+def _normalize_one(location=None, metadata=None) -> dict:
+    row = normalize_jobs(pd.DataFrame({"job_location": [location], "job_metadata": [metadata]})).iloc[0]
+    return {name: None if pd.isna(value) else value for name, value in row.items()}
+
+
+@pytest.mark.parametrize(
+    "location, city, state_code, place, work_mode",
+    [
+        ("Austin, TX (On-site)", "Austin", "TX", None, "On-site"),
+        ("Austin, Texas, United States (Hybrid)", "Austin", "TX", None, "Hybrid"),
+        ("Washington, DC", "Washington", "DC", None, None),
+        ("Texas, United States", None, "TX", None, None),
+        ("New York (Remote)", None, "NY", None, "Remote"),
+        ("United States (Remote)", None, None, None, "Remote"),
+        ("Dallas-Fort Worth Metroplex (On-site)", None, None, "Dallas-Fort Worth Metroplex", "On-site"),
+        ("San Francisco Bay Area", None, None, "San Francisco Bay Area", None),
+        ("London, England, United Kingdom (Remote)", None, None, "London, England, United Kingdom", "Remote"),
+        ("Toronto, ON", "Toronto", None, "Toronto, ON", None),
+        ("", None, None, None, None),
+        (None, None, None, None, None),
+    ],
+)
+def test_location(location, city, state_code, place, work_mode):
+    row = _normalize_one(location=location)
+    assert (row["city"], row["state_code"], row["place"], row["work_mode"]) == (city, state_code, place, work_mode)
+
+
+@pytest.mark.parametrize(
+    "metadata, salary_min, salary_max, salary_period",
+    [
+        ("$120K/yr - $150K/yr\n401(k)", 120_000, 150_000, "year"),
+        ("$45/hr", 45, 45, "hour"),
+        ("$90,000/yr", 90_000, 90_000, "year"),
+        ("$5K/mo", 5_000, 5_000, "month"),
+        ("$60 - $75/hr", 60, 75, "hour"),
+        ("401(k)", None, None, None),
+        (None, None, None, None),
+    ],
+)
+def test_salary(metadata, salary_min, salary_max, salary_period):
+    row = _normalize_one(metadata=metadata)
+    assert (row["salary_min"], row["salary_max"], row["salary_period"]) == (salary_min, salary_max, salary_period)
+
+
+@pytest.mark.parametrize(
+    "metadata, applicants, applicants_over",
+    [
+        ("Over 200 applicants", 200, True),
+        ("1,204 applicants", 1204, False),
+        ("1 applicant", 1, False),
+        ("Actively reviewing applicants", None, False),
+    ],
+)
+def test_applicants(metadata, applicants, applicants_over):
+    row = _normalize_one(metadata=metadata)
+    assert (row["applicants"], row["applicants_over"]) == (applicants, applicants_over)
+
+
+def test_flags():
+    row = _normalize_one(metadata="Promoted\nEasy Apply\nActively reviewing applicants")
+    assert {name: row[name] for name in FLAGS} == {
+        "promoted": True,
+        "easy_apply": True,
+        "actively_reviewing": True,
+        "early_applicant": False,
+    }
+
+
+def test_rows_keep_their_index_and_order():
+    frame = pd.DataFrame(
+        {"job_location": ["Ohio", "Austin, TX", "Ohio"], "job_metadata": ["$1/hr", None, "$2/hr"]},
+        index=[10, 5, 7],
+    )
+    normalized = normalize_jobs(frame)
+    assert list(normalized.index) == [10, 5, 7]
+    assert list(normalized["state_code"]) == ["OH", "TX", "OH"]
+    assert list(normalized["salary_min"]) == [1, pd.NA, 2]
@@ -0,0 +1,70 @@
+import os
+import signal
+
+import pytest
+
+from conftest import FIXTURES, expected_jobs
+from page_parser import ParserPool, _text, parse_html, parse_job_cards, parse_number_results
+from utils import JOB_FIELD_SELECTORS
+
+BASE_URL = "https://www.linkedin.com/jobs/search/?keywords=data+center"
+
+
+@pytest.fixture(scope="module")
+def search_html():
+    return (FIXTURES / "search_results.html").read_text(encoding="utf-8")
+
+
+def test_job_cards_match_browser_fields(search_html):
+    jobs = parse_job_cards(search_html, base_url=BASE_URL)
+
+    assert jobs == expected_jobs("search_results", BASE_URL)
+    assert all(list(job) == list(JOB_FIELD_SELECTORS) for job in jobs)
+
+
+def test_number_results(search_html):
+    assert parse_number_results(search_html) == 1234
+
+
+def test_page_without_main_has_no_cards():
+    login = (FIXTURES / "login_wall.html").read_text(encoding="utf-8")
+    assert parse_job_cards(login) == []
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ("<div>  Data   Center\n   Technician </div>", "Data Center Technician"),
+        ("<div>Globex<script>track('x');</script><style>p{}</style></div>", "Globex"),
+        ('<div>Dallas, TX<span style="display: none">Metroplex</span></div>', "Dallas, TX"),
+        ('<div>Austin<span style="visibility:hidden"> hidden</span></div>', "Austin"),
+        ("<div>Promoted<span hidden>Viewed</span></div>", "Promoted"),
+        ("<div>Promoted<br>Easy Apply</div>", "Promoted\nEasy Apply"),
+        ("<div><ul><li>$90K/yr</li><li>401(k)</li></ul></div>", "$90K/yr\n401(k)"),
+        ("<div><span>Acme</span> <span>Corp</span><!-- ad --></div>", "Acme Corp"),
+        ("<div><p></p><p>  </p>Remote</div>", "Remote"),
+    ],
+)
+def test_text_follows_inner_text(html, expected):
+    assert _text(parse_html(html)) == expected
+
+
+def test_parser_pool_matches_inline(search_html):
+    pool = ParserPool(2)
+    try:
+        assert pool.parse_job_cards(search_html, base_url=BASE_URL) == parse_job_cards(search_html, base_url=BASE_URL)
+    finally:
+        pool.close()
+
+
+def test_parser_pool_survives_crashed_processes(search_html):
+    expected = parse_job_cards(search_html, base_url=BASE_URL)
+    pool = ParserPool(2)
+    try:
+        for _ in range(2):
+            # a child killed mid-crawl breaks the executor for every later submit
+            os.kill(pool._executor.submit(os.getpid).result(), signal.SIGKILL)
+            assert pool.parse_job_cards(search_html, base_url=BASE_URL) == expected
+        assert pool.inline_parses == 1
+    finally:
+        pool.close()
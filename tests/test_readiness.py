@@ -0,0 +1,25 @@
+import pytest
+
+from readiness import ReadinessPolicy, is_ready
+
+LOADED = {"main": True, "subtitle": True, "no_results": False, "cards": 25, "hydrated": 25, "resources": 300}
+
+
+@pytest.mark.parametrize(
+    "state, policy, stable_polls, content_ready_for, expected",
+    [
+        # the hydrated cards are enough; a busy network does not hold the page back
+        ({**LOADED, "idle_ms": 0}, ReadinessPolicy(min_cards=7), 0, 0.0, True),
+        ({**LOADED, "hydrated": 6, "idle_ms": 5000}, ReadinessPolicy(min_cards=7), 3, 0.0, False),
+        ({**LOADED, "no_results": True, "cards": 0, "hydrated": 0, "idle_ms": 0}, ReadinessPolicy(min_cards=7), 0, 0.0, True),
+        ({**LOADED, "subtitle": False, "idle_ms": 5000}, ReadinessPolicy(), 3, 0.0, False),
+        # without min_cards the network should settle, but only for idle_grace seconds
+        ({**LOADED, "idle_ms": 100}, ReadinessPolicy(), 3, 0.5, False),
+        ({**LOADED, "idle_ms": 600}, ReadinessPolicy(), 0, 0.5, False),
+        ({**LOADED, "idle_ms": 600}, ReadinessPolicy(), 1, 0.5, True),
+        ({**LOADED, "idle_ms": 100}, ReadinessPolicy(), 0, 1.0, True),
+        ({"main": False}, ReadinessPolicy(), 3, 5.0, False),
+    ],
+)
+def test_is_ready(state, policy, stable_polls, content_ready_for, expected):
+    assert is_ready(state, policy, stable_polls, content_ready_for) is expected
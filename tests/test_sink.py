@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from sink import JsonlSink
+
+
+def test_records_are_written_as_lines(tmp_path):
+    sink = JsonlSink(tmp_path / "results.jsonl")
+    sink.write({"url": "u1", "jobs": [{"job_id": "1"}]})
+    sink.write({"url": "u2", "jobs": []})
+    sink.close()
+
+    lines = (tmp_path / "results-00000.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == ["u1", "u2"]
+    assert sink.records_written == 2
+
+
+def test_failed_writer_does_not_block_producers(tmp_path):
+    sink = JsonlSink(tmp_path / "results.jsonl", max_pending=1)
+    sink.write({"url": "u", "jobs": [object()]})  # not JSON serializable: the writer thread stops
+
+    with pytest.raises(RuntimeError):
+        for _ in range(10):
+            sink.write({"url": "u", "jobs": []})
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+
+def test_on_durable_runs_for_every_synced_record(tmp_path):
+    durable = []
+    sink = JsonlSink(tmp_path / "results.jsonl", fsync_every=2, fsync_interval=60)
+    sink.write({"url": "u1", "jobs": []}, on_durable=lambda: durable.append("u1"))
+    sink.write({"url": "u2", "jobs": []}, on_durable=lambda: durable.append("u2"))
+    sink.write({"url": "u3", "jobs": []}, on_durable=lambda: durable.append("u3"))
+    sink.close()
+
+    assert durable == ["u1", "u2", "u3"]
+
+
+def test_on_durable_is_not_called_for_lost_records(tmp_path):
+    durable = []
+    sink = JsonlSink(tmp_path / "results.jsonl")
+    sink.write({"url": "u", "jobs": [object()]}, on_durable=lambda: durable.append("u"))
+
+    with pytest.raises(RuntimeError):
+        sink.close()
+    assert durable == []
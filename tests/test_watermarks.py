@@ -0,0 +1,33 @@
+from crawler import CrawlerJob, linkedin_job_crawler
+from frontier import Frontier, load_failed_urls
+from watermarks import WatermarkStore
+
+SEEDS = [
+    "https://www.linkedin.com/jobs/search/?keywords=data+center&location=Texas",
+    "https://www.linkedin.com/jobs/search/?keywords=data+center&location=Ohio",
+    "https://www.linkedin.com/jobs/search/?keywords=data+center&location=Utah",
+]
+
+
+def test_seeds_with_failed_or_incomplete_pages_keep_their_watermark(tmp_path):
+    frontier_db = str(tmp_path / "frontier.db")
+    frontier = Frontier(frontier_db, commit_every=1)
+    for seed in SEEDS:
+        frontier.put(CrawlerJob(f"{seed}&f_WT=2&start=0", linkedin_job_crawler))
+    jobs = {job.url.split("&")[1]: job for job in (frontier.get() for _ in SEEDS)}
+    frontier.complete(jobs["location=Texas"])
+    frontier.complete(jobs["location=Ohio"], "cards not hydrated")
+    frontier.fail(jobs["location=Utah"], RuntimeError("boom"))
+    frontier.close()
+
+    store = WatermarkStore(tmp_path / "watermarks.json")
+    store.begin(started=1000.0)
+    # seeds are recorded as the generator is consumed, not up front
+    generated = store.track(iter(SEEDS))
+    assert next(generated) == SEEDS[0]
+    assert list(generated) == SEEDS[1:]
+
+    assert store.finish(load_failed_urls(frontier_db, incomplete=True)) == 1
+    assert store.get(SEEDS[0]) == 1000.0
+    assert store.get(SEEDS[1]) is None and store.get(SEEDS[2]) is None
+    assert load_failed_urls(frontier_db) == [jobs["location=Utah"].url]
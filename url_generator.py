@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+import hashlib
 import itertools
 import re
 import urllib.parse
@@ -34,6 +35,11 @@ class QueryPlan:
     def url(self) -> str:
         return BASE_URL + urllib.parse.urlencode(self.params)
 
+    @property
+    def canonical_key(self) -> str:
+        """Order-independent identity of this query (see :func:`canonical_query`)."""
+        return canonical_query(self.params)
+
 
 def _normalize_location_entry(entry: Any) -> Tuple[Optional[str], Dict[str, str]]:
     if isinstance(entry, dict):
@@ -293,6 +299,7 @@ def generate_urls(
     filter_overrides: Optional[Dict[str, Dict[str, object]]] = None,
     base_params: Optional[Dict[str, str]] = None,
     include_summary: bool = False,
+    geo_ids: Optional[Dict[str, str]] = None,
 ) -> List[str] | Dict[str, object]:
     """Generate LinkedIn job search URLs using the configured filter options.
 
@@ -329,13 +336,91 @@ def generate_urls(
         When set to ``True`` the return value becomes a dictionary containing
         the generated :class:`QueryPlan` objects and a human-friendly summary of
         the active filters, including location selections.
+    geo_ids:
+        Optional mapping of state location labels to LinkedIn geoIds. States
+        found in it are searched with ``geoId=`` next to ``location=`` (see
+        :func:`state_filter`).
 
     Returns
     -------
     List[str] | Dict[str, object]
-        The generated URLs by default, or a dictionary with ``plans`` and
-        ``summary`` when ``include_summary`` is ``True``.
+        The generated URLs by default (canonical and free of duplicates, see
+        :func:`iter_urls`), or a dictionary with ``plans`` and ``summary``
+        when ``include_summary`` is ``True``.
+    """
+    filters, params, state_selections, county_filter_enabled = _plan_source(
+        keyword, states, counties, include_filters, filter_overrides, base_params, geo_ids
+    )
+
+    if include_summary:
+        summary = filters.summary()
+        summary["state_filter"] = {
+            "enabled": bool(state_selections),
+            "selected": [state for state, _ in state_selections],
+            "available": list(state_filter().keys()),
+        }
+        summary["county_filter"] = {
+            "enabled": county_filter_enabled,
+            "selected": [],
+            "available": [],
+        }
+        return {
+            "plans": list(_expand_plans(filters, params, state_selections)),
+            "summary": summary,
+        }
+
+    return list(_unique_urls(_expand_plans(filters, params, state_selections), SeenSet()))
+
+
+def iter_urls(
+    keyword: Optional[str] = DEFAULT_KEYWORD,
+    *,
+    states: Optional[Iterable[str] | str] = None,
+    counties: Optional[Iterable[str] | str] = None,
+    include_filters: Optional[Iterable[str] | str | bool] = False,
+    filter_overrides: Optional[Dict[str, Dict[str, object]]] = None,
+    base_params: Optional[Dict[str, str]] = None,
+    seen: Optional["SeenSet"] = None,
+    geo_ids: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    """Lazily yield the URLs of :func:`generate_urls`, one plan at a time.
+
+    Arguments are validated immediately; plans are then expanded on demand,
+    so the first URL is available before the filter/state cross product has
+    been built. URLs are canonical (query parameters sorted, see
+    :func:`canonical_query`) and each one is yielded once; pass ``seen`` to
+    share the duplicate filter across several calls.
+    """
+    filters, params, state_selections, _ = _plan_source(
+        keyword, states, counties, include_filters, filter_overrides, base_params, geo_ids
+    )
+    return _unique_urls(_expand_plans(filters, params, state_selections), SeenSet() if seen is None else seen)
+
+
+class SeenSet:
+    """Set of strings kept as 64-bit BLAKE2b digests instead of the strings themselves.
+
+    A digest costs a fraction of a URL's memory; two different URLs collide
+    with negligible probability (about n**2 / 2**65 for n URLs).
     """
+
+    def __init__(self) -> None:
+        self._digests: set = set()
+
+    def add(self, key: str) -> bool:
+        """Record ``key``; returns False if it was seen before."""
+        digest = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+def _plan_source(keyword, states, counties, include_filters, filter_overrides, base_params, geo_ids=None):
+    """Validate the arguments of :func:`generate_urls`; returns (filters, params, state selections, county flag)."""
     (
         filter_definitions,
         state_filter_enabled,
@@ -348,22 +433,9 @@ def generate_urls(
     if keyword:
         params["keywords"] = keyword
 
-    plans = list(filters.iter_plans(params))
-
-    cleaned_plans: List[QueryPlan] = []
-    for plan in plans:
-        cleaned_params = {k: v for k, v in plan.params.items() if v is not None}
-        cleaned_plans.append(QueryPlan(params=cleaned_params, labels=dict(plan.labels)))
-
-    state_filter_requested = state_filter_enabled or states is not None
-    state_options: Dict[str, object] = {}
-    available_states: List[str] = []
     state_selections: List[Tuple[str, object]] = []
-
-    final_plans: List[QueryPlan] = cleaned_plans
-
-    if state_filter_requested:
-        state_options = state_filter()
+    if state_filter_enabled or states is not None:
+        state_options = state_filter(geo_ids)
         available_states = list(state_options.keys())
 
         normalized_states = _normalize_selection_input(states)
@@ -378,25 +450,6 @@ def generate_urls(
                 )
             state_selections.append((state, state_options[state]))
 
-        if state_selections:
-            updated_plans: List[QueryPlan] = []
-            for plan in cleaned_plans:
-                for state_label, state_value in state_selections:
-                    location_value, extra_params = _normalize_location_entry(
-                        state_value
-                    )
-                    new_params = dict(plan.params)
-                    if location_value:
-                        new_params["location"] = location_value
-                    for key, value in extra_params.items():
-                        new_params[key] = value
-                    new_labels = dict(plan.labels)
-                    new_labels["state"] = state_label
-                    updated_plans.append(
-                        QueryPlan(params=new_params, labels=new_labels)
-                    )
-            final_plans = updated_plans
-
     if counties:
         raise NotImplementedError(
             "County filtering is not yet supported. Provide an empty value for 'counties'."
@@ -407,29 +460,38 @@ def generate_urls(
             "County filtering is planned but not yet implemented."
         )
 
-    if include_summary:
-        summary = filters.summary()
-        if not available_states:
-            available_states = list(state_filter().keys())
-        summary["state_filter"] = {
-            "enabled": bool(state_selections),
-            "selected": [state for state, _ in state_selections],
-            "available": available_states,
-        }
-        summary["county_filter"] = {
-            "enabled": county_filter_enabled,
-            "selected": [],
-            "available": [],
-        }
-        return {
-            "plans": final_plans,
-            "summary": summary,
-        }
+    return filters, params, state_selections, county_filter_enabled
 
-    return [plan.url for plan in final_plans]
+
+def _expand_plans(filters: FilterOptions, params: Dict[str, str], state_selections) -> Iterator[QueryPlan]:
+    for plan in filters.iter_plans(params):
+        cleaned_params = {k: v for k, v in plan.params.items() if v is not None}
+        if not state_selections:
+            yield QueryPlan(params=cleaned_params, labels=dict(plan.labels))
+            continue
+        for state_label, state_value in state_selections:
+            location_value, extra_params = _normalize_location_entry(state_value)
+            new_params = dict(cleaned_params)
+            if location_value:
+                new_params["location"] = location_value
+            new_params.update(extra_params)
+            new_labels = dict(plan.labels)
+            new_labels["state"] = state_label
+            yield QueryPlan(params=new_params, labels=new_labels)
+
+
+def _unique_urls(plans: Iterable[QueryPlan], seen: SeenSet) -> Iterator[str]:
+    for plan in plans:
+        url = BASE_URL + plan.canonical_key
+        if seen.add(url):
+            yield url
 
 
-def extend_url_with_filter(url: str, include_filters: Iterable[str] | str | bool) -> List[str]:
+def extend_url_with_filter(
+    url: str,
+    include_filters: Iterable[str] | str | bool,
+    geo_ids: Optional[Dict[str, str]] = None,
+) -> List[str]:
     """Return new URLs composed by layering extra filters onto an existing URL.
     
     Parameters
@@ -438,6 +500,9 @@ def extend_url_with_filter(url: str, include_filters: Iterable[str] | str | bool
         Existing LinkedIn job search URL to extend.
     include_filters:
         Choose which optional filters from :data:`FULL_FILTER_DEFINITIONS` to include.  
+    geo_ids:
+        Optional mapping of state location labels to geoIds, used when
+        ``include_filters`` adds the state filter (see :func:`state_filter`).
 
     Returns
     -------
@@ -483,7 +548,7 @@ def extend_url_with_filter(url: str, include_filters: Iterable[str] | str | bool
     final_plans: List[QueryPlan] = cleaned_plans
 
     if state_filter_enabled:
-        state_options = state_filter()
+        state_options = state_filter(geo_ids)
         available_states = list(state_options.keys())
         state_selections: List[Tuple[str, object]] = []
         for state in available_states:
@@ -527,11 +592,71 @@ def extend_url_with_filter(url: str, include_filters: Iterable[str] | str | bool
     return final_urls
 
 
+def canonical_query(params: Dict[str, str] | Iterable[Tuple[str, str]], drop: Iterable[str] = ("start",)) -> str:
+    """Encode query parameters sorted by key, leaving out ``drop`` and ``None`` values."""
+    items = params.items() if isinstance(params, dict) else params
+    drop = set(drop)
+    return urllib.parse.urlencode(
+        sorted((key, value) for key, value in items if key not in drop and value is not None)
+    )
+
+
+def canonical_url(url: str, drop: Iterable[str] = ("start",)) -> str:
+    """Return ``url`` with sorted query parameters and the ``drop`` keys removed.
+
+    Equivalent searches (same parameters in a different order, or different
+    pages of the same search) map to the same string.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = canonical_query(urllib.parse.parse_qsl(parts.query, keep_blank_values=True), drop)
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def with_time_window(url: str, seconds: int) -> str:
+    """Return ``url`` restricted to jobs posted in the last ``seconds`` (``f_TPR=r<seconds>``)."""
+    parts = urllib.parse.urlsplit(url)
+    params = dict(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    params[FULL_FILTER_DEFINITIONS["date_posted"].param_key] = f"r{int(seconds)}"
+    return urllib.parse.urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(params), parts.fragment)
+    )
+
+
+def labels_from_url(url: str) -> Dict[str, str]:
+    """Recover the :class:`QueryPlan` labels (filter choices and ``state``) of a search URL.
+
+    Parameter values that match no known choice, such as the ``f_TPR``
+    windows of incremental runs, are left out.
+    """
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+    labels: Dict[str, str] = {}
+    for name, definition in FULL_FILTER_DEFINITIONS.items():
+        value = params.get(definition.param_key)
+        for label, choice in definition.choices.items():
+            if choice is not None and choice == value:
+                labels[name] = label
+                break
+    location = params.get("location")
+    if location:
+        for state, entry in state_filter().items():
+            if _normalize_location_entry(entry)[0] == location:
+                labels["state"] = state
+                break
+    return labels
+
+
 # def county_filter() -> dict:
 #     pass
 
 
-def state_filter() -> dict:
+def state_filter(geo_ids: Optional[Dict[str, str]] = None) -> dict:
+    """Map state names to their ``location`` value, "Texas, United States".
+
+    With ``geo_ids`` (label -> geoId, see :class:`geo_resolver.GeoResolver`)
+    a resolved state maps to ``{"location": label, "geoId": id}`` instead, so
+    its searches target the exact region rather than LinkedIn's fuzzy match
+    of the label.
+    """
     STATE_LABELS = {
         "Alabama": "Alabama, United States",
         "Alaska": "Alaska, United States",
@@ -585,4 +710,9 @@ def state_filter() -> dict:
         "Wisconsin": "Wisconsin, United States",
         "Wyoming": "Wyoming, United States",
     }
-    return STATE_LABELS
+    if not geo_ids:
+        return STATE_LABELS
+    return {
+        state: {"location": label, "geoId": geo_ids[label]} if label in geo_ids else label
+        for state, label in STATE_LABELS.items()
+    }
@@ -37,35 +37,48 @@ def safe_text(default=""):
     return decorator
 
 
+# CSS selectors for a job card, shared by the WebElement helpers below and the
+# batched extraction script so both paths read exactly the same nodes.
+JOB_CARD_SELECTOR = "ul:first-of-type>li.ember-view"
+JOB_FIELD_SELECTORS = {
+    "job_id": ("li>div>div[data-job-id]", "attr", "data-job-id"),
+    "job_name": ("div.artdeco-entity-lockup__title>a>span", "text", None),
+    "company_name": ("div.artdeco-entity-lockup__subtitle", "text", None),
+    "job_location": ("div.artdeco-entity-lockup__caption", "text", None),
+    "job_metadata": ("div.artdeco-entity-lockup__metadata", "text", None),
+    "job_url": ("div.artdeco-entity-lockup__title>a", "attr", "href"),
+}
+
+
 @safe_text("")
 def get_job_id(ele):
     # ele expected to be a job card element, so the id should located at li>div>div[data-job-id]
-    job_id = ele.find_element(By.CSS_SELECTOR, "li>div>div[data-job-id]")
+    job_id = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["job_id"][0])
     return job_id.get_attribute("data-job-id")
 
 @safe_text("")
 def get_job_name(ele):
-    job_name = ele.find_element(By.CSS_SELECTOR, "div.artdeco-entity-lockup__title>a>span")
+    job_name = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["job_name"][0])
     return job_name.text.strip()
 
 @safe_text("")
 def get_job_subtitle(ele):
-    job_subtitle = ele.find_element(By.CSS_SELECTOR, "div.artdeco-entity-lockup__subtitle")
+    job_subtitle = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["company_name"][0])
     return job_subtitle.text.strip()
 
 @safe_text("")
 def get_job_caption(ele):
-    job_caption = ele.find_element(By.CSS_SELECTOR, "div.artdeco-entity-lockup__caption")
+    job_caption = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["job_location"][0])
     return job_caption.text.strip()
 
 @safe_text("")
 def get_job_metadata(ele):
-    job_metadata = ele.find_element(By.CSS_SELECTOR, "div.artdeco-entity-lockup__metadata")
+    job_metadata = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["job_metadata"][0])
     return job_metadata.text.strip()
 
 @safe_text("")
 def get_job_url(ele):
-    job_url = ele.find_element(By.CSS_SELECTOR, "div.artdeco-entity-lockup__title>a")
+    job_url = ele.find_element(By.CSS_SELECTOR, JOB_FIELD_SELECTORS["job_url"][0])
     return job_url.get_attribute("href")
 
 def extract_job_data(job_card):
@@ -78,6 +91,43 @@ def extract_job_data(job_card):
         "job_url": get_job_url(job_card)
     }
 
+
+# Runs inside the page and reads every card in one WebDriver round trip.
+# Mirrors the helpers above: a missing node gives "", text is innerText
+# (what WebElement.text returns) stripped, and attributes follow
+# get_attribute() by preferring the DOM property (absolute href) and returning
+# null when the attribute itself is absent.
+_EXTRACT_JOB_CARDS_SCRIPT = """
+const root = arguments[0] || document;
+const cardSelector = arguments[1];
+const fields = arguments[2];
+const read = (card, spec) => {
+    const node = card.querySelector(spec[0]);
+    if (!node) return "";
+    if (spec[1] === "text") return (node.innerText || "").trim();
+    const prop = node[spec[2]];
+    if (prop !== undefined && prop !== null && typeof prop !== "object") return String(prop);
+    return node.getAttribute(spec[2]);
+};
+return Array.from(root.querySelectorAll(cardSelector), card => {
+    const row = {};
+    for (const [name, spec] of Object.entries(fields)) row[name] = read(card, spec);
+    return row;
+});
+"""
+
+
+def extract_job_cards(driver, root=None):
+    """Extract every job card under ``root`` (or the document) in one ``execute_script`` call.
+
+    Returns a list of plain dicts with the same keys and fallbacks as
+    :func:`extract_job_data`.
+    """
+    rows = driver.execute_script(
+        _EXTRACT_JOB_CARDS_SCRIPT, root, JOB_CARD_SELECTOR, JOB_FIELD_SELECTORS
+    )
+    return [{name: row.get(name, "") for name in JOB_FIELD_SELECTORS} for row in rows or []]
+
 def simulate_human_like_actions(driver, min_actions=1, max_actions=3):
     """Trigger a handful of small interactions to look less like a bot."""
     if not driver:
@@ -0,0 +1,92 @@
+import json
+import math
+import time
+import urllib.parse
+from pathlib import Path
+
+from url_generator import FULL_FILTER_DEFINITIONS, canonical_query, with_time_window
+
+TIME_WINDOW_PARAM = FULL_FILTER_DEFINITIONS["date_posted"].param_key
+
+
+def _params(url):
+    return urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, keep_blank_values=True)
+
+
+def seed_key(url: str) -> str:
+    """Identity of a seed search, ignoring any time window already applied to it."""
+    return canonical_query(_params(url), drop=("start", TIME_WINDOW_PARAM))
+
+
+class WatermarkStore:
+    """Per-query time of the last successful crawl, stored as JSON.
+
+    ``window`` narrows a seed URL to ``f_TPR=r<seconds>`` covering the gap
+    since its watermark (plus ``overlap`` seconds so jobs posted during the
+    previous run are not missed). ``begin`` records the start time of a run
+    and ``track`` its seeds as they are generated; ``finish`` advances the
+    watermark of every seed that has no failed or incomplete job under it.
+    The pending run is saved too, so ``main.py --resume`` can finish it later.
+    """
+
+    def __init__(self, path="watermarks.json", *, overlap=3600):
+        self.path = Path(path)
+        self.overlap = overlap
+        self._marks: dict[str, float] = {}
+        self._pending: dict = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            self._marks = data.get("watermarks", {})
+            self._pending = data.get("pending", {})
+
+    def get(self, url: str) -> float | None:
+        return self._marks.get(seed_key(url))
+
+    def window(self, url: str, now: float | None = None) -> str:
+        since = self.get(url)
+        if since is None:
+            return url  # first run for this query: full history
+        now = time.time() if now is None else now
+        return with_time_window(url, math.ceil(max(0.0, now - since) + self.overlap))
+
+    @property
+    def pending_started(self) -> float | None:
+        """Start time of the run that ``begin`` recorded and ``finish`` has not closed yet."""
+        return self._pending.get("started")
+
+    def begin(self, started: float) -> None:
+        self._pending = {"started": started, "seeds": []}
+        self.save()
+
+    def track(self, seed_urls):
+        """Yield ``seed_urls``, adding each to the pending run; saved once they are exhausted."""
+        seeds = self._pending["seeds"]
+        known = set(seeds)
+        for url in seed_urls:
+            key = seed_key(url)
+            if key not in known:
+                known.add(key)
+                seeds.append(key)
+            yield url
+        self.save()
+
+    def finish(self, failed_urls) -> int:
+        """Advance the pending seeds with no URL of ``failed_urls`` under them; returns how many were advanced."""
+        if not self._pending:
+            return 0
+        failed = [set(_params(url)) for url in failed_urls]
+        advanced = 0
+        for key in self._pending["seeds"]:
+            seed_params = set(urllib.parse.parse_qsl(key, keep_blank_values=True))
+            # child searches only add parameters, so a failure under this seed contains all of its params
+            if any(seed_params <= params for params in failed):
+                continue
+            self._marks[key] = self._pending["started"]
+            advanced += 1
+        self._pending = {}
+        self.save()
+        return advanced
+
+    def save(self) -> None:
+        payload = {"watermarks": self._marks, "pending": self._pending}
+        self.path.write_text(json.dumps(payload, indent=2, ensure_ascii=False))